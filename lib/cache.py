@@ -0,0 +1,91 @@
+from collections import OrderedDict
+
+class LRUCache:
+    """
+    Bounded mapping that evicts the least recently used items.
+    """
+
+    def __init__(self, maxsize=128, on_evict=None):
+        """
+        :param maxsize: most items to keep, None for unbounded.
+        :param on_evict: optional callable(key, value) for evicted items.
+        """
+        self.maxsize = maxsize
+        self.on_evict = on_evict
+        self.items = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, key):
+        return key in self.items
+
+    def get(self, key, default=None):
+        """
+        Return value for key, making it the most recently used.
+        """
+        try:
+            value = self.items[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self.items.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        """
+        Add or replace value for key, evicting if over size.
+        """
+        self.items[key] = value
+        self.items.move_to_end(key)
+        self.evict()
+
+    def get_or_create(self, key, factory):
+        """
+        Return value for key, calling `factory()` to create it on a miss.
+        """
+        try:
+            value = self.items[key]
+        except KeyError:
+            self.misses += 1
+            value = factory()
+            self.put(key, value)
+        else:
+            self.hits += 1
+            self.items.move_to_end(key)
+        return value
+
+    def evict(self):
+        """
+        Drop least recently used items until within size.
+        """
+        if self.maxsize is None:
+            return
+        while len(self.items) > self.maxsize:
+            key, value = self.items.popitem(last=False)
+            self.evictions += 1
+            if self.on_evict:
+                self.on_evict(key, value)
+
+    def resize(self, maxsize):
+        self.maxsize = maxsize
+        self.evict()
+
+    def clear(self):
+        self.items.clear()
+
+    def info(self):
+        """
+        Dict of counters and size.
+        """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self.items),
+            'maxsize': self.maxsize,
+        }
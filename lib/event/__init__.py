@@ -1,7 +1,13 @@
+from .coalesce import coalesce
 from .core import ANYEVENT
 from .core import dispatch
+from .core import freeze
+from .core import instrument
+from .core import is_instrumented
 from .core import listen
 from .core import listen_for
+from .core import report
+from .core import unlisten
 from .dragdrop import DRAGDROP
 from .dragdrop import DRAGMOTION
 from .dragdrop import DRAGSTART
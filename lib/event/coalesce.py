@@ -0,0 +1,41 @@
+"""
+Merge runs of motion events so that handling input costs about the same
+each frame however fast the mouse polls.
+"""
+from ..external import pygame
+from .dragdrop import DRAGMOTION
+
+MOTION_TYPES = (pygame.MOUSEMOTION, DRAGMOTION)
+
+def merge(events):
+    """
+    One event like the last of a run of motion events of the same type, with
+    their `rel` summed.
+    """
+    last = events[-1]
+    if len(events) == 1:
+        return last
+    relx = sum(event.rel[0] for event in events)
+    rely = sum(event.rel[1] for event in events)
+    attrs = dict(last.dict, rel=(relx, rely))
+    return pygame.event.Event(last.type, attrs)
+
+def coalesce(events, types=MOTION_TYPES):
+    """
+    List of events with each run of consecutive motion events of the same
+    type merged into one. Other events, like button presses, keep their
+    place between the merged motion.
+    """
+    result = []
+    run = []
+    for event in events:
+        if run and event.type != run[-1].type:
+            result.append(merge(run))
+            run = []
+        if event.type in types:
+            run.append(event)
+        else:
+            result.append(event)
+    if run:
+        result.append(merge(run))
+    return result
@@ -1,38 +1,158 @@
+"""
+Dispatch events to listeners registered by event type.
+
+Registrations are frozen into a table of one tuple of listeners per event
+type on the first dispatch after they change. Listeners for `ANYEVENT` are
+called first, then by priority, highest first, then in the order they were
+registered.
+"""
+import time
+
 from collections import defaultdict
+from itertools import count
 
 from ..external import pygame
 
 ANYEVENT = pygame.event.custom_type()
 
+# event type -> list of (-priority, order, func)
 registry = None
+# event type -> tuple of funcs, None when registry changed
+table = None
+# ANYEVENT funcs, for types nothing listens for
+anyevent = ()
+_order = count()
 
-# XXX
-# is this worth it's own module?
+# func -> [calls, total seconds, max seconds], None when not instrumenting
+timings = None
 
 def reset():
     global registry
+    global timings
     registry = defaultdict(list)
+    timings = None
+    unfreeze()
+
+def unfreeze():
+    global table
+    table = None
+
+def freeze():
+    """
+    Build the table of listeners for each event type.
+    """
+    global table
+    global anyevent
+    anyevent = tuple(func for _, _, func in sorted(registry[ANYEVENT]))
+    table = {
+        event_type: anyevent + tuple(func for _, _, func in sorted(entries))
+        for event_type, entries in registry.items()
+        if event_type != ANYEVENT
+    }
 
-def listen(event_type, func):
+def listen(event_type, func, priority=0):
     """
     Register callable `func` to respond to events of type `event_type`.
+
+    :param priority: listeners with higher priority are called first.
     """
-    registry[event_type].append(func)
+    registry[event_type].append((-priority, next(_order), func))
+    unfreeze()
 
-def listen_for(event_type):
+def unlisten(event_type, func):
+    """
+    Unregister `func` from events of type `event_type`. Raise ValueError if
+    it was not registered.
+    """
+    entries = registry.get(event_type, [])
+    for i, (_, _, registered) in enumerate(entries):
+        if registered == func:
+            del entries[i]
+            break
+    else:
+        raise ValueError(f'{func!r} is not listening for {event_type}')
+    if not entries:
+        del registry[event_type]
+    unfreeze()
+
+def listen_for(event_type, priority=0):
     """
     Decorator version of `listen`.
     """
     def decorator(func):
-        listen(event_type, func)
+        listen(event_type, func, priority)
+        return func
     return decorator
 
+def listeners(event_type):
+    """
+    Tuple of funcs called for events of type `event_type`, in order.
+    """
+    if table is None:
+        freeze()
+    return table.get(event_type, anyevent)
+
 def dispatch(event):
     """
+    Call the listeners for event.
+    """
+    funcs = listeners(event.type)
+    # listeners may turn instrumenting on or off, keep recording this event
+    recording = timings
+    if recording is None:
+        for func in funcs:
+            func(event)
+        return
+    for func in funcs:
+        start = time.perf_counter()
+        try:
+            func(event)
+        finally:
+            elapsed = time.perf_counter() - start
+            timing = recording[func]
+            timing[0] += 1
+            timing[1] += elapsed
+            if elapsed > timing[2]:
+                timing[2] = elapsed
+
+def instrument(enabled=True):
+    """
+    Start, or stop, recording the calls and time of each listener. Starting
+    clears what was recorded.
+    """
+    global timings
+    if enabled:
+        timings = defaultdict(lambda: [0, 0.0, 0.0])
+    else:
+        timings = None
+
+def is_instrumented():
+    return timings is not None
+
+def listener_name(func):
+    func = getattr(func, '__func__', func)
+    module = getattr(func, '__module__', None)
+    name = getattr(func, '__qualname__', repr(func))
+    return f'{module}.{name}' if module else name
+
+def report():
+    """
+    List of dicts of the recorded listener timings, most total time first,
+    with keys listener, calls, total, max and mean, in seconds.
     """
-    for func in registry[ANYEVENT]:
-        func(event)
-    for func in registry[event.type]:
-        func(event)
+    if timings is None:
+        return []
+    rows = [
+        {
+            'listener': listener_name(func),
+            'calls': calls,
+            'total': total,
+            'max': maximum,
+            'mean': total / calls if calls else 0,
+        }
+        for func, (calls, total, maximum) in timings.items()
+    ]
+    rows.sort(key=lambda row: row['total'], reverse=True)
+    return rows
 
 reset()
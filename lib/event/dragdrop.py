@@ -1,7 +1,9 @@
 """
 Add support for a DRAG and DRAGDROP event to pygame.
 
-Call lib.event.for_drag(event) in your event processor.
+Call lib.event.for_drag(event) in your event processor. Pass
+`post=lib.event.dispatch` to handle drag events right away instead of in the
+next frame through the pygame queue.
 """
 from ..external import pygame
 
@@ -47,23 +49,28 @@ def is_drag_start(event):
         and not __was_dragged
     )
 
-def for_drag(event):
+def for_drag(event, post=None):
     """
     Call this is your event processor to emit drag-start, drag-update, and
     drag-drop events.
+
+    :param post: callable to emit events with, default `pygame.event.post`.
     """
     global __drag
     global __was_dragged
 
+    if post is None:
+        post = pygame.event.post
+
     if is_drop(event):
         drop = pygame.event.Event(DRAGDROP,
             name = 'DRAGDROP',
             start = __drag.start,
             pos = event.pos,
         )
-        pygame.event.post(drop)
         __drag = None
         __was_dragged = False
+        post(drop)
 
     elif is_drag_update(event):
         __was_dragged = True
@@ -75,7 +82,7 @@ def for_drag(event):
             rel = event.rel,
         )
         __drag.pos = event.pos
-        pygame.event.post(__drag)
+        post(__drag)
 
     elif is_drag_start(event):
         __drag = pygame.event.Event(
@@ -84,4 +91,4 @@ def for_drag(event):
             start = event.pos,
             pos = event.pos,
         )
-        pygame.event.post(__drag)
+        post(__drag)
@@ -0,0 +1,70 @@
+"""
+Pace a pygame main loop.
+
+Cap the frame rate and, after a frame where nothing happened, block until the
+next event instead of spinning.
+"""
+import time
+
+from collections import deque
+
+from .external import pygame
+
+class Scheduler:
+
+    def __init__(self, fps=60, idle=True, history=120):
+        """
+        :param fps: frames per second cap, zero for no cap.
+        :param idle: block for events after an idle frame.
+        :param history: number of frame times to keep for stats.
+        """
+        self.fps = fps
+        self.idle = idle
+        self.clock = pygame.time.Clock()
+        # milliseconds spent on each frame, not counting waiting
+        self.frame_times = deque(maxlen=history)
+        self.frames = 0
+        self.idle_waits = 0
+        self.was_idle = False
+        self.frame_start = None
+
+    def events(self):
+        """
+        Return list of events for this frame, waiting for one if the last
+        frame was idle.
+        """
+        if self.idle and self.was_idle:
+            self.idle_waits += 1
+            events = [pygame.event.wait()]
+            events.extend(pygame.event.get())
+            # don't count time spent waiting against the frame rate
+            self.clock.tick()
+        else:
+            events = pygame.event.get()
+        self.frame_start = time.perf_counter()
+        return events
+
+    def tick(self, busy):
+        """
+        End the frame, sleeping to cap the frame rate.
+
+        :param busy: something happened this frame, like events or drawing.
+        """
+        if self.frame_start is not None:
+            self.frame_times.append((time.perf_counter() - self.frame_start) * 1000)
+        self.frames += 1
+        self.was_idle = not busy
+        self.clock.tick(self.fps)
+
+    def stats(self):
+        """
+        Dict of frame stats, times are in milliseconds.
+        """
+        frame_times = self.frame_times or [0]
+        return {
+            'fps': self.clock.get_fps(),
+            'frames': self.frames,
+            'idle_waits': self.idle_waits,
+            'frame_time_avg': sum(frame_times) / len(frame_times),
+            'frame_time_max': max(frame_times),
+        }
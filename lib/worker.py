@@ -0,0 +1,194 @@
+"""
+Run slow operations, like `rectop.join.defrag`, in a thread or process pool
+so the main loop keeps drawing frames.
+
+Jobs are functions taking a `progress` keyword argument, a callable(done,
+total) they call as they go. It shares how far along the job is and raises
+`Cancelled` once the job is cancelled. Call `Worker.poll` each frame to emit
+WORKPROGRESS and WORKDONE events for the jobs.
+"""
+import multiprocessing
+import threading
+import time
+
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count
+
+from .external import pygame
+
+WORKPROGRESS = pygame.event.custom_type()
+WORKDONE = pygame.event.custom_type()
+
+# seconds between progress updates, they cross processes
+PROGRESS_INTERVAL = 0.05
+
+class Cancelled(Exception):
+    pass
+
+
+def run(func, args, kwargs, state, cancel, interval=PROGRESS_INTERVAL):
+    """
+    Call func with a progress callback that writes [done, total] to `state`
+    and raises Cancelled once `cancel` is set.
+    """
+    last = 0
+
+    def progress(done, total):
+        nonlocal last
+        now = time.monotonic()
+        if now - last < interval:
+            return
+        last = now
+        if cancel.is_set():
+            raise Cancelled
+        state[:] = [done, total]
+
+    if cancel.is_set():
+        raise Cancelled
+    return func(*args, progress=progress, **kwargs)
+
+
+class Job:
+    """
+    Operation submitted to a `Worker`.
+    """
+
+    def __init__(self, id, op, future, state, cancel):
+        self.id = id
+        self.op = op
+        self.future = future
+        self.state = state
+        self.cancel_event = cancel
+        self.reported = None
+
+    @property
+    def progress(self):
+        """
+        Fraction done, as last reported by the job.
+        """
+        done, total = list(self.state)
+        return done / total if total > 0 else 0
+
+    def cancel(self):
+        self.cancel_event.set()
+        self.future.cancel()
+
+
+class Worker:
+    """
+    Pool running jobs and emitting events about them. The pool is started
+    with the first job.
+    """
+
+    def __init__(self, processes=True, max_workers=1, post=None):
+        """
+        :param processes: run jobs in processes, otherwise threads. Jobs in
+                          threads share the GIL with the main loop.
+        :param max_workers: number of jobs run at once.
+        :param post: callable to emit events, default `pygame.event.post`.
+        """
+        self.processes = processes
+        self.max_workers = max_workers
+        self.post = post or pygame.event.post
+        self.executor = None
+        self.manager = None
+        self.jobs = []
+        self.ids = count(1)
+
+    def start(self):
+        if self.processes:
+            # not forking a process with a display
+            context = multiprocessing.get_context('spawn')
+            self.manager = context.Manager()
+            self.executor = ProcessPoolExecutor(self.max_workers, mp_context=context)
+        else:
+            self.executor = ThreadPoolExecutor(self.max_workers)
+
+    @property
+    def busy(self):
+        return bool(self.jobs)
+
+    def submit(self, op, func, *args, **kwargs):
+        """
+        Run func(*args, progress=callable, **kwargs) and return its Job.
+
+        :param op: name of the operation, for the events.
+        """
+        if self.executor is None:
+            self.start()
+        if self.processes:
+            state = self.manager.list([0, 0])
+            cancel = self.manager.Event()
+        else:
+            state = [0, 0]
+            cancel = threading.Event()
+        future = self.executor.submit(run, func, args, kwargs, state, cancel)
+        job = Job(next(self.ids), op, future, state, cancel)
+        self.jobs.append(job)
+        return job
+
+    def poll(self):
+        """
+        Emit WORKPROGRESS for jobs that got further and WORKDONE for jobs
+        that finished, were cancelled or failed.
+        """
+        for job in list(self.jobs):
+            if job.future.done():
+                self.jobs.remove(job)
+                self.post(done_event(job))
+                continue
+            progress = job.progress
+            if progress != job.reported:
+                job.reported = progress
+                self.post(pygame.event.Event(
+                    WORKPROGRESS,
+                    job = job.id,
+                    op = job.op,
+                    progress = progress,
+                ))
+
+    def cancel(self):
+        """
+        Cancel all jobs. They are still emitted as done when they stop.
+        """
+        for job in self.jobs:
+            job.cancel()
+
+    def shutdown(self):
+        """
+        Cancel jobs and wait for the pool to stop.
+        """
+        self.cancel()
+        if self.executor:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+        if self.manager:
+            self.manager.shutdown()
+            self.manager = None
+        self.jobs.clear()
+
+
+def done_event(job):
+    """
+    WORKDONE event for finished job with what it returned as `result`, None
+    if it was cancelled or failed with `error`.
+    """
+    result = None
+    error = None
+    cancelled = job.future.cancelled()
+    if not cancelled:
+        error = job.future.exception()
+        if isinstance(error, Cancelled):
+            cancelled = True
+            error = None
+        elif error is None:
+            result = job.future.result()
+    return pygame.event.Event(
+        WORKDONE,
+        job = job.id,
+        op = job.op,
+        result = result,
+        cancelled = cancelled,
+        error = error,
+    )
@@ -1,15 +1,21 @@
 import argparse
+import logging
 import os
 import pickle
 
-from itertools import combinations
 from itertools import cycle
 from types import SimpleNamespace
 
 import lib.event
+import lib.worker
 import rectop
+import render.text
+
+from lib.scheduler import Scheduler
 
 from lib.external import pygame
+from render.dirty import DirtyRenderer
+from render.dirty import Drawable
 from tools import CutRectTool
 from tools import DefragRectTool
 from tools import DeleteTool
@@ -19,7 +25,10 @@ from tools import SelectTool
 from tools import SubdivideTool
 
 BACKGROUND_COLOR = (0,)*3
-SAVE_FILENAME = 'save.pickle'
+SAVE_FILENAME = 'save.layout'
+JOURNAL_FILENAME = 'save.journal'
+# read once, if there is no layout file yet
+LEGACY_SAVE_FILENAME = 'save.pickle'
 
 g = SimpleNamespace(
     running = False,
@@ -28,39 +37,132 @@ g = SimpleNamespace(
 
     rects = None,
     tool = None,
+    # ids of rects the tool hovered last frame
+    hovered = frozenset(),
     highlight = None,
+    intersections = False,
+    renderer = None,
+    scheduler = None,
+    coalesce = True,
+    worker = None,
+    # job id -> (op, fraction done)
+    progress = {},
+    # last error of a background operation, shown until the next change
+    status = None,
+    show_stats = False,
+    journal = None,
+    history = None,
 
     entities = set(),
 )
 
 rects_getter = lambda: g.rects
+worker_getter = lambda: g.worker
+
+def journal(op, diff):
+    """
+    Journal each operation on the rects as it happens.
+    """
+    g.journal.record(op, diff)
+    if g.journal.needs_compaction():
+        compact()
+
+def compact():
+    """
+    Compact the journal into its layout file and the ids of the store over
+    deleted ones, moving the ids held here and by the tools.
+    """
+    g.journal.compact(g.rects)
+    moved = g.rects.compact()
+    g.hovered = frozenset(moved[i] for i in g.hovered if i in moved)
+    g.highlight = {moved[i] for i in g.highlight if i in moved}
+    for tool in all_tools:
+        hover = getattr(tool, 'hover', None)
+        if isinstance(hover, set):
+            tool.hover = {moved[i] for i in hover if i in moved}
+        elif hover is not None:
+            tool.hover = moved.get(hover)
+
+def applied(op, diff):
+    """
+    Rects were changed by diff, redraw where they were and journal it.
+    """
+    g.renderer.mark(*diff['append'], *diff['remove'])
+    g.status = None
+    journal(op, diff)
+
+def on_changed(op, diff):
+    """
+    Rects were changed by a tool.
+    """
+    g.history.push(op, diff)
+    applied(op, diff)
+
+def new_rect(rect):
+    g.rects.append(rect)
+    on_changed('new', rectop.diff.new(append=[rect]))
+
+def mark_ids(rect_ids):
+    """
+    Redraw the rects with ids, if they are still there.
+    """
+    g.renderer.mark(*(g.rects[rect_id] for rect_id in rect_ids if g.rects.is_alive(rect_id)))
+
+def highlight(rect_id):
+    g.highlight.add(rect_id)
+    mark_ids([rect_id])
+
+def unhighlight(rect_id):
+    if rect_id in g.highlight:
+        g.highlight.discard(rect_id)
+        mark_ids([rect_id])
 
-tools = cycle([
+def undo():
+    undone = g.history.undo(g.rects)
+    if undone:
+        op, diff = undone
+        applied('undo', diff)
+
+def redo():
+    redone = g.history.redo(g.rects)
+    if redone:
+        op, diff = redone
+        applied('redo', diff)
+
+all_tools = [
     DefragRectTool(
         rects_getter = rects_getter,
+        changed_callback = on_changed,
+        worker_getter = worker_getter,
     ),
     NewRectTool(
-        new_rect_callback = lambda rect: g.rects.append(rect),
+        new_rect_callback = new_rect,
     ),
     SubdivideTool(
         rects_getter = rects_getter,
+        changed_callback = on_changed,
     ),
     #IntersetRectTool(
     #    rects_getter = rects_getter,
     #    new_rect_callback = lambda rect: g.rects.append(rect),
+    #    changed_callback = on_changed,
     #),
     DeleteTool(
         rects_getter = rects_getter,
+        changed_callback = on_changed,
     ),
     #SelectTool(
     #    rects_getter = rects_getter,
-    #    selected_callback = lambda rect: g.highlight.update({id(rect): rect}),
-    #    unselected_callback = lambda rect: g.highlight.pop(id(rect), None),
+    #    selected_callback = highlight,
+    #    unselected_callback = unhighlight,
     #),
     CutRectTool(
         rects_getter = rects_getter,
+        changed_callback = on_changed,
+        worker_getter = worker_getter,
     ),
-])
+]
+tools = cycle(all_tools)
 
 @lib.event.listen_for(pygame.QUIT)
 def on_quit(event):
@@ -78,133 +180,271 @@ def on_keydown(event):
         pygame.event.post(pygame.event.Event(pygame.QUIT))
     elif event.key == pygame.K_SPACE:
         next_tool()
+    elif event.key == pygame.K_z and event.mod & pygame.KMOD_CTRL:
+        if event.mod & pygame.KMOD_SHIFT:
+            redo()
+        else:
+            undo()
+    elif event.key == pygame.K_y and event.mod & pygame.KMOD_CTRL:
+        redo()
     elif event.key == pygame.K_s:
-        save(SAVE_FILENAME)
+        save()
+    elif event.key == pygame.K_i:
+        g.intersections = not g.intersections
+        g.renderer.invalidate()
+    elif event.key == pygame.K_f:
+        g.show_stats = not g.show_stats
+    elif event.key == pygame.K_c and g.worker:
+        g.worker.cancel()
+    elif event.key == pygame.K_p:
+        # time event listeners, shown with stats
+        lib.event.instrument(not lib.event.is_instrumented())
 
-@lib.event.listen_for(lib.event.ANYEVENT)
-def on_anyevent(event):
+@lib.event.listen_for(pygame.WINDOWEXPOSED)
+def on_windowexposed(event):
     """
-    On any event give current tool a change to respond to the event.
+    Window needs to be redrawn, by the window manager.
     """
-    if g.tool:
-        g.tool.on_event(event)
+    g.renderer.invalidate()
+
+@lib.event.listen_for(lib.worker.WORKPROGRESS)
+def on_workprogress(event):
+    g.progress[event.job] = (event.op, event.progress)
+
+@lib.event.listen_for(lib.worker.WORKDONE)
+def on_workdone(event):
+    """
+    Apply the diff of a background operation, unless the rects it was made
+    from have changed since. Log and show errors and dropped diffs.
+    """
+    g.progress.pop(event.job, None)
+    if event.error is not None:
+        logging.error('%s failed', event.op, exc_info=event.error)
+        g.status = f'{event.op} failed: {event.error!r}'
+        return
+    diff = event.result
+    if diff is None or rectop.diff.is_empty(diff):
+        return
+    if not rectop.diff.is_applicable(diff, g.rects):
+        logging.warning('%s dropped, rects changed since it started', event.op)
+        g.status = f'{event.op} dropped, rects changed since it started'
+        return
+    rectop.diff.apply(diff, g.rects)
+    on_changed(event.op, diff)
+
+def hovering():
+    """
+    Ids of the rects the tool is hovering.
+    """
+    hover = getattr(g.tool, 'hover', None)
+    # trying to handle both hover = set(...) or hover = rect_id
+    if isinstance(hover, set):
+        return frozenset(hover)
+    if hover is None:
+        return frozenset()
+    return frozenset([hover])
 
-def get_border_color(rect):
+def is_hovered(rect_id):
+    """
+    Tool is hovering the rect with id.
+    """
+    return rect_id in g.hovered
+
+def get_border_color(rect_id):
     """
     """
     # default
     color = (175,)*3
-    if id(rect) in g.highlight:
+    if rect_id in g.highlight:
         color = (200,10,10)
-    elif hasattr(g.tool, 'hover'):
-        # trying to handle both hover = set(...) or hover = id(rect)
-        if (
-            (isinstance(g.tool.hover, int) and id(rect) == g.tool.hover)
-            or
-            (isinstance(g.tool.hover, set) and id(rect) in g.tool.hover)
-        ):
-            color = (200,200,30)
+    elif is_hovered(rect_id):
+        color = (200,200,30)
     return color
 
-def get_fill_color(rect):
+def get_fill_color(rect_id):
     """
     """
     # default
     color = BACKGROUND_COLOR
-    if hasattr(g.tool, 'hover'):
-        # trying to handle both hover = set(...) or hover = id(rect)
-        if (
-            (isinstance(g.tool.hover, int) and id(rect) == g.tool.hover)
-            or
-            (isinstance(g.tool.hover, set) and id(rect) in g.tool.hover)
-        ):
-            color = (200,30,200)
+    if is_hovered(rect_id):
+        color = (200,30,200)
     return color
 
-def draw_rects():
-    for rect in g.rects:
-        background_color = get_fill_color(rect)
-        pygame.draw.rect(g.window, background_color, rect)
-        border_color = get_border_color(rect)
-        pygame.draw.rect(g.window, border_color, rect, 1)
+def draw_rect(surface, rect, fill_color, border_color):
+    pygame.draw.rect(surface, fill_color, rect)
+    pygame.draw.rect(surface, border_color, rect, 1)
 
-def draw_intersections():
-    for r1, r2 in combinations(g.rects, 2):
-        if r1.colliderect(r2):
-            #points = rectop.get.intersection_points(r1, r2)
-            #for p in points:
-            #    pygame.draw.circle(g.window, (200,30,200), p, 10)
+def draw_border(surface, rect, color):
+    pygame.draw.rect(surface, color, rect, 1)
 
-            intersectrect = rectop.get.intersection(r1, r2)
-            pygame.draw.rect(g.window, (200,30,200), intersectrect, 1)
+def draw_text(surface, rect, text, color):
+    surface.blit(render.text.render(g.font, text, True, color), rect)
 
-def draw_selection():
+def scene(area):
+    """
+    Drawables of the rects overlapping area, and of their intersections.
+    """
+    rects = [(rect_id, g.rects[rect_id]) for rect_id in g.rects.query_rect(area)]
+    for rect_id, rect in rects:
+        fill_color = get_fill_color(rect_id)
+        border_color = get_border_color(rect_id)
+        yield Drawable(draw_rect, tuple(rect), (fill_color, border_color))
+    if g.intersections:
+        intersections = rectop.get.all_intersections([rect for _, rect in rects])
+        for r1, r2, intersectrect in intersections:
+            yield Drawable(draw_border, tuple(intersectrect), ((200,30,200),))
+
+def selection_drawables():
     if hasattr(g.tool, 'selection') and isinstance(g.tool.selection, pygame.Rect):
-        pygame.draw.rect(g.window, (200,30,10), g.tool.selection, 1)
+        yield Drawable(draw_border, tuple(g.tool.selection), ((200,30,10),))
 
-def draw_tool_name():
-    txtimg = g.font.render(str(g.tool), True, (200,)*3)
-    g.window.blit(txtimg, txtimg.get_rect(bottomright=g.frame.bottomright))
+def tool_name_drawables():
+    text = str(g.tool)
+    if g.status:
+        text = f'{g.status} {text}'
+    for op, progress in g.progress.values():
+        text = f'{op} {progress:.0%} (c to cancel) {text}'
+    rect = pygame.Rect((0,0), g.font.size(text))
+    rect.bottomright = g.frame.bottomright
+    yield Drawable(draw_text, tuple(rect), (text, (200,)*3))
+
+def stats_drawables():
+    stats = g.scheduler.stats()
+    text = (
+        f'{stats["fps"]:,.0f} fps'
+        f' {stats["frame_time_avg"]:,.1f}/{stats["frame_time_max"]:,.1f} ms'
+    )
+    rect = pygame.Rect((0,0), g.font.size(text))
+    rect.bottomleft = g.frame.bottomleft
+    y = rect.top
+    yield Drawable(draw_text, tuple(rect), (text, (200,)*3))
+    # slowest event listeners
+    for row in lib.event.report()[:3]:
+        text = (
+            f'{row["listener"]} {row["calls"]:,} calls'
+            f' {row["total"] * 1000:,.1f}/{row["max"] * 1000:,.1f} ms'
+        )
+        rect = pygame.Rect((0,0), g.font.size(text))
+        rect.bottomleft = (g.frame.left, y)
+        y = rect.top
+        yield Drawable(draw_text, tuple(rect), (text, (200,)*3))
 
 def draw():
     """
-    Draw everything
+    Draw what changed since the last frame.
     """
-    g.window.fill(BACKGROUND_COLOR)
-    draw_rects()
-    #draw_intersections()
-    draw_selection()
-    draw_tool_name()
-    pygame.display.flip()
+    hovered = hovering()
+    if hovered != g.hovered:
+        mark_ids(hovered ^ g.hovered)
+        g.hovered = hovered
+    overlay = list(selection_drawables())
+    overlay.extend(tool_name_drawables())
+    if g.show_stats:
+        overlay.extend(stats_drawables())
+    return g.renderer.render(scene, overlay)
 
 def next_tool():
     """
-    Cycle to next rect tool.
+    Cycle to next rect tool, the only tool listening for events.
     """
+    if g.tool:
+        lib.event.unlisten(lib.event.ANYEVENT, g.tool.on_event)
     g.tool = next(tools)
     g.tool.reset()
+    lib.event.listen(lib.event.ANYEVENT, g.tool.on_event)
 
 def loop():
     while g.running:
-        for event in pygame.event.get():
+        events = g.scheduler.events()
+        if g.worker:
+            g.worker.poll()
+        if g.coalesce:
+            events = lib.event.coalesce(events)
+        for event in events:
             lib.event.dispatch(event)
-            lib.event.for_drag(event)
-        draw()
+            # drag events in this frame, not through the queue
+            lib.event.for_drag(event, post=lib.event.dispatch)
+        dirty = draw()
+        g.scheduler.tick(busy=bool(events or dirty or (g.worker and g.worker.busy)))
 
-def save(filename):
+def save():
     """
+    Save rects to the journal's layout file, appending if they were only
+    added to, and start an empty journal on top of it.
     """
-    with open(filename, 'wb') as fp:
-        pickle.dump({'rects': g.rects}, fp)
+    compact()
 
 def restore(filename):
     """
+    Restore rects from layout file and the journal on top of it.
     """
-    if os.path.exists(filename):
-        with open(filename, 'rb') as fp:
+    if os.path.exists(filename) or os.path.exists(JOURNAL_FILENAME):
+        g.rects = rectop.journal.restore(filename, JOURNAL_FILENAME)
+    elif os.path.exists(LEGACY_SAVE_FILENAME):
+        with open(LEGACY_SAVE_FILENAME, 'rb') as fp:
             data = pickle.load(fp)
             for key, value in data.items():
                 setattr(g, key, value)
+        rectop.layout.save(filename, g.rects)
+    # indexed for hit testing by the tools
+    g.rects = rectop.store.RectStore(g.rects, cellsize=rectop.index.CELLSIZE)
 
-def main():
+def main(fps=60, idle=True, coalesce=True, worker='process'):
     pygame.font.init()
     g.font = pygame.font.Font(None, 24)
     g.window = pygame.display.set_mode((800,600))
     g.frame = g.window.get_rect()
-    g.rects = []
+    g.renderer = DirtyRenderer(g.window, BACKGROUND_COLOR)
+    g.scheduler = Scheduler(fps=fps, idle=idle)
+    g.coalesce = coalesce
+    if worker != 'none':
+        g.worker = lib.worker.Worker(
+            processes = worker == 'process',
+            post = lib.event.dispatch,
+        )
+    g.rects = rectop.store.RectStore(cellsize=rectop.index.CELLSIZE)
     g.highlight = set()
     g.running = True
     next_tool()
 
     restore(SAVE_FILENAME)
+    g.journal = rectop.journal.Journal(JOURNAL_FILENAME, SAVE_FILENAME)
+    g.history = rectop.diff.History()
     loop()
+    if g.worker:
+        g.worker.shutdown()
+    g.journal.close()
 
 def cli(argv=None):
     """
     """
     parser = argparse.ArgumentParser()
+    parser.add_argument(
+        '--fps',
+        type = int,
+        default = 60,
+        help = 'Frames per second cap, zero for no cap. Default: %(default)s',
+    )
+    parser.add_argument(
+        '--no-idle',
+        dest = 'idle',
+        action = 'store_false',
+        help = 'Keep drawing frames when nothing is happening.',
+    )
+    parser.add_argument(
+        '--no-coalesce',
+        dest = 'coalesce',
+        action = 'store_false',
+        help = 'Handle every mouse motion event, not one per run of them.',
+    )
+    parser.add_argument(
+        '--worker',
+        choices = ['process', 'thread', 'none'],
+        default = 'process',
+        help = 'Where to run defrag and cut, none to block. Default: %(default)s',
+    )
     args = parser.parse_args(argv)
-    main()
+    main(fps=args.fps, idle=args.idle, coalesce=args.coalesce, worker=args.worker)
 
 if __name__ == '__main__':
     cli()
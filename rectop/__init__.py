@@ -1,10 +1,22 @@
+from . import batch
 from . import cut
+from . import diff
 from . import get
 from . import handle
+from . import index
 from . import is_
 from . import join
+from . import journal
+from . import layout
+from . import partition
 from . import query
+from . import rect
 from . import resize
+from . import segment
+from . import stats
+from . import store
+from . import sweep
+from . import wrap
 from .constants import CORNERS
 from .constants import LINES
 from .constants import MIDPOINTS
@@ -0,0 +1,186 @@
+"""
+Array backed batches of rects for bulk operations, requires numpy.
+
+A batch is an (N, 4) int32 array of x, y, width, height. The operations match
+the one-rect-at-a-time functions in `rectop.get` and `rectop.query`.
+"""
+from . import get
+from .constants import CORNERS
+from .external import numpy
+from .external import Rect
+
+DTYPE = 'int32'
+
+class RectArray:
+    """
+    Batch of rects as an (N, 4) array of x, y, width, height.
+    """
+
+    def __init__(self, data=()):
+        if numpy is None:
+            raise ImportError('rectop.batch requires numpy')
+        self.data = numpy.asarray(data, dtype=DTYPE).reshape(-1, 4)
+
+    @classmethod
+    def from_rects(cls, rects):
+        """
+        New batch from iterable of pygame.Rect, or anything unpacking to
+        x, y, width, height.
+        """
+        return cls([tuple(rect) for rect in rects])
+
+    def to_rects(self):
+        """
+        List of new rects, see `rectop.external.Rect`.
+        """
+        return [Rect(*row) for row in self.data.tolist()]
+
+    def __len__(self):
+        return len(self.data)
+
+    def __iter__(self):
+        return iter(self.to_rects())
+
+    def __getitem__(self, key):
+        """
+        Integers return a rect, anything else numpy can index with,
+        (slices, index and bool arrays) return a new batch.
+        """
+        if isinstance(key, (int, numpy.integer)):
+            return Rect(*self.data[key].tolist())
+        return type(self)(self.data[key])
+
+    def __repr__(self):
+        return f'<{type(self).__name__}({len(self)})>'
+
+    @property
+    def x(self):
+        return self.data[:, 0]
+
+    @property
+    def y(self):
+        return self.data[:, 1]
+
+    @property
+    def width(self):
+        return self.data[:, 2]
+
+    @property
+    def height(self):
+        return self.data[:, 3]
+
+    left = x
+    top = y
+
+    @property
+    def right(self):
+        return self.x + self.width
+
+    @property
+    def bottom(self):
+        return self.y + self.height
+
+    def sides(self):
+        """
+        4-tuple of arrays like `rectop.get.sides`.
+        """
+        return (self.top, self.right, self.bottom, self.left)
+
+    def corners(self):
+        """
+        (N, 4, 2) array of x, y ordered like `rectop.get.corners`.
+        """
+        points = []
+        for name in CORNERS:
+            yname = 'top' if name.startswith('top') else 'bottom'
+            xname = name[len(yname):]
+            xy = (getattr(self, xname), getattr(self, yname))
+            points.append(numpy.stack(xy, axis=-1))
+        return numpy.stack(points, axis=1)
+
+    def wrap(self):
+        """
+        One rect wrapping all the rects, like `rectop.get.wrap`.
+        """
+        left = int(self.left.min())
+        top = int(self.top.min())
+        right = int(self.right.max())
+        bottom = int(self.bottom.max())
+        return Rect(left, top, right - left, bottom - top)
+
+    def collidepoint(self, pos):
+        """
+        Bool array of rects containing `pos`, like `pygame.Rect.collidepoint`.
+        """
+        x, y = pos
+        return (
+            (self.left <= x) & (x < self.right)
+            & (self.top <= y) & (y < self.bottom)
+        )
+
+    def collide_matrix(self, other=None):
+        """
+        (N, M) bool array of which rects collide with `other` rects, like
+        `pygame.Rect.colliderect`. Collide with self if `other` is not given.
+        """
+        if other is None:
+            other = self
+        top1, right1, bottom1, left1 = (side[:, None] for side in self.sides())
+        top2, right2, bottom2, left2 = (side[None, :] for side in other.sides())
+        return (
+            (left1 < right2) & (left2 < right1)
+            & (top1 < bottom2) & (top2 < bottom1)
+            # zero size rects never collide
+            & (self.width > 0)[:, None] & (self.height > 0)[:, None]
+            & (other.width > 0)[None, :] & (other.height > 0)[None, :]
+        )
+
+    def colliding_pairs(self):
+        """
+        2-tuple of index arrays, i < j, of colliding rects.
+        """
+        return numpy.nonzero(numpy.triu(self.collide_matrix(), k=1))
+
+    def intersection(self, other):
+        """
+        Intersections of rects with `other` rects, element-wise, like
+        `rectop.get.intersection`. Return a 2-tuple of a batch and a bool
+        array of which pairs have an intersection, the rest are zeros.
+        """
+        left = numpy.maximum(self.left, other.left)
+        top = numpy.maximum(self.top, other.top)
+        right = numpy.minimum(self.right, other.right)
+        bottom = numpy.minimum(self.bottom, other.bottom)
+        same = (self.data == other.data).all(axis=-1)
+        has = same | (
+            (left < right) & (top < bottom)
+            & (self.width > 0) & (self.height > 0)
+            & (other.width > 0) & (other.height > 0)
+        )
+        data = numpy.stack([left, top, right - left, bottom - top], axis=-1)
+        # equal rects intersect as themselves, even zero size
+        data = numpy.where(same[..., None], self.data, data)
+        data = numpy.where(has[..., None], data, 0)
+        return (type(self)(data), has)
+
+    def filter(self, direction, test):
+        """
+        Bool array of rects in `direction` of rect `test`, like
+        `rectop.query.filter_rects`.
+        """
+        top, right, bottom, left = get.sides(test)
+        if direction == 'left':
+            facing = self.right < left
+        elif direction == 'right':
+            facing = self.left > right
+        elif direction == 'top':
+            facing = self.bottom < top
+        elif direction == 'bottom':
+            facing = self.top > bottom
+        else:
+            raise ValueError(direction)
+        if direction in ('left', 'right'):
+            between = (self.top <= bottom) & (self.bottom >= top)
+        else:
+            between = (self.right >= left) & (self.left <= right)
+        return facing & between
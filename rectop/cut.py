@@ -1,5 +1,7 @@
-from . import get
-from .external import pygame
+from collections import defaultdict
+
+from . import diff
+from . import sweep
 
 def position(pos, rect):
     """
@@ -12,11 +14,12 @@ def position(pos, rect):
     rightwidth = rect.right - x
     topheight = y - rect.y
     bottomheight = rect.bottom - y
+    Rect = type(rect)
     rects = [
-        pygame.Rect(rect.x, rect.y, leftwidth, topheight),
-        pygame.Rect(x, rect.y, rightwidth, topheight),
-        pygame.Rect(rect.x, y, leftwidth, bottomheight),
-        pygame.Rect(x, y, rightwidth, bottomheight),
+        Rect(rect.x, rect.y, leftwidth, topheight),
+        Rect(x, rect.y, rightwidth, topheight),
+        Rect(rect.x, y, leftwidth, bottomheight),
+        Rect(x, y, rightwidth, bottomheight),
     ]
     rects = [rect for rect in rects if rect.width > 0 and rect.height > 0]
     return rects
@@ -35,34 +38,95 @@ def with_knife(knife, rect):
         left_width = knife.left - rect.left
         right_width = rect.right - knife.right
         bottom_height = rect.bottom - knife.bottom
+        Rect = type(rect)
         subrects = [
             # upper-left
-            pygame.Rect(rect.topleft, (left_width, top_height)),
+            Rect(rect.topleft, (left_width, top_height)),
             # mid-upper
-            pygame.Rect((knife.left, rect.top), (knife.width, top_height)),
+            Rect((knife.left, rect.top), (knife.width, top_height)),
             # upper-right
-            pygame.Rect((knife.right, rect.top), (right_width, top_height)),
+            Rect((knife.right, rect.top), (right_width, top_height)),
             # mid-right
-            pygame.Rect((knife.right, knife.top), (right_width, knife.height)),
+            Rect((knife.right, knife.top), (right_width, knife.height)),
             # bottom-right
-            pygame.Rect((knife.right, knife.bottom), (right_width, bottom_height)),
+            Rect((knife.right, knife.bottom), (right_width, bottom_height)),
             # mid-bottom
-            pygame.Rect((knife.left, knife.bottom), (knife.width, bottom_height)),
+            Rect((knife.left, knife.bottom), (knife.width, bottom_height)),
             # bottom-left
-            pygame.Rect((rect.left, knife.bottom), (left_width, bottom_height)),
+            Rect((rect.left, knife.bottom), (left_width, bottom_height)),
             # mid-left
-            pygame.Rect((rect.left, knife.top), (left_width, knife.height)),
+            Rect((rect.left, knife.top), (left_width, knife.height)),
         ]
         # remove zero size rects
         # TODO: what happens in negative cartesian space?
         subrects = [rect for rect in subrects if rect.width > 0 and rect.height > 0]
     return subrects
 
-def all(knife, rect_list):
+def all(knife, rect_list, progress=None):
+    """
+    Cut all rects in `rect_list` colliding with `knife`, in-place. Return the
+    `rectop.diff` of rects appended and removed.
+
+    :param progress: optional callable(done, total) called as rects are cut.
+    """
+    if hasattr(rect_list, 'query_rect'):
+        # `rectop.store.RectStore`, remove by id
+        touching_ids = rect_list.query_rect(knife)
+        touching = [rect_list[rect_id] for rect_id in touching_ids]
+    else:
+        touching = []
+        kept = []
+        for rect in rect_list:
+            if rect.colliderect(knife):
+                touching.append(rect)
+            else:
+                kept.append(rect)
+    all_subrects = []
+    for done, touched in enumerate(touching, 1):
+        all_subrects.extend(with_knife(knife, touched))
+        if progress:
+            progress(done, len(touching))
+    if hasattr(rect_list, 'query_rect'):
+        for rect_id in touching_ids:
+            rect_list.delete(rect_id)
+    else:
+        # rebuild the list once, like `many`
+        rect_list[:] = kept
+    rect_list.extend(all_subrects)
+    return diff.new(append=all_subrects, remove=touching)
+
+def many(knives, rect_list):
     """
+    Cut rects in `rect_list` with every rect in `knives`, in-place. The result
+    is the same as calling `all` with each knife in order. Return the
+    `rectop.diff` of rects appended and removed, like `all`.
     """
-    touching = [rect for rect in rect_list if rect.colliderect(knife)]
-    all_subrects = [subrect for touched in touching for subrect in with_knife(knife, touched)]
-    for rect in touching:
-        rect_list.remove(rect)
+    knives = list(knives)
+    rects = list(rect_list)
+    # rect index -> knife indexes
+    knives_for = defaultdict(list)
+    for knife_index, rect_index in sweep.bipartite(knives, rects):
+        knives_for[rect_index].append(knife_index)
+
+    touching = []
+    all_subrects = []
+    for rect_index in sorted(knives_for):
+        rect = rects[rect_index]
+        # later knives cut the pieces of earlier ones, pieces are always
+        # inside `rect` so no other knives can touch them.
+        pieces = [rect]
+        for knife_index in sorted(knives_for[rect_index]):
+            knife = knives[knife_index]
+            pieces = [
+                subrect
+                for piece in pieces
+                for subrect in (
+                    with_knife(knife, piece) if piece.colliderect(knife) else [piece]
+                )
+            ]
+        touching.append(rect)
+        all_subrects.extend(pieces)
+
+    rect_list[:] = [rect for i, rect in enumerate(rects) if i not in knives_for]
     rect_list.extend(all_subrects)
+    return diff.new(append=all_subrects, remove=touching)
@@ -0,0 +1,135 @@
+"""
+Reversible diffs of rect lists.
+
+A diff is the {'append': [...], 'remove': [...]} dict returned by rect
+operations like `rectop.join.defrag` and `rectop.cut.all`. Applying appends
+then removes, so a diff may remove rects it appended itself.
+"""
+from collections import Counter
+from collections import deque
+from itertools import chain
+
+# most rects held by the diffs in a History
+MAX_HISTORY_RECTS = 100_000
+
+def new(append=(), remove=()):
+    """
+    New diff of rects to append and remove.
+    """
+    return {
+        'append': list(append),
+        'remove': list(remove),
+    }
+
+def apply(diff, rects):
+    """
+    Apply diff to list of rects in-place. Removing takes the first equal
+    rect, like `list.remove`, and raises ValueError, before changing rects,
+    if one is missing.
+    """
+    if not isinstance(rects, list):
+        # `rectop.store.RectStore`, find the removed rects before changing it,
+        # rects the diff appends and removes itself are never stored
+        removing = Counter(map(tuple, diff['remove']))
+        appending = []
+        for rect in diff['append']:
+            key = tuple(rect)
+            if removing[key]:
+                removing[key] -= 1
+            else:
+                appending.append(rect)
+        found = rects.find_many(removing.elements())
+        rects.extend(appending)
+        for rect_id in found:
+            rects.delete(rect_id)
+        return
+    # rebuild the list once, without the list.remove scans
+    removing = Counter(map(tuple, diff['remove']))
+    kept = []
+    for rect in chain(rects, diff['append']):
+        key = tuple(rect)
+        if removing[key]:
+            removing[key] -= 1
+        else:
+            kept.append(rect)
+    missing = +removing
+    if missing:
+        raise ValueError(f'diff removes missing rects {list(missing)}')
+    rects[:] = kept
+
+def invert(diff):
+    """
+    Diff that undoes `diff`.
+    """
+    return new(append=diff['remove'], remove=diff['append'])
+
+def size(diff):
+    """
+    Number of rects in diff.
+    """
+    return len(diff['append']) + len(diff['remove'])
+
+def is_empty(diff):
+    return not (diff['append'] or diff['remove'])
+
+def is_applicable(diff, rects):
+    """
+    Every rect that diff removes is in `rects` or appended by the diff, ie:
+    rects did not change in the way of a diff made from an older copy.
+    """
+    available = Counter(map(tuple, rects))
+    available.update(map(tuple, diff['append']))
+    needed = Counter(map(tuple, diff['remove']))
+    return all(available[key] >= count for key, count in needed.items())
+
+
+class History:
+    """
+    Undo and redo stacks of named diffs. The oldest undos are dropped when
+    the diffs hold more than `max_rects`.
+    """
+
+    def __init__(self, max_rects=MAX_HISTORY_RECTS):
+        self.max_rects = max_rects
+        self.undos = deque()
+        self.redos = []
+        self.held = 0
+
+    def push(self, op, diff):
+        """
+        Record diff applied by operation named `op`, clearing redos.
+        """
+        for _, redo in self.redos:
+            self.held -= size(redo)
+        self.redos.clear()
+        self.undos.append((op, diff))
+        self.held += size(diff)
+        # always keep the latest
+        while self.held > self.max_rects and len(self.undos) > 1:
+            _, dropped = self.undos.popleft()
+            self.held -= size(dropped)
+
+    def undo(self, rects):
+        """
+        Undo last diff on `rects` in-place. Return (op, applied diff) or None
+        if there is nothing to undo.
+        """
+        if not self.undos:
+            return
+        op, diff = self.undos.pop()
+        undo = invert(diff)
+        apply(undo, rects)
+        self.redos.append((op, diff))
+        return (op, undo)
+
+    def redo(self, rects):
+        """
+        Redo last undone diff on `rects` in-place. Return (op, applied diff)
+        or None if there is nothing to redo.
+        """
+        if not self.redos:
+            return
+        op, diff = self.redos.pop()
+        apply(diff, rects)
+        self.undos.append((op, diff))
+        return (op, diff)
@@ -1,5 +1,29 @@
+"""
+Optional dependencies.
+
+`Rect` is the type of the rects rectop makes from scratch, `pygame.Rect`
+when pygame is installed, otherwise `rectop.rect.Rect`. Set RECTOP_NO_PYGAME
+in the environment to skip importing pygame, and SDL, in headless jobs.
+Operations on rects make rects of the type they were given.
+"""
 import contextlib
 import os
 
-with contextlib.redirect_stdout(open(os.devnull, 'w')):
-    import pygame
+from . import rect
+
+if os.environ.get('RECTOP_NO_PYGAME'):
+    pygame = None
+else:
+    try:
+        with contextlib.redirect_stdout(open(os.devnull, 'w')):
+            import pygame
+    except ImportError:
+        pygame = None
+
+Rect = pygame.Rect if pygame else rect.Rect
+
+# optional, for rectop.batch
+try:
+    import numpy
+except ImportError:
+    numpy = None
@@ -2,11 +2,13 @@ from itertools import chain
 from itertools import product
 from operator import attrgetter
 
+from . import sweep
 from .constants import CORNERS
 from .constants import LINES
 from .constants import MIDPOINTS
 from .constants import POINTS
 from .constants import SIDES
+from .external import Rect
 from .external import pygame
 
 corners = attrgetter(*CORNERS)
@@ -57,7 +59,7 @@ def from_points(points):
     top, bottom = min(ys), max(ys)
     width = right - left
     height = bottom - top
-    return pygame.Rect(left, top, width, height)
+    return Rect(left, top, width, height)
 
 def is_intersect(vert, horz):
     """
@@ -105,9 +107,11 @@ def intersection_points(r1, r2):
         (line_intersect(v,h) for v, h in product(verts2, horzs1) if is_intersect(v, h)),
     )
 
-def intersection(r1, r2):
+def intersection_lines(r1, r2):
     """
-    Return new rect of the intersection of two rects.
+    Return new rect of the intersection of two rects, from the points where
+    their lines intersect and their corners inside each other. Reference for
+    `intersection_minmax`.
     """
     if r1 == r2:
         return r1.copy()
@@ -127,6 +131,59 @@ def intersection(r1, r2):
     rect = from_points(points)
     return rect
 
+def intersection_minmax(r1, r2):
+    """
+    Return new rect of the intersection of two rects, or None if they do
+    not overlap. Equal rects intersect as a copy, even zero size ones. Like
+    `intersection_lines`, sizes must not be negative, see `normalized`.
+    """
+    if r1 == r2:
+        return r1.copy()
+    left = max(r1.left, r2.left)
+    right = min(r1.right, r2.right)
+    if left >= right:
+        return
+    top = max(r1.top, r2.top)
+    bottom = min(r1.bottom, r2.bottom)
+    if top >= bottom:
+        return
+    return type(r1)(left, top, right - left, bottom - top)
+
+def intersection_pygame(r1, r2):
+    """
+    Return new rect of the intersection of two rects with
+    `pygame.Rect.clip`, or None if they do not overlap, like
+    `intersection_minmax`.
+    """
+    if r1 == r2:
+        return r1.copy()
+    if r1.colliderect(r2):
+        return r1.clip(r2)
+
+# see timeit/intersection.sh, pygame does the min and max in C
+intersection = intersection_pygame
+
+def intersections(pairs):
+    """
+    List of `intersection` of each pair of rects, None where they do not
+    overlap. See `rectop.batch.RectArray.intersection` for numpy arrays.
+    """
+    return [
+        r1.copy() if r1 == r2 else r1.clip(r2) if r1.colliderect(r2) else None
+        for r1, r2 in pairs
+    ]
+
+def all_intersections(rects):
+    """
+    Generate 3-tuples of colliding rects and their intersection rect, only
+    visiting the pairs that overlap.
+    """
+    rects = list(rects)
+    for i, j in sweep.pairs(rects):
+        r1 = rects[i]
+        r2 = rects[j]
+        yield (r1, r2, r1.clip(r2))
+
 def namedpoints(rect):
     """
     `points` with the attribute's name included.
@@ -135,12 +192,9 @@ def namedpoints(rect):
 
 def normalized(start, stop, rect=None):
     """
-    Return a pygame.Rect ensuring positive width and height. Modify `rect`
+    Return a rect ensuring positive width and height. Modify `rect`
     in-place, if given.
     """
-    if rect is None:
-        rect = pygame.Rect(0,0,0,0)
-
     sx, sy = start
     ex, ey = stop
 
@@ -149,6 +203,8 @@ def normalized(start, stop, rect=None):
 
     w = ex - sx
     h = ey - sy
+    if rect is None:
+        return Rect(sx, sy, w, h)
     rect.x = sx
     rect.y = sy
     rect.width = w
@@ -158,6 +214,7 @@ def normalized(start, stop, rect=None):
 def new(**attrs):
     """
     Convenience func for creating and positioning pygame.Rect all at once.
+    Needs pygame, the rect is positioned in-place.
     """
     # minimum required by pygame
     x = attrs.setdefault('x', 0)
@@ -220,14 +277,16 @@ def wrap_python(rects):
     left = min(lefts)
     width = right - left
     height = bottom - top
-    return pygame.Rect(left, top, width, height)
+    return Rect(left, top, width, height)
 
 def wrap_pygame(rects):
     """
     Convenience for `pygame.Rect.unionall`. `unionall` requires the instance
-    Rect. This picks off the first rect and uses it to unionall the remaining.
+    Rect. This picks off the first rect and uses it to unionall the remaining,
+    so the result is of its type.
     """
     # see timeit/wrap.sh for huge speed up
+    # see rectop.wrap.outline to wrap with polygons
     rect, *rects = rects
     return rect.unionall(rects)
 
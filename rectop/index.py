@@ -0,0 +1,96 @@
+"""
+Spatial index for collections of rects.
+
+Rects are bucketed into a uniform grid of square cells so that point and rect
+hit tests only look at the rects in the cells they touch.
+"""
+from array import array
+from bisect import insort
+
+CELLSIZE = 64
+
+class Grid:
+    """
+    Uniform grid of cells holding `array('i')` of the int keys of the rects in
+    them, in key order, four bytes a rect and cell. Bounds are not kept, the
+    owner of the rects passes a key's rect to remove it and tests the
+    candidates against its own rects.
+    """
+
+    def __init__(self, cellsize=CELLSIZE):
+        self.cellsize = cellsize
+        # (column, row) -> keys
+        self.cells = {}
+
+    def __len__(self):
+        return len(self.cells)
+
+    def cells_for(self, rect):
+        """
+        Generate the (column, row) cells covered by a rect, zero size rects
+        are in the cell of their position, so they are found by value.
+        """
+        x, y, w, h = rect
+        size = self.cellsize
+        right = x + max(w, 1) - 1
+        bottom = y + max(h, 1) - 1
+        for row in range(y // size, bottom // size + 1):
+            for column in range(x // size, right // size + 1):
+                yield (column, row)
+
+    def insert(self, key, rect):
+        """
+        Add rect under `key`.
+        """
+        for cell in self.cells_for(rect):
+            keys = self.cells.get(cell)
+            if keys is None:
+                keys = self.cells[cell] = array('i')
+            if keys and keys[-1] > key:
+                insort(keys, key)
+            else:
+                keys.append(key)
+
+    def remove(self, key, rect):
+        """
+        Remove `key`, inserted with rect.
+        """
+        for cell in self.cells_for(rect):
+            keys = self.cells[cell]
+            keys.remove(key)
+            if not keys:
+                del self.cells[cell]
+
+    def bulk_load(self, items):
+        """
+        Insert 2-tuples of (key, rect).
+        """
+        for key, rect in items:
+            self.insert(key, rect)
+
+    def clear(self):
+        self.cells.clear()
+
+    def point_candidates(self, pos):
+        """
+        Keys of rects that may contain `pos`, in key order.
+        """
+        x, y = pos
+        return self.cells.get((x // self.cellsize, y // self.cellsize), ())
+
+    def rect_candidates(self, rect):
+        """
+        Keys of rects that may overlap `rect`, in key order.
+        """
+        cells = self.cells
+        found = set()
+        for cell in self.cells_for(rect):
+            found.update(cells.get(cell, ()))
+        return sorted(found)
+
+    @property
+    def nbytes(self):
+        """
+        Bytes used by the key arrays.
+        """
+        return sum(keys.itemsize * len(keys) for keys in self.cells.values())
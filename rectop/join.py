@@ -1,53 +1,340 @@
-from itertools import combinations
-from itertools import tee
+import heapq
+import os
 
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import count
+from itertools import repeat
+from operator import attrgetter
+
+from . import diff
 from . import get
-from . import query
+from . import partition
+from . import sweep
+
+# defrag_parallel runs in one process when a partition has more of the rects
+# than this, the pool would wait on it after pickling everything
+PARALLEL_MAX_SHARE = 0.5
+
+def edge_keys(rect):
+    """
+    Keys indexing the sides of `rect` that another rect must exactly match to
+    be joinable with it.
+    """
+    top, right, bottom, left = get.sides(rect)
+    return [
+        ('left', top, bottom, left),
+        ('right', top, bottom, right),
+        ('top', left, right, top),
+        ('bottom', left, right, bottom),
+        ('same', left, top, right, bottom),
+    ]
 
-def defrag(rects):
+def partner_keys(rect):
+    """
+    Keys of the sides that are joinable with `rect`, ordered like `edge_keys`,
+    ie: the rect to our left has its right side on our left side.
     """
+    top, right, bottom, left = get.sides(rect)
+    return [
+        ('right', top, bottom, left),
+        ('left', top, bottom, right),
+        ('bottom', left, right, top),
+        ('top', left, right, bottom),
+        ('same', left, top, right, bottom),
+    ]
+
+def defrag_largest(rects, progress=None):
     """
-    def area(item):
-        r1, r2, wrapped = item
-        return wrapped.width * wrapped.height
+    Repeatedly join the pair of joinable rects with the largest wrapping rect
+    until nothing can be joined. Return the operations to get there, see
+    `apply`.
+
+    Rects are indexed by their sides so that finding the rects joinable with
+    any one rect is a dict lookup, and candidate joins are kept in a heap that
+    is updated as rects are joined.
 
+    :param progress: optional callable(done, total) called after indexing
+                     each rect and after each join, total is the rects plus
+                     the most joins there could be.
+    """
     result = {
         'append': [],
         'remove': [],
     }
     append_ops = result['append']
     remove_ops = result['remove']
-    while True:
-        # generate rects as-if the operations have been applied
-        with_ops = (rect for rect in rects + append_ops if rect not in remove_ops)
-        # generate 2-tuples of rects that can be joined
-        joinables = (
-            (r1, r2) for r1, r2 in combinations(with_ops, 2) if query.is_joinable(r1, r2)
-        )
-        # duplicate generator to efficiently test and, if it has joinables,
-        # join them
-        has_join, joinables = tee(joinables)
-        if not any(has_join):
-            # nothing to join, done
-            break
-        # generate 3-tuples of rects and a wrapping rect
-        joined = ((r1, r2, get.wrap((r1, r2))) for r1, r2 in joinables)
-        # find the largest wrap and the rects that can be removed
-        r1, r2, largest_join = sorted(joined, key=area)[-1]
+
+    # key -> rect, for rects as-if the operations have been applied
+    live = {}
+    # side key -> rect keys, dicts as ordered sets
+    edges = defaultdict(dict)
+    # max-heap of candidate joins, ties go to the later pair of rects
+    candidates = []
+    keys = count()
+
+    def add(rect):
+        key = next(keys)
+        for partner_key in partner_keys(rect):
+            for other in edges.get(partner_key, ()):
+                wrapped = get.wrap((live[other], rect))
+                area = wrapped.width * wrapped.height
+                heapq.heappush(candidates, (-area, -other, -key))
+        for edge_key in edge_keys(rect):
+            edges[edge_key][key] = None
+        live[key] = rect
+
+    def discard(key):
+        rect = live.pop(key)
+        for edge_key in edge_keys(rect):
+            keyed = edges[edge_key]
+            del keyed[key]
+            if not keyed:
+                del edges[edge_key]
+        return rect
+
+    nrects = len(rects)
+    total = 2 * nrects - 1
+    for indexed, rect in enumerate(rects, 1):
+        add(rect)
+        if progress:
+            progress(indexed, total)
+
+    while candidates:
+        _, key1, key2 = heapq.heappop(candidates)
+        key1, key2 = -key1, -key2
+        if key1 not in live or key2 not in live:
+            # stale, one of them was already joined into something else
+            continue
+        r1 = discard(key1)
+        r2 = discard(key2)
         # replace rects with their wrapping rect
-        append_ops.append(largest_join)
+        joined = get.wrap((r1, r2))
+        append_ops.append(joined)
         remove_ops.extend([r1, r2])
+        add(joined)
+        if progress:
+            progress(nrects + len(append_ops), total)
+    return result
+
+def join_runs(rects, sides, result):
+    """
+    Join runs of rects end to end in the same band and return the list of
+    rects after joining. Adds the operations to `result`.
+
+    :param sides: attribute names of the band sides and of the start and end
+                  of rects along the band.
+    """
+    getter = attrgetter(*sides)
+    # band -> start -> rects
+    bands = defaultdict(lambda: defaultdict(list))
+    for rect in rects:
+        band1, band2, start, _ = getter(rect)
+        bands[(band1, band2)][start].append(rect)
+
+    joined = []
+    for starts in bands.values():
+        for start in sorted(starts):
+            stack = starts[start]
+            while stack:
+                run = [stack.pop()]
+                end = getter(run[-1])[3]
+                while starts.get(end):
+                    run.append(starts[end].pop())
+                    end = getter(run[-1])[3]
+                if len(run) == 1:
+                    joined.append(run[0])
+                    continue
+                wrapped = get.wrap(run)
+                result['append'].append(wrapped)
+                result['remove'].extend(run)
+                joined.append(wrapped)
+    return joined
+
+def defrag_greedy(rects, progress=None):
+    """
+    Join runs of rects along rows, then along columns, until nothing can be
+    joined. Each pass is a sort of the rects in each row or column. Faster
+    than `defrag_largest` but usually leaves more rects.
+
+    :param progress: optional callable(done, total) called after each pass
+                     with the number of rects joined away.
+    """
+    result = diff.new()
+    nrects = len(rects)
+    # same rects are joinable, keep the first
+    unique = {}
+    for rect in rects:
+        key = tuple(rect)
+        if key in unique:
+            result['remove'].append(rect)
+        else:
+            unique[key] = rect
+    rects = list(unique.values())
+
+    while True:
+        size = diff.size(result)
+        rects = join_runs(rects, ('top', 'bottom', 'left', 'right'), result)
+        rects = join_runs(rects, ('left', 'right', 'top', 'bottom'), result)
+        if diff.size(result) == size:
+            return result
+        if progress:
+            progress(nrects - len(rects), nrects - 1)
+
+def defrag_optimal(rects, progress=None):
+    """
+    Replace each group of touching rects with a minimum partition of their
+    area, see `rectop.partition`, when it is fewer rects. Unlike the other
+    strategies the new rects are not only joins of the old ones. Overlapping
+    rects can need more rects to partition, those groups are defragged with
+    `defrag_largest`.
+
+    :param progress: optional callable(done, total) called before each group
+                     with the number of rects done.
+    """
+    rects = list(rects)
+    result = diff.new()
+    leftover = []
+    done = 0
+    for indexes in partitions(rects):
+        if progress:
+            progress(done, len(rects))
+        done += len(indexes)
+        group = [rects[i] for i in indexes]
+        if len(group) > 1 and all(rect.width and rect.height for rect in group):
+            minimum = partition.minimum(group)
+            if len(minimum) < len(group):
+                result['append'].extend(minimum)
+                result['remove'].extend(group)
+                continue
+        leftover.extend(group)
+    largest = defrag_largest(leftover)
+    result['append'].extend(largest['append'])
+    result['remove'].extend(largest['remove'])
+    return result
+
+STRATEGIES = {
+    'greedy': defrag_greedy,
+    'largest': defrag_largest,
+    'optimal': defrag_optimal,
+}
+
+def defrag(rects, strategy='largest', progress=None):
+    """
+    Join rects until nothing can be joined. Return the operations to get
+    there, see `apply`.
+
+    :param strategy: name in `STRATEGIES`, from fastest to fewest rects
+                     'greedy', 'largest' or 'optimal'.
+    :param progress: optional callable(done, total) the strategy calls as it
+                     goes, it may raise to stop.
+    """
+    try:
+        defrag_strategy = STRATEGIES[strategy]
+    except KeyError:
+        raise ValueError(f'unknown defrag strategy {strategy!r}')
+    return defrag_strategy(rects, progress=progress)
+
+def partitions(rects, cellsize=None):
+    """
+    List of lists of indexes of rects that can only ever be joined with each
+    other, the connected components of touching rects. Joined rects only
+    cover their parts, so they never join across partitions.
+
+    :param cellsize: instead put together rects in the same cells of a grid
+                     of this size, touching sides included. Coarser but in
+                     linear time, for sizes about the largest rect side.
+    """
+    parents = list(range(len(rects)))
+
+    def find(i):
+        while parents[i] != i:
+            parents[i] = parents[parents[i]]
+            i = parents[i]
+        return i
+
+    def union(i, j):
+        i = find(i)
+        j = find(j)
+        if i != j:
+            parents[max(i, j)] = min(i, j)
+
+    if cellsize is None:
+        for i, j in sweep.touching(rects):
+            union(i, j)
+    else:
+        # cell -> first rect in it
+        owners = {}
+        for i, rect in enumerate(rects):
+            top, right, bottom, left = get.sides(rect)
+            for row in range(top // cellsize, bottom // cellsize + 1):
+                for column in range(left // cellsize, right // cellsize + 1):
+                    owner = owners.setdefault((column, row), i)
+                    if owner != i:
+                        union(owner, i)
+
+    components = defaultdict(list)
+    for i in range(len(rects)):
+        components[find(i)].append(i)
+    return list(components.values())
+
+def available_cpus():
+    """
+    Number of CPUs this process may run on.
+    """
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+def defrag_parallel(rects, jobs=None, chunks_per_job=4, strategy='largest'):
+    """
+    Like `defrag` but defrag partitions of rects, see `partitions`, in a
+    process pool and merge the results. Rects that are mostly one partition,
+    like a contiguous tile map, gain nothing from the pool and are defragged
+    here with `defrag`, as are any rects with fewer than two CPUs to use.
+
+    :param jobs: number of processes, at most and by default the number of
+                 CPUs available.
+    :param chunks_per_job: partitions are packed into about this many
+                           chunks of similar size for each process.
+    :param strategy: see `defrag`.
+    """
+    rects = list(rects)
+    jobs = min(jobs or available_cpus(), available_cpus())
+    cellsize = max((max(rect.width, rect.height) for rect in rects), default=0)
+    groups = partitions(rects, max(cellsize, 1))
+    largest = max(map(len, groups), default=0)
+    if jobs < 2 or largest > len(rects) * PARALLEL_MAX_SHARE:
+        return defrag(rects, strategy)
+
+    # pack largest partitions first into the smallest chunk
+    chunks = [[] for _ in range(jobs * chunks_per_job)]
+    smallest = [(0, i) for i in range(len(chunks))]
+    for indexes in sorted(groups, key=len, reverse=True):
+        size, i = heapq.heappop(smallest)
+        chunks[i].extend(indexes)
+        heapq.heappush(smallest, (size + len(indexes), i))
+    # keep the original order in chunks, defrag breaks ties by order
+    chunks = [[rects[i] for i in sorted(chunk)] for chunk in chunks if chunk]
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        results = list(executor.map(defrag, chunks, repeat(strategy)))
+
+    result = {
+        'append': [],
+        'remove': [],
+    }
+    for chunk_result in results:
+        result['append'].extend(chunk_result['append'])
+        result['remove'].extend(chunk_result['remove'])
     return result
 
 def apply(defrag_result, rects):
     """
     Apply the result of defrag.
     """
-    for newrect in defrag_result['append']:
-        rects.append(newrect)
-    for redundant in defrag_result['remove']:
-        rects.remove(redundant)
+    diff.apply(defrag_result, rects)
 
-def defrag_ip(rects):
-    ops = defrag(rects)
+def defrag_ip(rects, strategy='largest'):
+    ops = defrag(rects, strategy)
     apply(ops, rects)
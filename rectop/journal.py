@@ -0,0 +1,221 @@
+"""
+Append-only journal of rect operations on top of a layout snapshot.
+
+    header   magic, version, snapshot count and crc32 the journal applies to
+    entries  op code, remove count, append count, then the removed and
+             appended records like `rectop.layout`
+
+Each entry is the {'append', 'remove'} result of an operation, see
+`rectop.join.apply`. Saving costs the size of the change, and the journal is
+compacted into the snapshot every so often. A journal whose snapshot does not
+match was already compacted and is ignored.
+"""
+import os
+import struct
+import zlib
+
+from collections import defaultdict
+from collections import deque
+
+from . import layout
+from .external import Rect
+
+MAGIC = b'SHWJ'
+VERSION = 1
+
+HEADER = struct.Struct('<4sHQI')
+ENTRY = struct.Struct('<BII')
+
+# append only, the index is the op code in the file
+OPS = (
+    'new',
+    'cut',
+    'subdivide',
+    'delete',
+    'defrag',
+    'intersect',
+    'undo',
+    'redo',
+)
+
+COMPACT_EVERY = 256
+
+class JournalError(Exception):
+    pass
+
+
+def snapshot_signature(filename):
+    """
+    Return (count, crc32) of snapshot layout records, zeros if no snapshot.
+    """
+    if not os.path.exists(filename):
+        return (0, 0)
+    with layout.Layout(filename) as snapshot:
+        with snapshot.data[:snapshot.count * layout.RECORD.size] as records:
+            return (snapshot.count, zlib.crc32(records))
+
+def read_entries(fp):
+    """
+    Generate (op, removed, appended) record tuples from an open journal
+    after its header. Stops at a truncated entry, from a crash mid-write.
+    """
+    record_size = layout.RECORD.size
+    while True:
+        data = fp.read(ENTRY.size)
+        if len(data) < ENTRY.size:
+            return
+        code, nremove, nappend = ENTRY.unpack(data)
+        size = (nremove + nappend) * record_size
+        data = fp.read(size)
+        if len(data) < size:
+            return
+        records = list(layout.RECORD.iter_unpack(data))
+        yield (OPS[code], records[:nremove], records[nremove:])
+
+def replay(filename, rects):
+    """
+    Return list of new rects from applying journal entries to `rects`.
+    """
+    # apply to tuples with lazy deletes, removing the first equal rect like
+    # list.remove, without the list.remove scans
+    items = [tuple(rect) for rect in rects]
+    positions = defaultdict(deque)
+    for position, item in enumerate(items):
+        positions[item].append(position)
+
+    with open(filename, 'rb') as fp:
+        read_header(fp)
+        for op, removed, appended in read_entries(fp):
+            for item in appended:
+                positions[item].append(len(items))
+                items.append(item)
+            for item in removed:
+                try:
+                    position = positions[item].popleft()
+                except IndexError:
+                    raise JournalError(f'{op} removes missing rect {item}')
+                items[position] = None
+    return [Rect(item) for item in items if item is not None]
+
+def read_header(fp):
+    """
+    Return (snapshot count, snapshot crc32) from header of open journal.
+    """
+    data = fp.read(HEADER.size)
+    if len(data) < HEADER.size:
+        raise JournalError('truncated header')
+    magic, version, count, crc = HEADER.unpack(data)
+    if magic != MAGIC:
+        raise JournalError('not a journal file')
+    if version != VERSION:
+        raise JournalError(f'unsupported version {version}')
+    return (count, crc)
+
+def restore(snapshot_filename, journal_filename):
+    """
+    Return list of rects from snapshot and the journal on top of it.
+    """
+    rects = []
+    if os.path.exists(snapshot_filename):
+        rects = layout.load(snapshot_filename)
+    if os.path.exists(journal_filename):
+        with open(journal_filename, 'rb') as fp:
+            signature = read_header(fp)
+        if signature == snapshot_signature(snapshot_filename):
+            rects = replay(journal_filename, rects)
+    return rects
+
+
+class Journal:
+    """
+    Journal file open for appending operations.
+    """
+
+    def __init__(
+        self,
+        filename,
+        snapshot_filename,
+        compact_every = COMPACT_EVERY,
+        sync = False,
+    ):
+        """
+        :param compact_every: number of entries before `needs_compaction`.
+        :param sync: fsync after each entry, not just flush.
+        """
+        self.filename = filename
+        self.snapshot_filename = snapshot_filename
+        self.compact_every = compact_every
+        self.sync = sync
+        self.entries = 0
+        self.fp = None
+        self.open()
+
+    def open(self):
+        """
+        Open the journal, starting a new one if it is missing or does not
+        apply to the snapshot.
+        """
+        signature = snapshot_signature(self.snapshot_filename)
+        if os.path.exists(self.filename):
+            with open(self.filename, 'rb') as fp:
+                try:
+                    is_current = read_header(fp) == signature
+                except JournalError:
+                    is_current = False
+                if is_current:
+                    # end of the last complete entry
+                    end = fp.tell()
+                    for _ in read_entries(fp):
+                        self.entries += 1
+                        end = fp.tell()
+            if is_current:
+                self.fp = open(self.filename, 'r+b')
+                # drop a truncated entry
+                self.fp.truncate(end)
+                self.fp.seek(end)
+                return
+        self.reset(signature)
+
+    def reset(self, signature):
+        """
+        Start an empty journal on top of snapshot with signature.
+        """
+        if self.fp:
+            self.fp.close()
+        # replaced whole, a crash keeps the old journal, which restore skips
+        # once its signature no longer matches the snapshot
+        with layout.atomic_write(self.filename) as fp:
+            fp.write(HEADER.pack(MAGIC, VERSION, *signature))
+        self.fp = open(self.filename, 'r+b')
+        self.fp.seek(0, os.SEEK_END)
+        self.entries = 0
+
+    def flush(self):
+        self.fp.flush()
+        if self.sync:
+            os.fsync(self.fp.fileno())
+
+    def record(self, op, result):
+        """
+        Append the {'append', 'remove'} result of operation named `op`.
+        """
+        removed = result['remove']
+        appended = result['append']
+        self.fp.write(ENTRY.pack(OPS.index(op), len(removed), len(appended)))
+        self.fp.write(layout.pack(removed))
+        self.fp.write(layout.pack(appended))
+        self.flush()
+        self.entries += 1
+
+    def needs_compaction(self):
+        return self.entries >= self.compact_every
+
+    def compact(self, rects):
+        """
+        Save `rects` as the snapshot and start a new, empty, journal.
+        """
+        layout.save_incremental(self.snapshot_filename, rects)
+        self.reset(snapshot_signature(self.snapshot_filename))
+
+    def close(self):
+        self.fp.close()
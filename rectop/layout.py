@@ -0,0 +1,286 @@
+"""
+Versioned binary layout file of rects.
+
+    header   magic, version, flags, rect count, index offset
+    records  count * little-endian int32 x, y, width, height
+    index    optional grid index of record numbers, see `rectop.index`
+
+Files are opened with mmap so rects are only read when they are used, and
+saving a layout that only grew appends the new records. Files are replaced
+or appended to so that a crash part way leaves the file as it was.
+"""
+import mmap
+import os
+import struct
+import sys
+import tempfile
+
+from array import array
+from contextlib import contextmanager
+from itertools import chain
+
+from . import index
+from .external import Rect
+
+MAGIC = b'SHWR'
+VERSION = 1
+
+# flags
+HAS_INDEX = 1
+
+HEADER = struct.Struct('<4sHHQQ')
+RECORD = struct.Struct('<iiii')
+INDEX_HEADER = struct.Struct('<iI')
+INDEX_CELL = struct.Struct('<iiII')
+
+class LayoutError(Exception):
+    pass
+
+
+def pack(rects):
+    """
+    Little-endian bytes of records for rects.
+    """
+    records = array('i', chain.from_iterable(map(tuple, rects)))
+    if sys.byteorder != 'little':
+        records.byteswap()
+    return records.tobytes()
+
+def pack_index(rects, cellsize):
+    """
+    Bytes of a grid index section for rects, by record number.
+    """
+    grid = index.Grid(cellsize)
+    grid.bulk_load(enumerate(rects))
+    cells = sorted(grid.cells.items())
+    postings = array('I')
+    table = [INDEX_HEADER.pack(cellsize, len(cells))]
+    for (column, row), keys in cells:
+        table.append(INDEX_CELL.pack(column, row, len(postings), len(keys)))
+        postings.fromlist(keys.tolist())
+    if sys.byteorder != 'little':
+        postings.byteswap()
+    return b''.join(table) + postings.tobytes()
+
+@contextmanager
+def atomic_write(filename):
+    """
+    Open a temporary file, next to filename, for writing in binary. It is
+    synced and renamed over filename if the block finishes, otherwise it is
+    removed and filename is untouched.
+    """
+    directory, name = os.path.split(os.path.abspath(filename))
+    fd, temp_filename = tempfile.mkstemp(dir=directory, prefix=f'.{name}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as fp:
+            yield fp
+            fp.flush()
+            os.fsync(fp.fileno())
+        os.replace(temp_filename, filename)
+    except BaseException:
+        if os.path.exists(temp_filename):
+            os.remove(temp_filename)
+        raise
+
+def save(filename, rects, with_index=False, cellsize=index.CELLSIZE):
+    """
+    Write all rects to a new layout file.
+
+    :param with_index: include a grid index section.
+    """
+    rects = list(rects)
+    records = pack(rects)
+    flags = 0
+    index_offset = 0
+    index_section = b''
+    if with_index:
+        flags |= HAS_INDEX
+        index_offset = HEADER.size + len(records)
+        index_section = pack_index(rects, cellsize)
+    with atomic_write(filename) as fp:
+        fp.write(HEADER.pack(MAGIC, VERSION, flags, len(rects), index_offset))
+        fp.write(records)
+        fp.write(index_section)
+
+def read_header(fp):
+    """
+    Return (flags, count, index_offset) from header of open file.
+    """
+    data = fp.read(HEADER.size)
+    if len(data) < HEADER.size:
+        raise LayoutError('truncated header')
+    magic, version, flags, count, index_offset = HEADER.unpack(data)
+    if magic != MAGIC:
+        raise LayoutError('not a layout file')
+    if version != VERSION:
+        raise LayoutError(f'unsupported version {version}')
+    return (flags, count, index_offset)
+
+def append(filename, rects):
+    """
+    Append rects to an existing layout file. Drops the index section, if
+    any, as it no longer covers all the records.
+
+    The records are synced before the header counts them, a crash before
+    that leaves records past the count that are ignored.
+    """
+    with open(filename, 'rb') as fp:
+        flags, count, index_offset = read_header(fp)
+    if flags & HAS_INDEX:
+        # appending would overwrite the index the header points to
+        save(filename, load(filename) + list(rects))
+        return
+    records = pack(rects)
+    with open(filename, 'r+b') as fp:
+        end = HEADER.size + count * RECORD.size
+        fp.seek(end)
+        fp.write(records)
+        fp.truncate()
+        fp.flush()
+        os.fsync(fp.fileno())
+        count += len(records) // RECORD.size
+        fp.seek(0)
+        fp.write(HEADER.pack(MAGIC, VERSION, flags, count, 0))
+        fp.flush()
+        os.fsync(fp.fileno())
+
+def save_incremental(filename, rects):
+    """
+    Save rects, only appending when the file already has the rects before
+    the new ones. Return the number of records written.
+    """
+    rects = list(rects)
+    if os.path.exists(filename):
+        records = pack(rects)
+        try:
+            with Layout(filename) as layout:
+                count = layout.count
+                with layout.data[:count * RECORD.size] as stored:
+                    is_prefix = records.startswith(stored)
+        except LayoutError:
+            is_prefix = False
+        if is_prefix:
+            if count < len(rects):
+                append(filename, rects[count:])
+            return len(rects) - count
+    save(filename, rects)
+    return len(rects)
+
+def load(filename):
+    """
+    Return list of all rects in a layout file, see `rectop.external.Rect`.
+    """
+    with Layout(filename) as layout:
+        return list(layout)
+
+
+class Layout:
+    """
+    Read-only, memory-mapped, layout file. Rects are made when accessed.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.fp = open(filename, 'rb')
+        try:
+            self.flags, self.count, self.index_offset = read_header(self.fp)
+            size = os.fstat(self.fp.fileno()).st_size
+            if size < HEADER.size + self.count * RECORD.size:
+                raise LayoutError('truncated records')
+            self.mmap = mmap.mmap(self.fp.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self.fp.close()
+            raise
+        self.data = memoryview(self.mmap)[HEADER.size:]
+        self._cells = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.data.release()
+        self.mmap.close()
+        self.fp.close()
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError(i)
+        return Rect(RECORD.unpack_from(self.data, i * RECORD.size))
+
+    def __iter__(self):
+        with self.data[:self.count * RECORD.size] as records:
+            for values in RECORD.iter_unpack(records):
+                yield Rect(values)
+
+    def records(self):
+        """
+        Flat array of x, y, width, height ints, for bulk use like
+        `rectop.batch.RectArray`. Release it before closing the layout.
+        """
+        records = self.data[:self.count * RECORD.size]
+        if sys.byteorder == 'little':
+            return records.cast('i')
+        swapped = array('i', records.tobytes())
+        swapped.byteswap()
+        return swapped
+
+    @property
+    def has_index(self):
+        return bool(self.flags & HAS_INDEX)
+
+    def cells(self):
+        """
+        Dict of (column, row) -> (start, length) into the index postings,
+        read on first use.
+        """
+        if self._cells is None:
+            offset = self.index_offset - HEADER.size
+            self.cellsize, ncells = INDEX_HEADER.unpack_from(self.data, offset)
+            offset += INDEX_HEADER.size
+            self._cells = {}
+            for column, row, start, length in INDEX_CELL.iter_unpack(
+                self.data[offset:offset + ncells * INDEX_CELL.size]
+            ):
+                self._cells[(column, row)] = (start, length)
+            self.postings_offset = offset + ncells * INDEX_CELL.size
+        return self._cells
+
+    def cell_records(self, cell):
+        """
+        Record numbers in the index for a cell.
+        """
+        start, length = self.cells().get(cell, (0, 0))
+        offset = self.postings_offset + start * 4
+        return struct.unpack_from(f'<{length}I', self.data, offset)
+
+    def query_point(self, pos):
+        """
+        Record numbers of rects containing `pos`.
+        """
+        if not self.has_index:
+            return [i for i, rect in enumerate(self) if rect.collidepoint(pos)]
+        self.cells()
+        x, y = pos
+        cell = (x // self.cellsize, y // self.cellsize)
+        return [i for i in self.cell_records(cell) if self[i].collidepoint(pos)]
+
+    def query_rect(self, rect):
+        """
+        Record numbers of rects overlapping `rect`.
+        """
+        if not self.has_index:
+            return [i for i, other in enumerate(self) if other.colliderect(rect)]
+        self.cells()
+        grid = index.Grid(self.cellsize)
+        found = set()
+        for cell in grid.cells_for(rect):
+            found.update(self.cell_records(cell))
+        return [i for i in sorted(found) if self[i].colliderect(rect)]
@@ -0,0 +1,273 @@
+"""
+Minimum partition of the union of rects into rects.
+
+The union is rasterized onto the grid of the distinct x and y sides of the
+rects. The minimum number of rects is reached by first cutting along a
+largest set of non-crossing chords, segments joining two reflex corners on
+the same line, found by bipartite matching, and then cutting once from each
+reflex corner left over.
+
+The grid is sized by the distinct sides, so this is for layouts where rects
+line up, like tile maps, and not for real-time use.
+"""
+from collections import deque
+from itertools import accumulate
+
+from .external import Rect
+
+def coverage(rects, xs, ys):
+    """
+    Rows of bools of the grid cells covered by rects.
+
+    :param xs: sorted distinct left and right sides.
+    :param ys: sorted distinct top and bottom sides.
+    """
+    column = {x: i for i, x in enumerate(xs)}
+    row = {y: j for j, y in enumerate(ys)}
+    # 2d difference array, summed into coverage counts
+    counts = [[0] * len(xs) for _ in ys]
+    for rect in rects:
+        i1 = column[rect.left]
+        i2 = column[rect.right]
+        j1 = row[rect.top]
+        j2 = row[rect.bottom]
+        counts[j1][i1] += 1
+        counts[j1][i2] -= 1
+        counts[j2][i1] -= 1
+        counts[j2][i2] += 1
+    filled = []
+    above = [0] * len(xs)
+    for line in counts[:-1]:
+        above = [a + b for a, b in zip(above, accumulate(line))]
+        filled.append([count > 0 for count in above[:-1]])
+    return filled
+
+
+class Grid:
+    """
+    Covered cells and cuts of the compressed grid. Points are (i, j) at
+    (xs[i], ys[j]) and cell (i, j) has point (i, j) at its topleft.
+    """
+
+    def __init__(self, rects):
+        self.xs = sorted({x for rect in rects for x in (rect.left, rect.right)})
+        self.ys = sorted({y for rect in rects for y in (rect.top, rect.bottom)})
+        self.filled = coverage(rects, self.xs, self.ys)
+        # vertical segments (i, j) from point (i, j) to (i, j+1)
+        self.vcuts = set()
+        # horizontal segments (i, j) from point (i, j) to (i+1, j)
+        self.hcuts = set()
+
+    def is_filled(self, i, j):
+        return (
+            0 <= j < len(self.filled)
+            and 0 <= i < len(self.filled[j])
+            and self.filled[j][i]
+        )
+
+    def missing(self, i, j):
+        """
+        Offset of the one cell around point that is not filled, if it is a
+        reflex corner, otherwise None.
+        """
+        around = [
+            (di, dj)
+            for dj in (-1, 0) for di in (-1, 0)
+            if not self.is_filled(i + di, j + dj)
+        ]
+        if len(around) == 1:
+            return around[0]
+
+    def is_interior(self, i, j):
+        """
+        Point has all four cells around it filled.
+        """
+        return all(
+            self.is_filled(i + di, j + dj)
+            for dj in (-1, 0) for di in (-1, 0)
+        )
+
+    def reflex(self):
+        """
+        Dict of reflex corner points to the offset of their missing cell.
+        """
+        corners = {}
+        for j in range(len(self.ys)):
+            for i in range(len(self.xs)):
+                offset = self.missing(i, j)
+                if offset:
+                    corners[(i, j)] = offset
+        return corners
+
+    def chords(self, corners):
+        """
+        Return lists of horizontal (j, i1, i2) and vertical (i, j1, j2)
+        chords between reflex corners.
+        """
+        horizontal = []
+        for j in range(len(self.ys)):
+            start = None
+            for i in range(len(self.xs)):
+                offset = corners.get((i, j))
+                if offset and offset[0] == 0 and start is not None:
+                    horizontal.append((j, start, i))
+                    start = None
+                if offset and offset[0] == -1:
+                    start = i
+                elif not (self.is_filled(i, j - 1) and self.is_filled(i, j)):
+                    # segment to the right is not inside
+                    start = None
+        vertical = []
+        for i in range(len(self.xs)):
+            start = None
+            for j in range(len(self.ys)):
+                offset = corners.get((i, j))
+                if offset and offset[1] == 0 and start is not None:
+                    vertical.append((i, start, j))
+                    start = None
+                if offset and offset[1] == -1:
+                    start = j
+                elif not (self.is_filled(i - 1, j) and self.is_filled(i, j)):
+                    # segment below is not inside
+                    start = None
+        return (horizontal, vertical)
+
+    def cut_horizontal(self, j, i1, i2):
+        self.hcuts.update((i, j) for i in range(i1, i2))
+
+    def cut_vertical(self, i, j1, j2):
+        self.vcuts.update((i, j) for j in range(j1, j2))
+
+    def is_cut_at(self, i, j):
+        """
+        Any cut segment ends at point.
+        """
+        return (
+            (i, j) in self.vcuts or (i, j - 1) in self.vcuts
+            or (i, j) in self.hcuts or (i - 1, j) in self.hcuts
+        )
+
+    def extend(self, point, offset):
+        """
+        Cut from reflex corner, away from its missing cell, until the
+        boundary or another cut.
+        """
+        i, j = point
+        # go down if the missing cell is above, otherwise up
+        step = 1 if offset[1] == -1 else -1
+        while True:
+            self.vcuts.add((i, j if step > 0 else j - 1))
+            j += step
+            if not self.is_interior(i, j):
+                break
+            if (
+                (i, j) in self.hcuts
+                or (i - 1, j) in self.hcuts
+                or (i, j if step > 0 else j - 1) in self.vcuts
+            ):
+                break
+
+    def rects(self, rect_type=Rect):
+        """
+        Generate the rects of the filled cells separated by cuts.
+        """
+        xs = self.xs
+        ys = self.ys
+        done = set()
+        for j, line in enumerate(self.filled):
+            for i, is_filled in enumerate(line):
+                if not is_filled or (i, j) in done:
+                    continue
+                i2 = i + 1
+                while self.is_filled(i2, j) and (i2, j) not in self.vcuts:
+                    i2 += 1
+                j2 = j + 1
+                while self.is_filled(i, j2) and (i, j2) not in self.hcuts:
+                    j2 += 1
+                done.update((ci, cj) for cj in range(j, j2) for ci in range(i, i2))
+                yield rect_type(xs[i], ys[j], xs[i2] - xs[i], ys[j2] - ys[j])
+
+
+def crosses(horizontal, vertical):
+    j, i1, i2 = horizontal
+    i, j1, j2 = vertical
+    return i1 <= i <= i2 and j1 <= j <= j2
+
+def independent_chords(horizontal, vertical):
+    """
+    Largest set of chords that do not cross or touch. By Konig's theorem it
+    is the complement of a minimum vertex cover found from a maximum
+    matching of the bipartite crossing graph.
+    """
+    graph = [
+        [v for v, vchord in enumerate(vertical) if crosses(hchord, vchord)]
+        for hchord in horizontal
+    ]
+    match_h = [None] * len(horizontal)
+    match_v = [None] * len(vertical)
+
+    for h in range(len(horizontal)):
+        # augmenting path search from h
+        parents = {}
+        seen = set()
+        stack = [h]
+        found = None
+        while stack and found is None:
+            u = stack.pop()
+            for v in graph[u]:
+                if v in seen:
+                    continue
+                seen.add(v)
+                parents[v] = u
+                if match_v[v] is None:
+                    found = v
+                    break
+                stack.append(match_v[v])
+        while found is not None:
+            u = parents[found]
+            previous = match_h[u]
+            match_h[u] = found
+            match_v[found] = u
+            found = previous
+
+    # alternating search from unmatched horizontal chords
+    visited_h = set(h for h in range(len(horizontal)) if match_h[h] is None)
+    visited_v = set()
+    queue = deque(visited_h)
+    while queue:
+        u = queue.popleft()
+        for v in graph[u]:
+            if v not in visited_v and match_h[u] != v:
+                visited_v.add(v)
+                w = match_v[v]
+                if w is not None and w not in visited_h:
+                    visited_h.add(w)
+                    queue.append(w)
+
+    return (
+        [horizontal[h] for h in sorted(visited_h)],
+        [vertical[v] for v in range(len(vertical)) if v not in visited_v],
+    )
+
+def minimum(rects):
+    """
+    List of the fewest non-overlapping rects covering the same area as
+    `rects`. Zero size rects cover nothing and are ignored.
+    """
+    rects = [rect for rect in rects if rect.width > 0 and rect.height > 0]
+    if not rects:
+        return []
+    grid = Grid(rects)
+    corners = grid.reflex()
+    horizontal, vertical = independent_chords(*grid.chords(corners))
+    resolved = set()
+    for j, i1, i2 in horizontal:
+        grid.cut_horizontal(j, i1, i2)
+        resolved.update([(i1, j), (i2, j)])
+    for i, j1, j2 in vertical:
+        grid.cut_vertical(i, j1, j2)
+        resolved.update([(i, j1), (i, j2)])
+    for point, offset in corners.items():
+        if point not in resolved:
+            grid.extend(point, offset)
+    return list(grid.rects(type(rects[0])))
@@ -0,0 +1,215 @@
+"""
+Immutable rect value type, standing in for `pygame.Rect` where pygame is not
+installed or not wanted, see `rectop.external`.
+
+A `Rect` is a tuple of (x, y, width, height) of ints with the read-only
+attributes and the methods of `pygame.Rect` that rectop uses. Methods return
+new rects instead of changing them in-place. Being a tuple, it is hashable,
+equal to tuples and pygame rects of the same values, and pickles small.
+"""
+def half(n):
+    """
+    Half of n truncated toward zero, like C, for `Rect.inflate`.
+    """
+    return n // 2 if n >= 0 else -(-n // 2)
+
+
+class Rect(tuple):
+    """
+    Rect(x, y, width, height), Rect((x, y), (width, height)) or Rect(rect).
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, *args):
+        if len(args) == 4:
+            return tuple.__new__(cls, args)
+        if len(args) == 2:
+            (x, y), (w, h) = args
+            return tuple.__new__(cls, (x, y, w, h))
+        if len(args) == 1:
+            x, y, w, h = args[0]
+            return tuple.__new__(cls, (x, y, w, h))
+        raise TypeError(f'Rect takes 1, 2 or 4 arguments, got {len(args)}')
+
+    def __repr__(self):
+        return 'Rect(%d, %d, %d, %d)' % self
+
+    def __bool__(self):
+        # like pygame, empty when either size is zero
+        return self[2] != 0 and self[3] != 0
+
+    # size and position, like `pygame.Rect`
+
+    @property
+    def x(self):
+        return self[0]
+
+    @property
+    def y(self):
+        return self[1]
+
+    @property
+    def w(self):
+        return self[2]
+
+    @property
+    def h(self):
+        return self[3]
+
+    width = w
+    height = h
+    left = x
+    top = y
+
+    @property
+    def right(self):
+        return self[0] + self[2]
+
+    @property
+    def bottom(self):
+        return self[1] + self[3]
+
+    @property
+    def centerx(self):
+        return self[0] + self[2] // 2
+
+    @property
+    def centery(self):
+        return self[1] + self[3] // 2
+
+    @property
+    def size(self):
+        return (self[2], self[3])
+
+    @property
+    def topleft(self):
+        return (self[0], self[1])
+
+    @property
+    def topright(self):
+        return (self[0] + self[2], self[1])
+
+    @property
+    def bottomleft(self):
+        return (self[0], self[1] + self[3])
+
+    @property
+    def bottomright(self):
+        return (self[0] + self[2], self[1] + self[3])
+
+    @property
+    def midtop(self):
+        return (self[0] + self[2] // 2, self[1])
+
+    @property
+    def midright(self):
+        return (self[0] + self[2], self[1] + self[3] // 2)
+
+    @property
+    def midbottom(self):
+        return (self[0] + self[2] // 2, self[1] + self[3])
+
+    @property
+    def midleft(self):
+        return (self[0], self[1] + self[3] // 2)
+
+    @property
+    def center(self):
+        return (self[0] + self[2] // 2, self[1] + self[3] // 2)
+
+    # methods of `pygame.Rect`, returning new rects
+
+    def copy(self):
+        # immutable, the same rect will do
+        return self
+
+    def move(self, dx, dy):
+        x, y, w, h = self
+        return Rect(x + dx, y + dy, w, h)
+
+    def inflate(self, dx, dy):
+        x, y, w, h = self
+        return Rect(x - half(dx), y - half(dy), w + dx, h + dy)
+
+    def collidepoint(self, *pos):
+        """
+        Point, as x, y or (x, y), is inside. The right and bottom are outside.
+        """
+        px, py = pos[0] if len(pos) == 1 else pos
+        x, y, w, h = self
+        return x <= px < x + w and y <= py < y + h
+
+    def colliderect(self, other):
+        """
+        Rects overlap, rects with no size collide with nothing.
+        """
+        x, y, w, h = self
+        ox, oy, ow, oh = other
+        return (
+            w != 0 and h != 0 and ow != 0 and oh != 0
+            and x < ox + ow and y < oy + oh and ox < x + w and oy < y + h
+        )
+
+    def contains(self, other):
+        """
+        Other rect is entirely inside.
+        """
+        x, y, w, h = self
+        ox, oy, ow, oh = other
+        return (
+            x <= ox and y <= oy
+            and x + w >= ox + ow and y + h >= oy + oh
+            and x + w > ox and y + h > oy
+        )
+
+    def clip(self, other):
+        """
+        Rect of the overlap, a rect with no size at this rect's position if
+        there is none.
+        """
+        x, y, w, h = self
+        ox, oy, ow, oh = other
+        left = _clip_start(x, w, ox, ow)
+        right = _clip_end(x, w, ox, ow)
+        top = _clip_start(y, h, oy, oh)
+        bottom = _clip_end(y, h, oy, oh)
+        if left is None or right is None or top is None or bottom is None:
+            return Rect(x, y, 0, 0)
+        return Rect(left, top, right - left, bottom - top)
+
+    def union(self, other):
+        x, y, w, h = self
+        ox, oy, ow, oh = other
+        left = min(x, ox)
+        top = min(y, oy)
+        return Rect(left, top, max(x + w, ox + ow) - left, max(y + h, oy + oh) - top)
+
+    def unionall(self, others):
+        left, top, w, h = self
+        right = left + w
+        bottom = top + h
+        for ox, oy, ow, oh in others:
+            if ox < left:
+                left = ox
+            if oy < top:
+                top = oy
+            if ox + ow > right:
+                right = ox + ow
+            if oy + oh > bottom:
+                bottom = oy + oh
+        return Rect(left, top, right - left, bottom - top)
+
+
+def _clip_start(a, alen, b, blen):
+    # start of the overlap of two spans, the way `pygame.Rect.clip` finds it
+    if b <= a < b + blen:
+        return a
+    if a <= b < a + alen:
+        return b
+
+def _clip_end(a, alen, b, blen):
+    if b < a + alen <= b + blen:
+        return a + alen
+    if a < b + blen <= a + alen:
+        return b + blen
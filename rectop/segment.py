@@ -0,0 +1,111 @@
+"""
+Segment tree of interval coverage, for sweep-line algorithms over rects.
+"""
+
+class CoverageTree:
+    """
+    How many times each interval between sorted coordinates is covered, for
+    adding and removing intervals in O(log n) and reading covered lengths.
+    Intervals must be removed exactly as they were added.
+    """
+
+    def __init__(self, coords):
+        """
+        :param coords: sorted distinct coordinates intervals start and end on.
+        """
+        self.coords = coords
+        self.index = {coord: i for i, coord in enumerate(coords)}
+        # number of elementary intervals between coords
+        self.n = max(len(coords) - 1, 1)
+        size = 4 * self.n
+        # times a node's whole range is covered
+        self.count = [0] * size
+        # length covered at least once and at least twice
+        self.once = [0] * size
+        self.twice = [0] * size
+
+    @property
+    def length(self):
+        """
+        Total length covered at least once.
+        """
+        return self.once[1]
+
+    @property
+    def length_twice(self):
+        """
+        Total length covered at least twice.
+        """
+        return self.twice[1]
+
+    def add(self, start, end, delta=1):
+        """
+        Cover interval from start to end `delta` more times.
+        """
+        i = self.index[start]
+        j = self.index[end]
+        if i < j:
+            self._add(1, 0, self.n, i, j, delta)
+
+    def remove(self, start, end):
+        self.add(start, end, -1)
+
+    def _add(self, node, lo, hi, i, j, delta):
+        if i <= lo and hi <= j:
+            self.count[node] += delta
+        else:
+            mid = (lo + hi) // 2
+            if i < mid:
+                self._add(2 * node, lo, mid, i, j, delta)
+            if mid < j:
+                self._add(2 * node + 1, mid, hi, i, j, delta)
+        self._update(node, lo, hi)
+
+    def _update(self, node, lo, hi):
+        count = self.count[node]
+        length = self.coords[hi] - self.coords[lo]
+        if hi - lo == 1:
+            self.once[node] = length if count > 0 else 0
+            self.twice[node] = length if count > 1 else 0
+            return
+        left = 2 * node
+        right = left + 1
+        if count > 1:
+            self.once[node] = length
+            self.twice[node] = length
+        elif count == 1:
+            # covered once here, twice where the children are covered
+            self.once[node] = length
+            self.twice[node] = self.once[left] + self.once[right]
+        else:
+            self.once[node] = self.once[left] + self.once[right]
+            self.twice[node] = self.twice[left] + self.twice[right]
+
+    def covered(self, start, end):
+        """
+        List of (start, end) covered intervals between start and end, merged
+        where they meet.
+        """
+        intervals = []
+        i = self.index[start]
+        j = self.index[end]
+        if i < j:
+            self._covered(1, 0, self.n, i, j, intervals)
+        return intervals
+
+    def _covered(self, node, lo, hi, i, j, intervals):
+        if not self.once[node]:
+            return
+        if self.count[node] > 0:
+            start = self.coords[max(lo, i)]
+            end = self.coords[min(hi, j)]
+            if intervals and intervals[-1][1] == start:
+                intervals[-1] = (intervals[-1][0], end)
+            else:
+                intervals.append((start, end))
+            return
+        mid = (lo + hi) // 2
+        if i < mid:
+            self._covered(2 * node, lo, mid, i, j, intervals)
+        if mid < j:
+            self._covered(2 * node + 1, mid, hi, i, j, intervals)
@@ -0,0 +1,96 @@
+"""
+Area and fragmentation statistics of rect lists, for deciding when a defrag
+is worth running.
+"""
+from collections import defaultdict
+
+from . import get
+from . import partition
+from .segment import CoverageTree
+
+def covered_areas(rects):
+    """
+    Return (area covered by at least one rect, area covered by at least two
+    rects), sweeping over x with a `rectop.segment.CoverageTree` over y.
+    """
+    events = defaultdict(list)
+    ys = set()
+    for rect in rects:
+        if rect.width > 0 and rect.height > 0:
+            events[rect.left].append((rect.top, rect.bottom, 1))
+            events[rect.right].append((rect.top, rect.bottom, -1))
+            ys.update((rect.top, rect.bottom))
+    tree = CoverageTree(sorted(ys))
+    once = twice = 0
+    previous = None
+    for x in sorted(events):
+        if previous is not None:
+            once += tree.length * (x - previous)
+            twice += tree.length_twice * (x - previous)
+        for top, bottom, delta in events[x]:
+            tree.add(top, bottom, delta)
+        previous = x
+    return (once, twice)
+
+def union_area(rects):
+    """
+    Area covered by rects, overlaps counted once.
+    """
+    return covered_areas(rects)[0]
+
+def overlap_area(rects):
+    """
+    Area covered by more than one rect.
+    """
+    return covered_areas(rects)[1]
+
+def total_area(rects):
+    """
+    Sum of rect areas, overlaps counted each time.
+    """
+    return sum(rect.width * rect.height for rect in rects)
+
+def partition_minimum(rects):
+    """
+    Fewest non-overlapping rects covering the same area, counted from the
+    chords of `rectop.partition.minimum`, which holes touching at corners do
+    not throw off. Its grid is sized by the distinct sides of the rects.
+    """
+    return len(partition.minimum(rects))
+
+def summary(rects, exact=False):
+    """
+    Dict of statistics of rects, in O(n log n):
+
+        count               number of rects
+        area                sum of areas
+        union_area          area covered
+        overlap_area        area covered more than once
+        bounds_area         area of the rect wrapping them all
+        coverage            union_area / bounds_area
+
+    With `exact`, also these, whose cost grows with the distinct x times y
+    sides of the rects, for layouts like tile maps where they line up:
+
+        partition_minimum   see `partition_minimum`
+        fragmentation       count / partition_minimum, 1 is unfragmented
+    """
+    rects = list(rects)
+    union, overlap = covered_areas(rects)
+    bounds_area = 0
+    if rects:
+        bounds = get.wrap(rects)
+        bounds_area = bounds.width * bounds.height
+    result = {
+        'count': len(rects),
+        'area': total_area(rects),
+        'union_area': union,
+        'overlap_area': overlap,
+        'bounds_area': bounds_area,
+        'coverage': union / bounds_area if bounds_area else 0,
+    }
+    if exact:
+        minimum = partition_minimum(rects)
+        result['partition_minimum'] = minimum
+        result['fragmentation'] = len(rects) / minimum if minimum else 0
+    return result
@@ -0,0 +1,288 @@
+"""
+Columnar storage of rects with integer ids.
+
+The x, y, width and height of each rect are kept in `array('i')` columns,
+four C ints a rect instead of a `pygame.Rect` object and its list slot. Ids
+are indexes into the columns. Deleting a rect marks its id dead, ids are not
+reused until `RectStore.compact` moves the rects down over the dead ones and
+returns the old id -> new id map, so an id held elsewhere never silently
+points at another rect.
+
+Hit tests can use a `rectop.index.Grid` of ids, bounds are read from the
+columns.
+
+Rects read from a store are new `rectop.external.Rect`, changing one does not
+change the store, use `RectStore.update`. The store has the list methods used
+by `rectop.diff.apply`, so diffs of rects apply to it by value.
+"""
+from array import array
+from collections import Counter
+from itertools import compress
+from itertools import count
+
+from . import index
+from .external import Rect
+
+class RectStore:
+    """
+    Rects in columns, keyed by id, iterated in id order.
+    """
+
+    def __init__(self, rects=(), cellsize=None):
+        """
+        :param rects: iterable of rects to add.
+        :param cellsize: keep a `rectop.index.Grid` of this cell size for hit
+                         tests and removing by value, otherwise they scan the
+                         columns.
+        """
+        self.x = array('i')
+        self.y = array('i')
+        self.w = array('i')
+        self.h = array('i')
+        self.alive = bytearray()
+        self.count = 0
+        self.grid = index.Grid(cellsize) if cellsize else None
+        self.extend(rects)
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        for _, rect in self.items():
+            yield rect
+
+    def __contains__(self, rect):
+        return self.find(rect) is not None
+
+    def __getitem__(self, rect_id):
+        if not self.is_alive(rect_id):
+            raise KeyError(rect_id)
+        return Rect(self.x[rect_id], self.y[rect_id], self.w[rect_id], self.h[rect_id])
+
+    def is_alive(self, rect_id):
+        return 0 <= rect_id < len(self.alive) and self.alive[rect_id]
+
+    @property
+    def dead(self):
+        """
+        Number of deleted ids not yet compacted away.
+        """
+        return len(self.alive) - self.count
+
+    def ids(self):
+        """
+        Generate the ids of stored rects.
+        """
+        return compress(range(len(self.alive)), self.alive)
+
+    def items(self):
+        """
+        Generate (id, rect) of stored rects.
+        """
+        rows = zip(count(), self.x, self.y, self.w, self.h)
+        for rect_id, x, y, w, h in compress(rows, self.alive):
+            yield (rect_id, Rect(x, y, w, h))
+
+    def add(self, rect):
+        """
+        Store a copy of rect and return its id.
+        """
+        x, y, w, h = rect
+        rect_id = len(self.alive)
+        self.x.append(x)
+        self.y.append(y)
+        self.w.append(w)
+        self.h.append(h)
+        self.alive.append(1)
+        self.count += 1
+        if self.grid:
+            self.grid.insert(rect_id, (x, y, w, h))
+        return rect_id
+
+    def delete(self, rect_id):
+        """
+        Remove the rect with id. The id is not reused before `compact`.
+        """
+        rect = self[rect_id]
+        if self.grid:
+            self.grid.remove(rect_id, rect)
+        self.alive[rect_id] = 0
+        self.count -= 1
+
+    def pop(self, rect_id):
+        """
+        Remove the rect with id and return it.
+        """
+        rect = self[rect_id]
+        self.delete(rect_id)
+        return rect
+
+    def update(self, rect_id, rect):
+        """
+        Change the rect with id to rect.
+        """
+        old = self[rect_id]
+        x, y, w, h = rect
+        self.x[rect_id] = x
+        self.y[rect_id] = y
+        self.w[rect_id] = w
+        self.h[rect_id] = h
+        if self.grid:
+            self.grid.remove(rect_id, old)
+            self.grid.insert(rect_id, (x, y, w, h))
+
+    def compact(self):
+        """
+        Move the rects down over the ids of deleted rects, keeping their
+        order, and shrink the columns. Return dict of old id -> new id of the
+        stored rects, ids missing from it were deleted.
+        """
+        kept = list(self.ids())
+        moved = {old: new for new, old in enumerate(kept)}
+        if self.dead:
+            for column in (self.x, self.y, self.w, self.h):
+                column[:] = array('i', compress(column, self.alive))
+            self.alive = bytearray(b'\x01') * self.count
+            if self.grid:
+                self.grid.clear()
+                self.grid.bulk_load(self.items())
+        return moved
+
+    def _candidates(self, x, y):
+        """
+        Ids of rects that may contain point, in id order.
+        """
+        if self.grid:
+            return self.grid.point_candidates((x, y))
+        return self.ids()
+
+    def equal(self, rect):
+        """
+        Ids of stored rects equal to rect, in id order.
+        """
+        value = tuple(rect)
+        xs, ys, ws, hs = self.x, self.y, self.w, self.h
+        return [
+            rect_id for rect_id in self._candidates(*value[:2])
+            if (xs[rect_id], ys[rect_id], ws[rect_id], hs[rect_id]) == value
+        ]
+
+    def find(self, rect):
+        """
+        Lowest id of a stored rect equal to rect, or None.
+        """
+        ids = self.equal(rect)
+        if ids:
+            return ids[0]
+
+    def query_point(self, pos):
+        """
+        Ids of rects containing `pos`, like `pygame.Rect.collidepoint`.
+        """
+        px, py = pos
+        xs, ys, ws, hs = self.x, self.y, self.w, self.h
+        return [
+            rect_id for rect_id in self._candidates(px, py)
+            if xs[rect_id] <= px < xs[rect_id] + ws[rect_id]
+            and ys[rect_id] <= py < ys[rect_id] + hs[rect_id]
+        ]
+
+    def query_rect(self, rect):
+        """
+        Ids of rects overlapping `rect`, like `pygame.Rect.colliderect`.
+        """
+        qx, qy, qw, qh = rect
+        if qw <= 0 or qh <= 0:
+            return []
+        if self.grid:
+            candidates = self.grid.rect_candidates(rect)
+        else:
+            candidates = self.ids()
+        xs, ys, ws, hs = self.x, self.y, self.w, self.h
+        return [
+            rect_id for rect_id in candidates
+            if ws[rect_id] > 0 and hs[rect_id] > 0
+            and xs[rect_id] < qx + qw and qx < xs[rect_id] + ws[rect_id]
+            and ys[rect_id] < qy + qh and qy < ys[rect_id] + hs[rect_id]
+        ]
+
+    def collidepoint(self, pos):
+        """
+        Rects containing point `pos`.
+        """
+        return [self[rect_id] for rect_id in self.query_point(pos)]
+
+    def colliderect(self, rect):
+        """
+        Rects overlapping `rect`.
+        """
+        return [self[rect_id] for rect_id in self.query_rect(rect)]
+
+    @property
+    def nbytes(self):
+        """
+        Bytes used by the columns and the grid.
+        """
+        columns = (self.x, self.y, self.w, self.h)
+        size = sum(column.itemsize * len(column) for column in columns) + len(self.alive)
+        if self.grid:
+            size += self.grid.nbytes
+        return size
+
+    # list interface, by value
+
+    def append(self, rect):
+        self.add(rect)
+
+    def extend(self, rects):
+        for rect in rects:
+            self.add(rect)
+
+    def __iadd__(self, rects):
+        self.extend(rects)
+        return self
+
+    def remove(self, rect):
+        """
+        Remove the first rect equal to rect, raise ValueError if there is
+        none.
+        """
+        rect_id = self.find(rect)
+        if rect_id is None:
+            raise ValueError(f'{rect!r} not in store')
+        self.delete(rect_id)
+
+    def find_many(self, rects):
+        """
+        Ids of the first rects equal to each of rects, looking in their grid
+        cells or in one pass over the columns, whichever looks at fewer rects.
+        Raise ValueError if one is missing.
+        """
+        finding = Counter(map(tuple, rects))
+        found = []
+        if self.grid:
+            scan = sum(len(self._candidates(x, y)) for x, y, _, _ in finding)
+        if self.grid and scan < self.count:
+            for value, n in finding.items():
+                ids = self.equal(value)[:n]
+                finding[value] -= len(ids)
+                found.extend(ids)
+        elif finding:
+            rows = zip(count(), self.x, self.y, self.w, self.h)
+            for rect_id, *value in compress(rows, self.alive):
+                value = tuple(value)
+                if finding[value]:
+                    finding[value] -= 1
+                    found.append(rect_id)
+        missing = +finding
+        if missing:
+            raise ValueError(f'rects not in store {list(missing)}')
+        return found
+
+    def clear(self):
+        for column in (self.x, self.y, self.w, self.h):
+            del column[:]
+        self.alive.clear()
+        self.count = 0
+        if self.grid:
+            self.grid.clear()
@@ -0,0 +1,98 @@
+"""
+Sort-and-sweep to find colliding rects without testing every pair.
+
+Rects are sorted by their left side and swept left-to-right keeping an active
+list of rects whose right side is past the sweep line. Only active rects are
+tested for overlap on y.
+"""
+from . import get
+
+def bounds(rects):
+    """
+    List of (top, right, bottom, left) for rects, None for zero size rects,
+    which never collide.
+    """
+    result = []
+    for rect in rects:
+        top, right, bottom, left = get.sides(rect)
+        if left < right and top < bottom:
+            result.append((top, right, bottom, left))
+        else:
+            result.append(None)
+    return result
+
+def bipartite(rects1, rects2):
+    """
+    Generate (i, j) index pairs where `rects1[i]` collides with `rects2[j]`,
+    like `pygame.Rect.colliderect`.
+    """
+    sides = (bounds(rects1), bounds(rects2))
+    events = sorted(
+        (rect_sides[3], which, i)
+        for which, side_list in enumerate(sides)
+        for i, rect_sides in enumerate(side_list)
+        if rect_sides is not None
+    )
+    active = ([], [])
+    for left, which, i in events:
+        top, right, bottom, _ = sides[which][i]
+        other = 1 - which
+        other_sides = sides[other]
+        # drop rects the sweep line has passed while testing the rest
+        still_active = []
+        for j in active[other]:
+            jtop, jright, jbottom, _ = other_sides[j]
+            if jright <= left:
+                continue
+            still_active.append(j)
+            if top < jbottom and jtop < bottom:
+                if which == 0:
+                    yield (i, j)
+                else:
+                    yield (j, i)
+        active[other][:] = still_active
+        active[which].append(i)
+
+def pairs(rects):
+    """
+    Generate (i, j) index pairs, i < j, of colliding rects, like
+    `pygame.Rect.colliderect`.
+    """
+    sides = bounds(rects)
+    events = sorted(
+        (rect_sides[3], i) for i, rect_sides in enumerate(sides) if rect_sides is not None
+    )
+    active = []
+    for left, i in events:
+        top, right, bottom, _ = sides[i]
+        still_active = []
+        for j in active:
+            jtop, jright, jbottom, _ = sides[j]
+            if jright <= left:
+                continue
+            still_active.append(j)
+            if top < jbottom and jtop < bottom:
+                yield (min(i, j), max(i, j))
+        active[:] = still_active
+        active.append(i)
+
+def touching(rects):
+    """
+    Generate (i, j) index pairs, i < j, of rects that overlap or touch,
+    including zero size rects and rects that only share a corner.
+    """
+    sides = [tuple(get.sides(rect)) for rect in rects]
+    events = sorted((rect_sides[3], i) for i, rect_sides in enumerate(sides))
+    active = []
+    for left, i in events:
+        top, right, bottom, _ = sides[i]
+        still_active = []
+        for j in active:
+            jtop, jright, jbottom, _ = sides[j]
+            if jright < left:
+                continue
+            still_active.append(j)
+            if top <= jbottom and jtop <= bottom:
+                yield (min(i, j), max(i, j))
+        active[:] = still_active
+        active.append(i)
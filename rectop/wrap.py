@@ -0,0 +1,217 @@
+"""
+Shrink wrap rects with polygons, the outline of their union.
+
+The boundary is found with two sweeps, over x for the vertical edges and over
+y for the horizontal edges. At each coordinate a `rectop.segment.CoverageTree`
+gives what is covered before and after the rects starting and ending there,
+and the boundary is where that changes. Edges are directed with the inside on
+their right, on screen with y down, so outer polygons go clockwise and holes
+counter-clockwise, then linked into polygons.
+"""
+from collections import defaultdict
+
+from .segment import CoverageTree
+
+def subtract(intervals, others):
+    """
+    List of the parts of sorted, disjoint, intervals not in others.
+    """
+    result = []
+    others = iter(others)
+    other = next(others, None)
+    for start, end in intervals:
+        while start < end:
+            while other and other[1] <= start:
+                other = next(others, None)
+            if not other or end <= other[0]:
+                result.append((start, end))
+                break
+            if start < other[0]:
+                result.append((start, other[0]))
+            start = other[1]
+    return result
+
+def merge(intervals):
+    """
+    Sorted list of the union of intervals, merged where they meet.
+    """
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+def boundaries(spans):
+    """
+    Generate (coord, start, end, is_opening) of the boundaries between
+    covered and uncovered across the sweep. Opening boundaries are where
+    coverage begins as coord increases.
+
+    :param spans: (start coord, end coord, low, high) of each rect along and
+                  across the sweep.
+    """
+    events = defaultdict(list)
+    across = set()
+    for start, end, low, high in spans:
+        events[start].append((low, high, 1))
+        events[end].append((low, high, -1))
+        across.update((low, high))
+    tree = CoverageTree(sorted(across))
+
+    for coord in sorted(events):
+        changes = events[coord]
+        changed = merge((low, high) for low, high, _ in changes)
+        before = [
+            interval
+            for low, high in changed
+            for interval in tree.covered(low, high)
+        ]
+        for low, high, delta in changes:
+            tree.add(low, high, delta)
+        after = [
+            interval
+            for low, high in changed
+            for interval in tree.covered(low, high)
+        ]
+        for start, end in subtract(after, before):
+            yield (coord, start, end, True)
+        for start, end in subtract(before, after):
+            yield (coord, start, end, False)
+
+def edges(rects):
+    """
+    Return lists of the directed vertical and horizontal edges, as
+    ((x1, y1), (x2, y2)), of the outline of the union of rects.
+    """
+    rects = [rect for rect in rects if rect.width > 0 and rect.height > 0]
+    vertical = []
+    spans = [(rect.left, rect.right, rect.top, rect.bottom) for rect in rects]
+    for x, top, bottom, is_opening in boundaries(spans):
+        if is_opening:
+            # left side, going up
+            vertical.append(((x, bottom), (x, top)))
+        else:
+            vertical.append(((x, top), (x, bottom)))
+    horizontal = []
+    spans = [(rect.top, rect.bottom, rect.left, rect.right) for rect in rects]
+    for y, left, right, is_opening in boundaries(spans):
+        if is_opening:
+            # top side, going right
+            horizontal.append(((left, y), (right, y)))
+        else:
+            horizontal.append(((right, y), (left, y)))
+    return (vertical, horizontal)
+
+def direction(edge):
+    (x1, y1), (x2, y2) = edge
+    return ((x2 > x1) - (x2 < x1), (y2 > y1) - (y2 < y1))
+
+def loops(rects):
+    """
+    Generate lists of (x, y) corners of the closed polygons outlining the
+    union of rects. Where two polygons touch at a corner they are kept
+    apart by always turning right.
+    """
+    vertical, horizontal = edges(rects)
+    # start point -> edges starting there
+    vertical_from = defaultdict(list)
+    for edge in vertical:
+        vertical_from[edge[0]].append(edge)
+    horizontal_from = defaultdict(list)
+    for edge in horizontal:
+        horizontal_from[edge[0]].append(edge)
+
+    used = set()
+    for first in vertical:
+        if first in used:
+            continue
+        points = []
+        edge = first
+        is_vertical = True
+        while edge not in used:
+            used.add(edge)
+            points.append(edge[0])
+            # edges alternate between vertical and horizontal
+            next_from = horizontal_from if is_vertical else vertical_from
+            candidates = [
+                candidate
+                for candidate in next_from[edge[1]]
+                if candidate not in used or candidate == first
+            ]
+            if len(candidates) > 1:
+                dx, dy = direction(edge)
+                right = (-dy, dx)
+                candidates = [c for c in candidates if direction(c) == right]
+            edge = candidates[0]
+            is_vertical = not is_vertical
+        yield points
+
+def area(points):
+    """
+    Signed area of polygon, positive for clockwise on screen.
+    """
+    total = 0
+    for (x1, y1), (x2, y2) in zip(points, points[1:] + points[:1]):
+        total += x1 * y2 - x2 * y1
+    return total / 2
+
+def contains(points, point):
+    """
+    Point, not on its edges, is inside polygon.
+    """
+    x, y = point
+    inside = False
+    for (x1, y1), (x2, y2) in zip(points, points[1:] + points[:1]):
+        if x1 == x2 and x1 > x and min(y1, y2) < y < max(y1, y2):
+            inside = not inside
+    return inside
+
+def inside_point(points):
+    """
+    Point inside the covered area next to the first edge of a polygon.
+    """
+    edge = (points[0], points[1])
+    (x, y) = points[0]
+    dx, dy = direction(edge)
+    # half a unit along the edge and half a unit to its right, inside
+    return (x + (dx - dy) / 2, y + (dy + dx) / 2)
+
+def outline(rects):
+    """
+    List of (outer, holes) polygons outlining the union of rects. Polygons
+    are lists of (x, y) corners, outers are clockwise on screen and holes
+    counter-clockwise.
+    """
+    outers = []
+    holes = []
+    for points in loops(rects):
+        # start at the topleft-most corner
+        first = min(range(len(points)), key=lambda i: (points[i][1], points[i][0]))
+        points = points[first:] + points[:first]
+        if area(points) > 0:
+            outers.append(points)
+        else:
+            holes.append(points)
+
+    bounds = []
+    for points in outers:
+        xs, ys = zip(*points)
+        bounds.append((min(xs), min(ys), max(xs), max(ys), area(points)))
+
+    polygons = [(points, []) for points in outers]
+    for hole in holes:
+        x, y = inside_point(hole)
+        # the smallest outer around the hole's surroundings
+        parent = min(
+            (
+                (outer_area, i)
+                for i, (left, top, right, bottom, outer_area) in enumerate(bounds)
+                if left < x < right and top < y < bottom and contains(outers[i], (x, y))
+            ),
+            default = None,
+        )
+        polygons[parent[1]][1].append(hole)
+    return polygons
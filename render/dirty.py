@@ -0,0 +1,108 @@
+"""
+Retained mode rendering that only redraws what changed.
+
+A frame is a scene, a callable returning the `Drawable` in an area, and a
+short overlay list of `Drawable` drawn over it. Code that changes the scene
+marks the areas it changed, the overlay is compared with the last frame.
+Only dirty areas are cleared, redrawn from the scene and overlay, and pushed
+to the display, so frames where nothing changed cost nothing however big the
+scene.
+"""
+from collections import namedtuple
+
+import rectop
+
+from lib.external import pygame
+
+# collapse to one update when there are this many dirty areas
+MAXDIRTY = 64
+
+# `draw(surface, rect, *args)` must only draw inside `rect` and equal
+# drawables must look the same.
+Drawable = namedtuple('Drawable', 'draw rect args')
+
+class DirtyRenderer:
+    """
+    Redraw and update only the areas of a surface that were marked dirty or
+    whose overlay changed since the last frame.
+    """
+
+    def __init__(self, surface, background):
+        self.surface = surface
+        self.background = background
+        # areas of the scene marked since the last frame
+        self.dirty = []
+        # overlay drawables of last frame, dict as ordered set
+        self.drawn = {}
+        self.everything = True
+
+    def invalidate(self):
+        """
+        Redraw everything next frame.
+        """
+        self.everything = True
+
+    def mark(self, *rects):
+        """
+        Redraw the areas of rects next frame, where the scene changed.
+        """
+        self.dirty.extend(pygame.Rect(rect) for rect in rects)
+
+    def dirty_areas(self, drawn):
+        """
+        List of the areas marked and where the overlay changed from the last
+        frame to `drawn`, clipped to the surface.
+        """
+        bounds = self.surface.get_rect()
+        if self.everything:
+            return [bounds]
+        areas = list(self.dirty)
+        areas.extend(
+            pygame.Rect(drawable.rect) for drawable in drawn
+            if drawable not in self.drawn
+        )
+        areas.extend(
+            pygame.Rect(drawable.rect) for drawable in self.drawn
+            if drawable not in drawn
+        )
+        areas = [area.clip(bounds) for area in areas]
+        areas = [area for area in areas if area.width > 0 and area.height > 0]
+        if len(areas) > MAXDIRTY:
+            areas = [rectop.get.wrap(areas)]
+        return areas
+
+    def render(self, scene, overlay=()):
+        """
+        Redraw the dirty areas and update the display with them. Return the
+        list of dirty areas, empty if nothing changed.
+
+        :param scene: callable(area) returning the drawables overlapping area,
+                      back to front. Only called for dirty areas.
+        :param overlay: drawables over the scene, compared with the last frame.
+        """
+        overlay = list(overlay)
+        drawn = dict.fromkeys(overlay)
+        areas = self.dirty_areas(drawn)
+        self.drawn = drawn
+        self.dirty = []
+        self.everything = False
+        if not areas:
+            return areas
+
+        # overlay indexes to redraw in each dirty area, back to front
+        redraw = [[] for _ in areas]
+        rects = [pygame.Rect(drawable.rect) for drawable in overlay]
+        for area_index, drawable_index in rectop.sweep.bipartite(areas, rects):
+            redraw[area_index].append(drawable_index)
+
+        for area, indexes in zip(areas, redraw):
+            self.surface.set_clip(area)
+            self.surface.fill(self.background, area)
+            for draw, rect, args in scene(area):
+                draw(self.surface, rect, *args)
+            for drawable_index in sorted(indexes):
+                draw, rect, args = overlay[drawable_index]
+                draw(self.surface, rect, *args)
+        self.surface.set_clip(None)
+        pygame.display.update(areas)
+        return areas
@@ -1,6 +1,22 @@
+from lib.cache import LRUCache
 from lib.external import pygame
 
-def lines(font, antialias, color, lines, surface_flags=0):
+TEXT_CACHE_SIZE = 512
+LINES_CACHE_SIZE = 64
+
+# shared surfaces of rendered text, see `render` and `cached_lines`
+text_cache = LRUCache(maxsize=TEXT_CACHE_SIZE)
+lines_cache = LRUCache(maxsize=LINES_CACHE_SIZE)
+
+def render(font, text, antialias, color):
+    """
+    Like `font.render` but the same text shares one surface from
+    `text_cache`, don't draw on it.
+    """
+    key = (font, text, antialias, tuple(color))
+    return text_cache.get_or_create(key, lambda: font.render(text, antialias, color))
+
+def lines(font, antialias, color, lines, surface_flags=0, render_line=None):
     """
     Render lines of text.
 
@@ -9,11 +25,14 @@ def lines(font, antialias, color, lines, surface_flags=0):
     :param color: font.render color.
     :param lines: iterable of strings.
     :param surface_flags: pygame.Surface flags argument for new surface.
+    :param render_line: optional callable like `render` for each line.
     """
+    if render_line is None:
+        render_line = lambda font, line, antialias, color: font.render(line, antialias, color)
     # thinking it's a good idea not to engineer another function to assemble
     # the rects. this is another simple pattern that's easy to do and keep this
     # function self contained.
-    images = [font.render(line, antialias, color) for line in lines]
+    images = [render_line(font, line, antialias, color) for line in lines]
     rects = [image.get_rect() for image in images]
     for r1, r2 in zip(rects[:-1], rects[1:]):
         r2.top = r1.bottom
@@ -23,3 +42,18 @@ def lines(font, antialias, color, lines, surface_flags=0):
     for rect, image in zip(rects, images):
         surf.blit(image, rect)
     return surf
+
+# `lines` is shadowed by the argument of the same name in `cached_lines`
+render_lines = lines
+
+def cached_lines(font, antialias, color, lines, surface_flags=0):
+    """
+    Like `lines` but reuses line images from `render` and shares the block
+    surface from `lines_cache`, don't draw on it.
+    """
+    lines = tuple(lines)
+    key = (font, lines, antialias, tuple(color), surface_flags)
+    return lines_cache.get_or_create(
+        key,
+        lambda: render_lines(font, antialias, color, lines, surface_flags, render_line=render),
+    )
@@ -1,9 +1,20 @@
+from collections import namedtuple
+
 import rectop
 
+from lib.cache import LRUCache
 from lib.external import pygame
 
 DEBUGCOLOR = (200,30,200)
 
+TILE_CACHE_SIZE = 256
+
+# pattern grid cell split into four half-scale cells, a plain quadtree of
+# tiles. Not Carlson's multi-scale tiles, whose wings overlap the neighbouring
+# cells and whose colours invert at each level.
+# https://christophercarlson.com/portfolio/multi-scale-truchet-patterns/
+Split = namedtuple('Split', 'topleft topright bottomleft bottomright')
+
 CURVE_CONNECTIONS = {
     ('midtop', 'midright'): 'topright',
     ('midright', 'midbottom'): 'bottomright',
@@ -11,10 +22,11 @@ CURVE_CONNECTIONS = {
     ('midleft', 'midtop'): 'topleft',
 }
 
-def tile(midpoints_radius, corners_radius, connections):
+def tile(midpoints_radius, corners_radius, connections, debug=False):
     """
     Render truchet tile.
     :param connections: 2-tuples of midpoint names to connect.
+    :param debug: draw the corner circles and the tile frame in DEBUGCOLOR.
     """
     frame_bg_color = (30,) * 3
     tile_bg_color = (60,) * 3
@@ -100,8 +112,9 @@ def tile(midpoints_radius, corners_radius, connections):
         pygame.draw.rect(surf, frame_bg_color, outside_rect, 0)
 
     # draw debugging big circles on corners
-    for point in rectop.get.corners(tile_rect):
-        pygame.draw.circle(surf, DEBUGCOLOR, point, corners_radius, 1)
+    if debug:
+        for point in rectop.get.corners(tile_rect):
+            pygame.draw.circle(surf, DEBUGCOLOR, point, corners_radius, 1)
 
     # draw straight horizontal and vertical connectors
     for color, rect, width in connrects:
@@ -113,6 +126,93 @@ def tile(midpoints_radius, corners_radius, connections):
         pygame.draw.circle(surf, midpoint_color, point, midpoints_radius, 0)
 
     # draw the tile frame
-    pygame.draw.rect(surf, DEBUGCOLOR, tile_rect, 1)
+    if debug:
+        pygame.draw.rect(surf, DEBUGCOLOR, tile_rect, 1)
+
+    return surf
 
+# shared surfaces of rendered tiles, see `cached_tile`
+tile_cache = LRUCache(maxsize=TILE_CACHE_SIZE)
+
+def connection_order(connection):
+    """
+    Sort key for connections, which may have None.
+    """
+    return tuple('' if attr is None else attr for attr in connection)
+
+def cached_tile(midpoints_radius, corners_radius, connections, debug=False):
+    """
+    Like `tile` but identical tiles share one surface from `tile_cache`,
+    don't draw on it. Tiles are identical regardless of connection order.
+    """
+    key = (midpoints_radius, corners_radius, frozenset(connections), debug)
+    def render():
+        # draw order matters a little, make it the same for the same key
+        ordered = sorted(key[2], key=connection_order)
+        return tile(midpoints_radius, corners_radius, ordered, debug)
+    return tile_cache.get_or_create(key, render)
+
+def tile_side(midpoints_radius, corners_radius):
+    """
+    Side length of the inner tile, without the frame, rendered by `tile`.
+    """
+    return (corners_radius + midpoints_radius) * 2
+
+def pattern_blits(cell, midpoints_radius, corners_radius, pos, tiles):
+    """
+    Generate (surface, dest, area) for blitting pattern `cell` at `pos`,
+    recursing into `Split` cells at half scale.
+
+    :param tiles: dict of tile surfaces to fill and reuse.
+    """
+    x, y = pos
+    if isinstance(cell, Split):
+        midpoints_radius //= 2
+        corners_radius //= 2
+        side = tile_side(midpoints_radius, corners_radius)
+        offsets = [(0, 0), (side, 0), (0, side), (side, side)]
+        for subcell, (dx, dy) in zip(cell, offsets):
+            yield from pattern_blits(
+                subcell, midpoints_radius, corners_radius, (x + dx, y + dy), tiles
+            )
+        return
+
+    key = (midpoints_radius, corners_radius, frozenset(cell or ()))
+    if key not in tiles:
+        tiles[key] = cached_tile(*key)
+    side = tile_side(midpoints_radius, corners_radius)
+    # inner tile is centered in its frame, corners_radius from the edges
+    area = pygame.Rect((corners_radius, corners_radius), (side, side))
+    yield (tiles[key], pos, area)
+
+def pattern(grid, midpoints_radius, corners_radius, surface_flags=0):
+    """
+    Render a grid of truchet tiles onto one surface. Each unique tile is
+    rendered once.
+
+    :param grid: rows of cells. A cell is an iterable of connections, like
+                 `tile`, None for no connections, or a `Split` of four cells
+                 at half scale. Use radii divisible by two for each level of
+                 `Split` for seamless tiles.
+    :param surface_flags: pygame.Surface flags argument for new surface.
+    """
+    grid = [list(row) for row in grid]
+    side = tile_side(midpoints_radius, corners_radius)
+    ncols = max(map(len, grid), default=0)
+    nrows = len(grid)
+    surf = pygame.Surface((ncols * side, nrows * side), flags=surface_flags)
+    tiles = {}
+    blits = [
+        blit
+        for row_index, row in enumerate(grid)
+        for col_index, cell in enumerate(row)
+        for blit in pattern_blits(
+            cell,
+            midpoints_radius,
+            corners_radius,
+            (col_index * side, row_index * side),
+            tiles,
+        )
+    ]
+    surf.blits(blits, doreturn=False)
     return surf
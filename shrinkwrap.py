@@ -0,0 +1,275 @@
+"""
+Headless batch operations on layout files.
+
+    python shrinkwrap.py defrag layouts/*.layout --jobs 8
+"""
+import argparse
+import os
+import sys
+import time
+
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+
+# headless, this process and its workers skip importing pygame
+os.environ.setdefault('RECTOP_NO_PYGAME', '1')
+
+import rectop
+
+from rectop.external import Rect
+
+class Timer:
+    """
+    Named durations of steps, in seconds.
+    """
+
+    def __init__(self):
+        self.times = {}
+
+    @contextmanager
+    def __call__(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.times[name] = self.times.get(name, 0) + time.perf_counter() - start
+
+
+def load(filename, timer):
+    with timer('load'):
+        with rectop.layout.Layout(filename) as layout:
+            return list(layout)
+
+def save(filename, rects, timer):
+    with timer('save'):
+        rectop.layout.save(filename, rects)
+
+def do_defrag(filename, output, args, timer):
+    rects = load(filename, timer)
+    with timer('defrag'):
+        if args.workers > 1:
+            result = rectop.join.defrag_parallel(
+                rects,
+                jobs = args.workers,
+                strategy = args.strategy,
+            )
+            rectop.join.apply(result, rects)
+        else:
+            rectop.join.defrag_ip(rects, args.strategy)
+    save(output, rects, timer)
+    return f'{len(rects)} rects'
+
+def do_cut(filename, output, args, timer):
+    rects = load(filename, timer)
+    with timer('cut'):
+        rectop.cut.many(args.knives, rects)
+    save(output, rects, timer)
+    return f'{len(rects)} rects'
+
+def do_subdivide(filename, output, args, timer):
+    rects = load(filename, timer)
+    subdivided = []
+    with timer('subdivide'):
+        for rect in rects:
+            # rects too small to subdivide are kept
+            subdivided.extend(rectop.cut.position(rect.center, rect) or [rect])
+    save(output, subdivided, timer)
+    return f'{len(subdivided)} rects'
+
+def do_wrap(filename, output, args, timer):
+    rects = load(filename, timer)
+    if not rects:
+        return 'empty'
+    with timer('wrap'):
+        wrapped = rectop.get.wrap(rects)
+    save(output, [wrapped], timer)
+    return f'{tuple(wrapped)}'
+
+def do_stats(filename, output, args, timer):
+    # streamed from the file, rects are never all in memory
+    count = 0
+    area = 0
+    top = left = right = bottom = None
+    with timer('stats'):
+        with rectop.layout.Layout(filename) as layout:
+            for rect in layout:
+                count += 1
+                area += rect.width * rect.height
+                if count == 1:
+                    top, right, bottom, left = rectop.get.sides(rect)
+                else:
+                    top = min(top, rect.top)
+                    right = max(right, rect.right)
+                    bottom = max(bottom, rect.bottom)
+                    left = min(left, rect.left)
+    if not count:
+        return 'count=0'
+    bounds = (left, top, right - left, bottom - top)
+    message = f'count={count} area={area} bounds={bounds}'
+    if args.coverage or args.fragmentation:
+        # needs all the rects
+        rects = load(filename, timer)
+        with timer('coverage'):
+            summary = rectop.stats.summary(rects, exact=args.fragmentation)
+        message += (
+            f' union_area={summary["union_area"]}'
+            f' overlap_area={summary["overlap_area"]}'
+            f' coverage={summary["coverage"]:.3f}'
+        )
+        if args.fragmentation:
+            message += (
+                f' partition_minimum={summary["partition_minimum"]}'
+                f' fragmentation={summary["fragmentation"]:.3f}'
+            )
+    return message
+
+commands = {
+    'defrag': do_defrag,
+    'cut': do_cut,
+    'subdivide': do_subdivide,
+    'wrap': do_wrap,
+    'stats': do_stats,
+}
+
+def run(command, filename, output, args):
+    """
+    Run command on one file, return (filename, message, timer times, error).
+    Errors reading or writing the file are returned, not raised, so other
+    files are still processed.
+    """
+    timer = Timer()
+    message = None
+    error = None
+    with timer('total'):
+        try:
+            message = commands[command](filename, output, args, timer)
+        except (OSError, rectop.layout.LayoutError) as exc:
+            error = str(exc)
+    return (filename, message, timer.times, error)
+
+def output_for(filename, args):
+    """
+    Output filename for input filename. Rewrite in-place without --output.
+    """
+    if args.output is None:
+        return filename
+    output = Path(args.output)
+    if output.is_dir():
+        return str(output / Path(filename).name)
+    return str(output)
+
+def rect_arg(string):
+    """
+    Parse x,y,width,height into a rect.
+    """
+    try:
+        values = [int(value) for value in string.split(',')]
+        return Rect(*values)
+    except (ValueError, TypeError):
+        raise argparse.ArgumentTypeError(f'expected x,y,width,height: {string!r}')
+
+def cli(argv=None):
+    """
+    Run rectop operations on layout files.
+    """
+    parser = argparse.ArgumentParser(prog='shrinkwrap', description=cli.__doc__)
+    parser.add_argument(
+        '--jobs',
+        type = int,
+        default = 1,
+        help = 'Number of files to process at once. Default: %(default)s',
+    )
+    parser.add_argument(
+        '--profile',
+        action = 'store_true',
+        help = 'Print timings of each step to stderr.',
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    def add_command(name, help):
+        subparser = subparsers.add_parser(name, help=help)
+        subparser.add_argument('files', nargs='+', help='Layout files.')
+        if name == 'stats':
+            # only reads
+            subparser.set_defaults(output=None)
+        else:
+            subparser.add_argument(
+                '-o', '--output',
+                help = 'Output file, or directory for many files. Default: rewrite input.',
+            )
+        return subparser
+
+    defrag_parser = add_command('defrag', 'Join rects that share a side.')
+    defrag_parser.add_argument(
+        '--workers',
+        type = int,
+        default = 1,
+        help = 'Processes to defrag separate groups of touching rects of one file.'
+               ' Files that are mostly one group, like tile maps, are defragged'
+               ' in one process. Default: %(default)s',
+    )
+    defrag_parser.add_argument(
+        '--strategy',
+        choices = list(rectop.join.STRATEGIES),
+        default = 'largest',
+        help = 'greedy is fastest, optimal leaves the fewest rects. Default: %(default)s',
+    )
+    cut_parser = add_command('cut', 'Cut holes with knife rects.')
+    cut_parser.add_argument(
+        '--knife',
+        dest = 'knives',
+        type = rect_arg,
+        action = 'append',
+        required = True,
+        help = 'Knife rect as x,y,width,height. Repeat for many knives.',
+    )
+    add_command('subdivide', 'Subdivide each rect into four at its center.')
+    add_command('wrap', 'Replace rects with one rect wrapping them all.')
+    stats_parser = add_command('stats', 'Print statistics.')
+    stats_parser.add_argument(
+        '--coverage',
+        action = 'store_true',
+        help = 'Also print union and overlap area, and coverage.',
+    )
+    stats_parser.add_argument(
+        '--fragmentation',
+        action = 'store_true',
+        help = (
+            'Also print the fewest rects covering the same area, and'
+            ' fragmentation. Slow unless the rects line up, like tiles.'
+        ),
+    )
+    args = parser.parse_args(argv)
+
+    if args.output and len(args.files) > 1 and not Path(args.output).is_dir():
+        parser.error('--output must be a directory for many files')
+
+    nfiles = len(args.files)
+    run_args = (
+        [args.command] * nfiles,
+        args.files,
+        [output_for(filename, args) for filename in args.files],
+        [args] * nfiles,
+    )
+    if args.jobs > 1:
+        with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+            results = list(executor.map(run, *run_args))
+    else:
+        results = list(map(run, *run_args))
+
+    failed = 0
+    for filename, message, times, error in results:
+        if error:
+            failed += 1
+            print(f'{filename}: error: {error}', file=sys.stderr)
+            continue
+        print(f'{filename}: {message}')
+        if args.profile:
+            timings = ' '.join(f'{name}={seconds:.4f}s' for name, seconds in times.items())
+            print(f'{filename}: {timings}', file=sys.stderr)
+    if failed:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    cli()
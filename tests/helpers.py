@@ -0,0 +1,29 @@
+"""
+Test data shared by the test modules.
+"""
+import random
+
+from lib.external import pygame
+
+def random_rects(count, position, size, rand=None, rect_type=pygame.Rect):
+    """
+    List of random rects, the same every run.
+
+    :param position: (lowest, highest) x and y.
+    :param size: (lowest, highest) width and height.
+    :param rand: optional random.Random to go on drawing from, otherwise a
+                 new one seeded with zero.
+    """
+    if rand is None:
+        rand = random.Random(0)
+    lowest, highest = position
+    smallest, largest = size
+    return [
+        rect_type(
+            rand.randint(lowest, highest),
+            rand.randint(lowest, highest),
+            rand.randint(smallest, largest),
+            rand.randint(smallest, largest),
+        )
+        for _ in range(count)
+    ]
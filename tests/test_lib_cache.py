@@ -0,0 +1,46 @@
+import unittest
+
+from lib.cache import LRUCache
+
+class TestCase(unittest.TestCase):
+
+    def test_evicts_least_recently_used(self):
+        evicted = []
+        cache = LRUCache(maxsize=2, on_evict=lambda key, value: evicted.append((key, value)))
+        cache.put('a', 1)
+        cache.put('b', 2)
+        # 'a' is now more recently used than 'b'
+        self.assertEqual(cache.get('a'), 1)
+        cache.put('c', 3)
+        self.assertEqual(evicted, [('b', 2)])
+        self.assertNotIn('b', cache)
+        self.assertEqual(len(cache), 2)
+        cache.resize(1)
+        self.assertEqual(evicted, [('b', 2), ('a', 1)])
+        self.assertEqual(cache.info()['evictions'], 2)
+
+    def test_hits_and_misses(self):
+        cache = LRUCache(maxsize=None)
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.get('a', 0), 0)
+        calls = []
+        factory = lambda: calls.append(None) or len(calls)
+        self.assertEqual(cache.get_or_create('a', factory), 1)
+        self.assertEqual(cache.get_or_create('a', factory), 1)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(len(calls), 1)
+        info = cache.info()
+        self.assertEqual((info['hits'], info['misses']), (2, 3))
+        self.assertEqual((info['size'], info['maxsize']), (1, None))
+
+    def test_unbounded(self):
+        cache = LRUCache(maxsize=None)
+        for key in range(1000):
+            cache.put(key, key)
+        self.assertEqual(len(cache), 1000)
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
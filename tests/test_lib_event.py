@@ -0,0 +1,113 @@
+import unittest
+
+import lib.event
+
+from lib.external import pygame
+
+def motion(pos, rel, buttons=(0, 0, 0)):
+    return pygame.event.Event(pygame.MOUSEMOTION, pos=pos, rel=rel, buttons=buttons)
+
+class TestCase(unittest.TestCase):
+
+    def test_coalesce_motion(self):
+        events = [
+            motion((1, 1), (1, 1)),
+            motion((3, 2), (2, 1)),
+            pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=(3, 2), button=1),
+            motion((4, 2), (1, 0)),
+            motion((4, 5), (0, 3)),
+            motion((5, 5), (1, 0)),
+        ]
+        result = lib.event.coalesce(events)
+        self.assertEqual(
+            [event.type for event in result],
+            [pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.MOUSEMOTION],
+        )
+        self.assertEqual((result[0].pos, result[0].rel), ((3, 2), (3, 2)))
+        self.assertEqual((result[2].pos, result[2].rel), ((5, 5), (2, 3)))
+        self.assertIs(result[1], events[2])
+
+    def test_for_drag_post(self):
+        posted = []
+        left = (1, 0, 0)
+        events = [
+            pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=(0, 0), button=1),
+            motion((5, 5), (5, 5), left),
+            pygame.event.Event(pygame.MOUSEBUTTONUP, pos=(5, 5), button=1),
+        ]
+        for event in lib.event.coalesce(events):
+            lib.event.for_drag(event, post=posted.append)
+        self.assertEqual(
+            [event.type for event in posted],
+            [lib.event.DRAGSTART, lib.event.DRAGMOTION, lib.event.DRAGDROP],
+        )
+        self.assertEqual(posted[-1].start, (0, 0))
+
+
+class TestDispatch(unittest.TestCase):
+
+    def setUp(self):
+        lib.event.core.reset()
+
+    def tearDown(self):
+        lib.event.core.reset()
+
+    def test_priority_and_unlisten(self):
+        calls = []
+        first = lambda event: calls.append('first')
+        second = lambda event: calls.append('second')
+        anyevent = lambda event: calls.append('any')
+        lib.event.listen(pygame.KEYDOWN, second)
+        lib.event.listen(pygame.KEYDOWN, first, priority=1)
+        lib.event.listen(lib.event.ANYEVENT, anyevent)
+        lib.event.dispatch(pygame.event.Event(pygame.KEYDOWN))
+        self.assertEqual(calls, ['any', 'first', 'second'])
+
+        calls.clear()
+        lib.event.unlisten(pygame.KEYDOWN, first)
+        lib.event.dispatch(pygame.event.Event(pygame.KEYDOWN))
+        lib.event.dispatch(pygame.event.Event(pygame.KEYUP))
+        self.assertEqual(calls, ['any', 'second', 'any'])
+        self.assertNotIn(pygame.KEYUP, lib.event.core.registry)
+
+        with self.assertRaises(ValueError):
+            lib.event.unlisten(pygame.KEYDOWN, first)
+
+    def test_listen_for_returns_func(self):
+        @lib.event.listen_for(pygame.KEYDOWN)
+        def on_keydown(event):
+            pass
+
+        self.assertTrue(callable(on_keydown))
+        self.assertEqual(lib.event.core.listeners(pygame.KEYDOWN), (on_keydown,))
+
+    def test_instrument(self):
+        def on_keydown(event):
+            pass
+
+        lib.event.listen(pygame.KEYDOWN, on_keydown)
+        lib.event.instrument()
+        for _ in range(3):
+            lib.event.dispatch(pygame.event.Event(pygame.KEYDOWN))
+        [row] = lib.event.report()
+        self.assertEqual(row['calls'], 3)
+        self.assertTrue(row['listener'].endswith('on_keydown'))
+        self.assertGreaterEqual(row['total'], row['max'])
+        lib.event.instrument(False)
+        self.assertEqual(lib.event.report(), [])
+
+    def test_instrument_from_listener(self):
+        def on_keydown(event):
+            lib.event.instrument(not lib.event.is_instrumented())
+
+        lib.event.listen(pygame.KEYDOWN, on_keydown)
+        lib.event.listen(pygame.KEYDOWN, lambda event: None)
+        lib.event.dispatch(pygame.event.Event(pygame.KEYDOWN))
+        self.assertTrue(lib.event.is_instrumented())
+        # turning it off while instrumented
+        lib.event.dispatch(pygame.event.Event(pygame.KEYDOWN))
+        self.assertFalse(lib.event.is_instrumented())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+
+from unittest import mock
+
+from lib.external import pygame
+from lib.scheduler import Scheduler
+
+class TestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.event = pygame.event.Event(pygame.USEREVENT)
+        patchers = [
+            mock.patch('pygame.event.get', return_value=[]),
+            mock.patch('pygame.event.wait', return_value=self.event),
+        ]
+        self.get, self.wait = [patcher.start() for patcher in patchers]
+        for patcher in patchers:
+            self.addCleanup(patcher.stop)
+
+    def test_busy(self):
+        scheduler = Scheduler(fps=0)
+        for _ in range(3):
+            self.assertEqual(scheduler.events(), [])
+            scheduler.tick(busy=True)
+        self.wait.assert_not_called()
+        self.assertEqual(scheduler.stats()['idle_waits'], 0)
+
+    def test_idle(self):
+        scheduler = Scheduler(fps=0)
+        scheduler.events()
+        scheduler.tick(busy=False)
+        # blocks for the next event after an idle frame
+        self.assertEqual(scheduler.events(), [self.event])
+        self.wait.assert_called_once_with()
+        scheduler.tick(busy=True)
+        self.assertEqual(scheduler.events(), [])
+        self.assertEqual(scheduler.stats()['idle_waits'], 1)
+
+    def test_no_idle(self):
+        scheduler = Scheduler(fps=0, idle=False)
+        scheduler.events()
+        scheduler.tick(busy=False)
+        self.assertEqual(scheduler.events(), [])
+        self.wait.assert_not_called()
+
+    def test_stats(self):
+        scheduler = Scheduler(fps=0, history=2)
+        stats = scheduler.stats()
+        self.assertEqual(stats['frames'], 0)
+        self.assertEqual(stats['frame_time_avg'], 0)
+        for _ in range(3):
+            scheduler.events()
+            scheduler.tick(busy=True)
+        stats = scheduler.stats()
+        self.assertEqual(stats['frames'], 3)
+        self.assertEqual(len(scheduler.frame_times), 2)
+        self.assertGreaterEqual(stats['frame_time_max'], stats['frame_time_avg'])
+        self.assertGreaterEqual(stats['frame_time_avg'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
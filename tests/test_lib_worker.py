@@ -0,0 +1,97 @@
+import time
+import unittest
+
+import lib.worker
+import rectop
+
+from lib.external import pygame
+
+def count_until_cancelled(progress):
+    done = 0
+    while True:
+        done += 1
+        progress(done, 0)
+        time.sleep(0.001)
+
+def wait(worker, events, timeout=30):
+    end = time.monotonic() + timeout
+    while worker.busy and time.monotonic() < end:
+        worker.poll()
+        time.sleep(0.01)
+    return [event for event in events if event.type == lib.worker.WORKDONE]
+
+class TestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.events = []
+        self.worker = lib.worker.Worker(processes=False, post=self.events.append)
+
+    def tearDown(self):
+        self.worker.shutdown()
+
+    def test_defrag(self):
+        rects = [pygame.Rect(x, 0, 10, 10) for x in range(0, 100, 10)]
+        job = self.worker.submit('defrag', rectop.join.defrag, rects)
+        [done] = wait(self.worker, self.events)
+        self.assertEqual(done.job, job.id)
+        self.assertEqual(done.op, 'defrag')
+        self.assertFalse(done.cancelled)
+        self.assertIsNone(done.error)
+        self.assertTrue(rectop.diff.is_applicable(done.result, rects))
+        rectop.diff.apply(done.result, rects)
+        self.assertEqual(rects, [pygame.Rect(0, 0, 100, 10)])
+
+    def test_cancel(self):
+        self.worker.submit('count', count_until_cancelled)
+        time.sleep(0.1)
+        self.worker.cancel()
+        [done] = wait(self.worker, self.events)
+        self.assertTrue(done.cancelled)
+        self.assertIsNone(done.result)
+
+    def test_error(self):
+        self.worker.submit('defrag', rectop.join.defrag, [], 'nope')
+        [done] = wait(self.worker, self.events)
+        self.assertIsInstance(done.error, ValueError)
+
+
+class TestProcesses(unittest.TestCase):
+
+    def setUp(self):
+        self.events = []
+        self.worker = lib.worker.Worker(processes=True, post=self.events.append)
+
+    def tearDown(self):
+        self.worker.shutdown()
+
+    def test_result(self):
+        rects = [pygame.Rect(x, 0, 10, 10) for x in range(0, 100, 10)]
+        job = self.worker.submit('defrag', rectop.join.defrag, rects)
+        [done] = wait(self.worker, self.events)
+        self.assertEqual(done.job, job.id)
+        self.assertFalse(done.cancelled)
+        self.assertIsNone(done.error)
+        rectop.diff.apply(done.result, rects)
+        self.assertEqual(rects, [pygame.Rect(0, 0, 100, 10)])
+
+    def test_error(self):
+        self.worker.submit('defrag', rectop.join.defrag, [], 'nope')
+        [done] = wait(self.worker, self.events)
+        self.assertIsInstance(done.error, ValueError)
+        self.assertIsNone(done.result)
+
+    def test_cancel(self):
+        job = self.worker.submit('count', count_until_cancelled)
+        # wait for it to start counting in the other process
+        end = time.monotonic() + 30
+        while job.state[0] == 0 and time.monotonic() < end:
+            time.sleep(0.01)
+        self.worker.cancel()
+        [done] = wait(self.worker, self.events)
+        self.assertTrue(done.cancelled)
+        self.assertIsNone(done.result)
+        self.assertIsNone(done.error)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+
+import rectop
+
+from lib.external import pygame
+from helpers import random_rects
+from rectop.external import numpy
+
+@unittest.skipIf(numpy is None, 'requires numpy')
+class TestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.rects = random_rects(60, position=(-50, 100), size=(0, 40))
+        self.rects.append(self.rects[0].copy())
+        self.batch = rectop.batch.RectArray.from_rects(self.rects)
+
+    def test_round_trip(self):
+        self.assertEqual(self.batch.to_rects(), self.rects)
+        self.assertEqual(self.batch[3], self.rects[3])
+
+    def test_wrap(self):
+        self.assertEqual(self.batch.wrap(), rectop.get.wrap_python(self.rects))
+
+    def test_corners(self):
+        corners = self.batch.corners().tolist()
+        expect = [[list(point) for point in rectop.get.corners(rect)] for rect in self.rects]
+        self.assertEqual(corners, expect)
+
+    def test_collidepoint(self):
+        for pos in [(0, 0), (10, 20), (-30, 45), (99, 3)]:
+            mask = self.batch.collidepoint(pos).tolist()
+            self.assertEqual(mask, [rect.collidepoint(pos) for rect in self.rects])
+
+    def test_collide_matrix(self):
+        matrix = self.batch.collide_matrix().tolist()
+        expect = [[r1.colliderect(r2) for r2 in self.rects] for r1 in self.rects]
+        self.assertEqual(matrix, expect)
+
+    def test_intersection(self):
+        i, j = numpy.triu_indices(len(self.batch), k=1)
+        batch, has = self.batch[i].intersection(self.batch[j])
+        for n, (a, b) in enumerate(zip(i.tolist(), j.tolist())):
+            expect = rectop.get.intersection(self.rects[a], self.rects[b])
+            if expect is None:
+                self.assertFalse(has[n])
+            else:
+                self.assertTrue(has[n])
+                self.assertEqual(batch[n], expect)
+
+    def test_filter(self):
+        test = pygame.Rect(20, 20, 30, 30)
+        for direction in rectop.SIDES:
+            mask = self.batch.filter(direction, test).tolist()
+            expect = list(rectop.query.filter_rects(self.rects, direction, test))
+            self.assertEqual(self.batch[numpy.array(mask)].to_rects(), expect)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import random
+import unittest
+
+import rectop
+
+from helpers import random_rects
+
+class TestCase(unittest.TestCase):
+
+    def setUp(self):
+        rand = random.Random(0)
+        self.rects = random_rects(200, position=(0, 200), size=(0, 60), rand=rand)
+        self.knives = random_rects(40, position=(0, 200), size=(0, 30), rand=rand)
+
+    def test_bipartite(self):
+        pairs = sorted(rectop.sweep.bipartite(self.knives, self.rects))
+        expect = [
+            (i, j)
+            for i, knife in enumerate(self.knives)
+            for j, rect in enumerate(self.rects)
+            if knife.colliderect(rect)
+        ]
+        self.assertEqual(pairs, expect)
+
+    def test_many_same_as_all(self):
+        expect = list(self.rects)
+        for knife in self.knives:
+            rectop.cut.all(knife, expect)
+        rects = list(self.rects)
+        rectop.cut.many(self.knives, rects)
+        self.assertEqual(sorted(map(tuple, rects)), sorted(map(tuple, expect)))
+
+    def test_many_result(self):
+        rects = list(self.rects)
+        result = rectop.cut.many(self.knives, rects)
+        after = list(self.rects)
+        rectop.join.apply(result, after)
+        self.assertEqual(sorted(map(tuple, after)), sorted(map(tuple, rects)))
+
+
+if __name__ == '__main__':
+    unittest.main()
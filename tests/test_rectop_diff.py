@@ -0,0 +1,83 @@
+import unittest
+
+import rectop
+
+from lib.external import pygame
+
+class TestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.rects = [
+            pygame.Rect(x, y, 10, 10) for y in range(0, 30, 10) for x in range(0, 30, 10)
+        ]
+
+    def sorted_tuples(self, rects):
+        return sorted(map(tuple, rects))
+
+    def test_invert_defrag(self):
+        rects = list(self.rects)
+        diff = rectop.join.defrag(rects)
+        rectop.diff.apply(diff, rects)
+        self.assertEqual(rects, [pygame.Rect(0, 0, 30, 30)])
+        rectop.diff.apply(rectop.diff.invert(diff), rects)
+        self.assertEqual(self.sorted_tuples(rects), self.sorted_tuples(self.rects))
+
+    def test_apply_like_list_remove(self):
+        rects = self.rects + self.rects[:1]
+        diff = rectop.diff.new(append=[pygame.Rect(1, 1, 1, 1)], remove=self.rects[:2])
+        expect = list(rects)
+        for rect in diff['append']:
+            expect.append(rect)
+        for rect in diff['remove']:
+            expect.remove(rect)
+        rectop.diff.apply(diff, rects)
+        self.assertEqual(rects, expect)
+        # nothing changed when a rect is missing
+        with self.assertRaises(ValueError):
+            rectop.diff.apply(rectop.diff.new(remove=self.rects[1:3]), rects)
+        self.assertEqual(rects, expect)
+
+    def test_apply_to_store(self):
+        store = rectop.store.RectStore(self.rects, cellsize=rectop.index.CELLSIZE)
+        appended = pygame.Rect(1, 1, 1, 1)
+        # removes its own append, and an existing rect
+        diff = rectop.diff.new(append=[appended, appended], remove=[appended, self.rects[0]])
+        rectop.diff.apply(diff, store)
+        self.assertEqual(self.sorted_tuples(store), self.sorted_tuples(self.rects[1:] + [appended]))
+        # a stale diff changes nothing
+        stale = rectop.diff.new(append=[pygame.Rect(5, 5, 5, 5)], remove=self.rects[:2])
+        with self.assertRaises(ValueError):
+            rectop.diff.apply(stale, store)
+        self.assertEqual(self.sorted_tuples(store), self.sorted_tuples(self.rects[1:] + [appended]))
+
+    def test_history(self):
+        rects = list(self.rects)
+        history = rectop.diff.History()
+        history.push('cut', rectop.cut.all(pygame.Rect(5, 5, 10, 10), rects))
+        after_cut = list(rects)
+        diff = rectop.join.defrag(rects)
+        rectop.diff.apply(diff, rects)
+        history.push('defrag', diff)
+        after_defrag = list(rects)
+
+        op, _ = history.undo(rects)
+        self.assertEqual(op, 'defrag')
+        self.assertEqual(self.sorted_tuples(rects), self.sorted_tuples(after_cut))
+        history.undo(rects)
+        self.assertEqual(self.sorted_tuples(rects), self.sorted_tuples(self.rects))
+        self.assertIsNone(history.undo(rects))
+        history.redo(rects)
+        history.redo(rects)
+        self.assertEqual(self.sorted_tuples(rects), self.sorted_tuples(after_defrag))
+        self.assertIsNone(history.redo(rects))
+
+    def test_history_bounded(self):
+        history = rectop.diff.History(max_rects=10)
+        for rect in self.rects:
+            history.push('new', rectop.diff.new(append=[rect, rect]))
+        self.assertEqual(len(history.undos), 5)
+        self.assertEqual(history.held, 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+import unittest
+
+from itertools import combinations
+
+import rectop
+
+from helpers import random_rects
+
+class TestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.rects = random_rects(150, position=(0, 200), size=(0, 50))
+
+    def test_all_intersections(self):
+        result = [
+            (tuple(r1), tuple(r2), tuple(irect))
+            for r1, r2, irect in rectop.get.all_intersections(self.rects)
+        ]
+        expect = [
+            (tuple(r1), tuple(r2), tuple(rectop.get.intersection(r1, r2)))
+            for r1, r2 in combinations(self.rects, 2)
+            if r1.colliderect(r2)
+        ]
+        self.assertEqual(sorted(result), sorted(expect))
+
+    def test_intersection_variants(self):
+        pairs = list(combinations(self.rects[:60], 2))
+        pairs.extend((rect, rect.copy()) for rect in self.rects[:10])
+        expect = [rectop.get.intersection_lines(r1, r2) for r1, r2 in pairs]
+        for func in [rectop.get.intersection_minmax, rectop.get.intersection_pygame]:
+            with self.subTest(func=func.__name__):
+                self.assertEqual([func(r1, r2) for r1, r2 in pairs], expect)
+        self.assertEqual(rectop.get.intersections(pairs), expect)
+
+
+if __name__ == '__main__':
+    unittest.main()
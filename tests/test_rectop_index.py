@@ -0,0 +1,62 @@
+import random
+import unittest
+
+import rectop
+
+from helpers import random_rects
+
+class TestCase(unittest.TestCase):
+
+    def setUp(self):
+        rand = random.Random(0)
+        self.rects = random_rects(300, position=(-200, 600), size=(0, 150), rand=rand)
+        self.points = [(rand.randint(-250, 800), rand.randint(-250, 800)) for _ in range(200)]
+
+    def test_point_candidates(self):
+        grid = rectop.index.Grid()
+        grid.bulk_load(enumerate(self.rects))
+        for pos in self.points:
+            candidates = grid.point_candidates(pos)
+            self.assertEqual(list(candidates), sorted(candidates))
+            expect = [i for i, rect in enumerate(self.rects) if rect.collidepoint(pos)]
+            self.assertEqual([i for i in candidates if self.rects[i].collidepoint(pos)], expect)
+
+    def test_rect_candidates(self):
+        grid = rectop.index.Grid()
+        grid.bulk_load(enumerate(self.rects))
+        for query in self.rects[:50]:
+            candidates = grid.rect_candidates(query)
+            expect = [i for i, rect in enumerate(self.rects) if rect.colliderect(query)]
+            self.assertEqual([i for i in candidates if self.rects[i].colliderect(query)], expect)
+
+    def test_zero_size(self):
+        grid = rectop.index.Grid(cellsize=10)
+        grid.insert(0, (15, 25, 0, 0))
+        self.assertEqual(list(grid.cells_for((15, 25, 0, 0))), [(1, 2)])
+        self.assertEqual(list(grid.point_candidates((15, 25))), [0])
+
+    def test_in_sync(self):
+        grid = rectop.index.Grid()
+        grid.bulk_load(enumerate(self.rects[:100]))
+        for key in range(50):
+            grid.remove(key, self.rects[key])
+        # out of order inserts keep key order
+        grid.remove(99, self.rects[99])
+        grid.insert(99, self.rects[0])
+        grid.insert(0, self.rects[0])
+        expect = {key: self.rects[key] for key in range(50, 99)}
+        expect[99] = expect[0] = self.rects[0]
+        for pos in self.points:
+            candidates = grid.point_candidates(pos)
+            self.assertEqual(list(candidates), sorted(candidates))
+            self.assertEqual(
+                [key for key in candidates if expect[key].collidepoint(pos)],
+                sorted(key for key, rect in expect.items() if rect.collidepoint(pos)),
+            )
+        for key in list(expect):
+            grid.remove(key, expect[key])
+        self.assertEqual(len(grid), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
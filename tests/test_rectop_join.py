@@ -0,0 +1,128 @@
+import unittest
+
+from itertools import combinations
+from unittest import mock
+
+import rectop
+
+from lib.external import pygame
+
+class TestCase(unittest.TestCase):
+
+    def setUp(self):
+        # 4x4 grid of 10x10 tiles
+        self.tiles = [
+            pygame.Rect(x, y, 10, 10) for y in range(0, 40, 10) for x in range(0, 40, 10)
+        ]
+
+    def test_defrag_tiles(self):
+        rects = list(self.tiles)
+        rectop.join.defrag_ip(rects)
+        self.assertEqual(rects, [pygame.Rect(0, 0, 40, 40)])
+
+    def test_defrag_result_shape(self):
+        rects = [pygame.Rect(0, 0, 10, 10), pygame.Rect(10, 0, 10, 10)]
+        result = rectop.join.defrag(rects)
+        self.assertEqual(result['append'], [pygame.Rect(0, 0, 20, 10)])
+        self.assertEqual(result['remove'], rects)
+
+    def test_defrag_same(self):
+        rects = [pygame.Rect(0, 0, 10, 10), pygame.Rect(0, 0, 10, 10)]
+        rectop.join.defrag_ip(rects)
+        self.assertEqual(rects, [pygame.Rect(0, 0, 10, 10)])
+
+    def test_defrag_not_joinable(self):
+        rects = [pygame.Rect(0, 0, 10, 10), pygame.Rect(10, 5, 10, 10)]
+        result = rectop.join.defrag(rects)
+        self.assertEqual(result, {'append': [], 'remove': []})
+
+    def test_defrag_subdivided(self):
+        rects = [pygame.Rect(0, 0, 64, 64)]
+        for _ in range(4):
+            rects = [sub for rect in rects for sub in rectop.cut.position(rect.center, rect)]
+        rects.append(pygame.Rect(64, 0, 10, 30))
+        rectop.join.defrag_ip(rects)
+        self.assertFalse(
+            any(rectop.query.is_joinable(r1, r2) for r1, r2 in combinations(rects, 2))
+        )
+        self.assertEqual(sum(rect.width * rect.height for rect in rects), 64*64 + 10*30)
+
+    def test_defrag_largest_progress(self):
+        rects = list(self.tiles)
+        progress = mock.Mock()
+        result = rectop.join.defrag_largest(rects, progress=progress)
+        total = 2 * len(rects) - 1
+        calls = [call.args for call in progress.call_args_list]
+        # indexing reports before any join
+        self.assertEqual(calls[:len(rects)], [(done, total) for done in range(1, len(rects) + 1)])
+        self.assertEqual(calls[-1], (len(rects) + len(result['append']), total))
+
+    def test_defrag_strategies(self):
+        # L shape of tiles
+        tiles = [rect for rect in self.tiles if rect.x < 10 or rect.y >= 30]
+        area = sum(rect.width * rect.height for rect in tiles)
+        expect = {'greedy': 2, 'largest': 2, 'optimal': 2}
+        for strategy, count in expect.items():
+            with self.subTest(strategy=strategy):
+                rects = list(tiles)
+                rectop.join.defrag_ip(rects, strategy)
+                self.assertEqual(len(rects), count)
+                self.assertEqual(sum(rect.width * rect.height for rect in rects), area)
+
+    def test_defrag_optimal_fewer(self):
+        # T on its side, the others join the middle row first
+        rects = [
+            pygame.Rect(0, 0, 10, 10),
+            pygame.Rect(0, 10, 10, 10),
+            pygame.Rect(10, 10, 10, 10),
+            pygame.Rect(20, 10, 10, 10),
+            pygame.Rect(0, 20, 10, 10),
+        ]
+        for strategy, count in [('greedy', 3), ('largest', 3), ('optimal', 2)]:
+            with self.subTest(strategy=strategy):
+                result = list(rects)
+                rectop.join.defrag_ip(result, strategy)
+                self.assertEqual(len(result), count)
+
+    def test_defrag_unknown_strategy(self):
+        with self.assertRaises(ValueError):
+            rectop.join.defrag(self.tiles, 'nope')
+
+    def test_defrag_parallel(self):
+        rects = [pygame.Rect(0, 0, 64, 64), pygame.Rect(100, 0, 64, 64)]
+        for _ in range(3):
+            rects = [sub for rect in rects for sub in rectop.cut.position(rect.center, rect)]
+        # apart from the others
+        rects.extend(tile.move(300, 0) for tile in self.tiles)
+        expect = list(rects)
+        rectop.join.defrag_ip(expect)
+        with mock.patch('rectop.join.available_cpus', return_value=2):
+            result = rectop.join.defrag_parallel(rects, jobs=2)
+        rectop.join.apply(result, rects)
+        self.assertEqual(sorted(map(tuple, rects)), sorted(map(tuple, expect)))
+
+    def test_defrag_parallel_one_partition(self):
+        rects = self.tiles + [pygame.Rect(300, 0, 10, 10)]
+        with mock.patch('rectop.join.available_cpus', return_value=2):
+            with mock.patch('rectop.join.ProcessPoolExecutor') as pool:
+                result = rectop.join.defrag_parallel(rects, jobs=2)
+        pool.assert_not_called()
+        self.assertEqual(result, rectop.join.defrag(rects))
+
+    def test_partitions(self):
+        rects = [
+            pygame.Rect(0, 0, 10, 10),
+            pygame.Rect(50, 50, 10, 10),
+            pygame.Rect(10, 0, 10, 10),
+            pygame.Rect(60, 60, 10, 10),
+            pygame.Rect(200, 0, 10, 10),
+        ]
+        partitions = sorted(rectop.join.partitions(rects))
+        self.assertEqual(partitions, [[0, 2], [1, 3], [4]])
+        # grid cells the size of the rects find the same, touching included
+        partitions = sorted(rectop.join.partitions(rects, cellsize=10))
+        self.assertEqual(partitions, [[0, 2], [1, 3], [4]])
+
+
+if __name__ == '__main__':
+    unittest.main()
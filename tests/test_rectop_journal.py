@@ -0,0 +1,95 @@
+import os
+import tempfile
+import unittest
+
+from unittest import mock
+
+import rectop
+
+from lib.external import pygame
+
+class TestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.snapshot = os.path.join(self.tempdir.name, 'save.layout')
+        self.filename = os.path.join(self.tempdir.name, 'save.journal')
+        self.rects = [pygame.Rect(0, 0, 40, 40), pygame.Rect(40, 0, 40, 40)]
+        rectop.layout.save(self.snapshot, self.rects)
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def operate(self, journal):
+        rects = list(self.rects)
+        result = rectop.cut.all(pygame.Rect(10, 10, 10, 10), rects)
+        journal.record('cut', result)
+        result = rectop.join.defrag(rects)
+        rectop.join.apply(result, rects)
+        journal.record('defrag', result)
+        return rects
+
+    def test_restore(self):
+        journal = rectop.journal.Journal(self.filename, self.snapshot)
+        rects = self.operate(journal)
+        journal.close()
+        self.assertEqual(rectop.journal.restore(self.snapshot, self.filename), rects)
+
+    def test_truncated_entry(self):
+        journal = rectop.journal.Journal(self.filename, self.snapshot)
+        journal.record('new', {'append': [pygame.Rect(1, 2, 3, 4)], 'remove': []})
+        journal.close()
+        expect = rectop.journal.restore(self.snapshot, self.filename)
+        with open(self.filename, 'ab') as fp:
+            # crashed writing an entry
+            fp.write(rectop.journal.ENTRY.pack(0, 0, 1) + b'\0' * 5)
+        self.assertEqual(rectop.journal.restore(self.snapshot, self.filename), expect)
+        # reopening drops it and keeps appending
+        journal = rectop.journal.Journal(self.filename, self.snapshot)
+        self.assertEqual(journal.entries, 1)
+        journal.record('delete', {'append': [], 'remove': [pygame.Rect(1, 2, 3, 4)]})
+        journal.close()
+        self.assertEqual(rectop.journal.restore(self.snapshot, self.filename), self.rects)
+
+    def test_compact(self):
+        journal = rectop.journal.Journal(self.filename, self.snapshot)
+        rects = self.operate(journal)
+        journal.compact(rects)
+        self.assertEqual(journal.entries, 0)
+        journal.close()
+        self.assertEqual(rectop.layout.load(self.snapshot), rects)
+        self.assertEqual(rectop.journal.restore(self.snapshot, self.filename), rects)
+
+    def test_stale_journal_ignored(self):
+        journal = rectop.journal.Journal(self.filename, self.snapshot)
+        rects = self.operate(journal)
+        journal.close()
+        # crashed after writing the snapshot, before starting a new journal
+        rectop.layout.save(self.snapshot, rects)
+        self.assertEqual(rectop.journal.restore(self.snapshot, self.filename), rects)
+
+    def test_interrupted_compaction(self):
+        journal = rectop.journal.Journal(self.filename, self.snapshot)
+        new = {'append': [pygame.Rect(100, 100, 10, 10)], 'remove': []}
+        journal.record('new', new)
+        grown = self.rects + new['append']
+        # crash appending to the snapshot
+        with mock.patch('os.fsync', side_effect=KeyboardInterrupt):
+            with self.assertRaises(KeyboardInterrupt):
+                journal.compact(grown)
+        self.assertEqual(rectop.journal.restore(self.snapshot, self.filename), grown)
+
+        rects = list(grown)
+        journal.record('cut', rectop.cut.all(pygame.Rect(10, 10, 10, 10), rects))
+        # crash replacing the snapshot
+        with mock.patch('os.fsync', side_effect=KeyboardInterrupt):
+            with self.assertRaises(KeyboardInterrupt):
+                journal.compact(rects)
+        journal.close()
+        self.assertEqual(rectop.journal.restore(self.snapshot, self.filename), rects)
+        # no temporary files left
+        self.assertEqual(sorted(os.listdir(self.tempdir.name)), ['save.journal', 'save.layout'])
+
+
+if __name__ == '__main__':
+    unittest.main()
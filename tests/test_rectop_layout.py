@@ -0,0 +1,78 @@
+import os
+import tempfile
+import unittest
+
+from unittest import mock
+
+import rectop
+
+from helpers import random_rects
+from lib.external import pygame
+
+class TestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.rects = random_rects(200, position=(-300, 300), size=(0, 100))
+        fd, self.filename = tempfile.mkstemp()
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.filename)
+
+    def test_round_trip(self):
+        rectop.layout.save(self.filename, self.rects)
+        self.assertEqual(rectop.layout.load(self.filename), self.rects)
+        with rectop.layout.Layout(self.filename) as layout:
+            self.assertEqual(len(layout), len(self.rects))
+            self.assertEqual(layout[-1], self.rects[-1])
+
+    def test_save_incremental(self):
+        written = rectop.layout.save_incremental(self.filename, self.rects[:50])
+        self.assertEqual(written, 50)
+        written = rectop.layout.save_incremental(self.filename, self.rects)
+        self.assertEqual(written, 150)
+        self.assertEqual(rectop.layout.load(self.filename), self.rects)
+        # not a prefix, rewritten
+        written = rectop.layout.save_incremental(self.filename, self.rects[1:])
+        self.assertEqual(written, 199)
+        self.assertEqual(rectop.layout.load(self.filename), self.rects[1:])
+
+    def test_index(self):
+        rectop.layout.save(self.filename, self.rects, with_index=True, cellsize=32)
+        with rectop.layout.Layout(self.filename) as layout:
+            self.assertTrue(layout.has_index)
+            for pos in [(0, 0), (-150, 20), (33, 270)]:
+                expect = [i for i, rect in enumerate(self.rects) if rect.collidepoint(pos)]
+                self.assertEqual(sorted(layout.query_point(pos)), expect)
+            query = pygame.Rect(-50, -50, 120, 80)
+            expect = [i for i, rect in enumerate(self.rects) if rect.colliderect(query)]
+            self.assertEqual(layout.query_rect(query), expect)
+        # appending drops the index
+        rectop.layout.append(self.filename, self.rects[:1])
+        with rectop.layout.Layout(self.filename) as layout:
+            self.assertFalse(layout.has_index)
+            self.assertEqual(list(layout), self.rects + self.rects[:1])
+
+    def test_interrupted_save(self):
+        rectop.layout.save(self.filename, self.rects[:50])
+        # crash before the new file replaces the old
+        with mock.patch('os.replace', side_effect=KeyboardInterrupt):
+            with self.assertRaises(KeyboardInterrupt):
+                rectop.layout.save(self.filename, self.rects[1:])
+        # crash before the header counts appended records
+        with mock.patch('os.fsync', side_effect=KeyboardInterrupt):
+            with self.assertRaises(KeyboardInterrupt):
+                rectop.layout.append(self.filename, self.rects[50:])
+        self.assertEqual(rectop.layout.load(self.filename), self.rects[:50])
+        directory, name = os.path.split(self.filename)
+        self.assertEqual([other for other in os.listdir(directory) if name in other], [name])
+
+    def test_not_a_layout(self):
+        with open(self.filename, 'wb') as fp:
+            fp.write(b'not a layout file at all')
+        with self.assertRaises(rectop.layout.LayoutError):
+            rectop.layout.load(self.filename)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+
+import rectop
+
+from lib.external import pygame
+
+class TestCase(unittest.TestCase):
+
+    def assertPartitions(self, rects, partition):
+        covered = set()
+        for rect in partition:
+            cells = {
+                (x, y)
+                for x in range(rect.left, rect.right)
+                for y in range(rect.top, rect.bottom)
+            }
+            self.assertFalse(covered & cells)
+            covered |= cells
+        expect = {
+            (x, y)
+            for rect in rects
+            for x in range(rect.left, rect.right)
+            for y in range(rect.top, rect.bottom)
+        }
+        self.assertEqual(covered, expect)
+
+    def test_minimum_ring(self):
+        # 3x3 with the middle missing
+        rects = [
+            pygame.Rect(x, y, 1, 1)
+            for y in range(3) for x in range(3)
+            if (x, y) != (1, 1)
+        ]
+        partition = rectop.partition.minimum(rects)
+        self.assertPartitions(rects, partition)
+        self.assertEqual(len(partition), 4)
+
+    def test_minimum_overlapping(self):
+        # plus sign needs three
+        rects = [pygame.Rect(0, 10, 30, 10), pygame.Rect(10, 0, 10, 30)]
+        partition = rectop.partition.minimum(rects)
+        self.assertPartitions(rects, partition)
+        self.assertEqual(len(partition), 3)
+
+    def test_minimum_chords(self):
+        # H, cutting along the chords between its reflex corners
+        rects = [
+            pygame.Rect(0, 0, 10, 30),
+            pygame.Rect(10, 10, 5, 10),
+            pygame.Rect(15, 10, 5, 10),
+            pygame.Rect(20, 0, 10, 30),
+        ]
+        partition = rectop.partition.minimum(rects)
+        self.assertPartitions(rects, partition)
+        self.assertEqual(len(partition), 3)
+
+    def test_minimum_empty(self):
+        self.assertEqual(rectop.partition.minimum([pygame.Rect(0, 0, 0, 10)]), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import os
+import pickle
+import random
+import subprocess
+import sys
+import unittest
+
+import rectop
+
+from helpers import random_rects
+from lib.external import pygame
+from rectop.rect import Rect
+
+ATTRIBUTES = [
+    'x', 'y', 'w', 'h', 'width', 'height', 'size', 'centerx', 'centery',
+    'center',
+] + rectop.SIDES + rectop.POINTS
+
+class TestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.values = random_rects(300, position=(-20, 20), size=(0, 15), rect_type=Rect)
+
+    def test_like_pygame(self):
+        for a, b in zip(self.values, self.values[1:]):
+            r1, r2 = Rect(a), Rect(b)
+            p1, p2 = pygame.Rect(a), pygame.Rect(b)
+            for name in ATTRIBUTES:
+                self.assertEqual(getattr(r1, name), getattr(p1, name))
+            self.assertEqual(bool(r1), bool(p1))
+            self.assertEqual(r1.colliderect(r2), p1.colliderect(p2))
+            self.assertEqual(r1.collidepoint(b[:2]), p1.collidepoint(b[:2]))
+            self.assertEqual(r1.contains(r2), p1.contains(p2))
+            self.assertEqual(r1.clip(r2), p1.clip(p2))
+            self.assertEqual(r1.union(r2), p1.union(p2))
+            self.assertEqual(r1.unionall([r2, p2]), p1.unionall([p2]))
+            self.assertEqual(r1.inflate(-b[2], -b[3]), p1.inflate(-b[2], -b[3]))
+            self.assertEqual(r1.move(*b[:2]), p1.move(*b[:2]))
+
+    def test_value(self):
+        rect = Rect(1, 2, 3, 4)
+        self.assertEqual(rect, (1, 2, 3, 4))
+        self.assertEqual(rect, pygame.Rect(1, 2, 3, 4))
+        self.assertEqual(Rect((1, 2), (3, 4)), rect)
+        self.assertEqual(Rect(pygame.Rect(1, 2, 3, 4)), rect)
+        self.assertEqual(len({rect, Rect(1, 2, 3, 4)}), 1)
+        with self.assertRaises(AttributeError):
+            rect.x = 0
+        copy = pickle.loads(pickle.dumps(rect))
+        self.assertEqual(copy, rect)
+        self.assertIs(type(copy), Rect)
+
+    def test_operations(self):
+        # same results from either type, of the type given
+        rand = random.Random(0)
+        values = [(rand.randrange(12) * 10, rand.randrange(12) * 10, 10, 10) for _ in range(100)]
+        rects = [Rect(value) for value in values]
+        pygame_rects = [pygame.Rect(value) for value in values]
+        knife = (25, 25, 50, 50)
+
+        diff = rectop.cut.all(Rect(knife), rects)
+        self.assertEqual(diff, rectop.cut.all(pygame.Rect(knife), pygame_rects))
+        self.assertTrue(all(type(rect) is Rect for rect in diff['append']))
+
+        diff = rectop.join.defrag(rects)
+        self.assertEqual(diff, rectop.join.defrag(pygame_rects))
+        self.assertTrue(all(type(rect) is Rect for rect in diff['append']))
+
+        self.assertEqual(rectop.partition.minimum(rects), rectop.partition.minimum(pygame_rects))
+        self.assertEqual(rectop.get.wrap(rects), rectop.get.wrap(pygame_rects))
+        self.assertEqual(rectop.stats.summary(rects), rectop.stats.summary(pygame_rects))
+
+    def test_no_pygame(self):
+        code = 'import sys, rectop; print("pygame" in sys.modules, rectop.external.Rect.__module__)'
+        output = subprocess.run(
+            [sys.executable, '-c', code],
+            cwd = os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            env = dict(os.environ, RECTOP_NO_PYGAME='1'),
+            capture_output = True,
+            text = True,
+            check = True,
+        ).stdout
+        self.assertEqual(output.split(), ['False', 'rectop.rect'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import time
+import unittest
+
+import rectop
+
+from helpers import random_rects
+from lib.external import pygame
+
+class TestCase(unittest.TestCase):
+
+    def test_covered_areas(self):
+        rects = [
+            pygame.Rect(0, 0, 10, 10),
+            pygame.Rect(5, 5, 10, 10),
+            pygame.Rect(6, 6, 2, 2),
+            pygame.Rect(100, 100, 0, 10),
+        ]
+        self.assertEqual(rectop.stats.union_area(rects), 175)
+        self.assertEqual(rectop.stats.overlap_area(rects), 25)
+
+    def test_partition_minimum(self):
+        # L shape
+        rects = [pygame.Rect(x, y, 1, 1) for x, y in [(0, 0), (0, 1), (1, 1)]]
+        self.assertEqual(rectop.stats.partition_minimum(rects), 2)
+        # ring around a hole
+        rects = [
+            pygame.Rect(x, y, 1, 1)
+            for y in range(3) for x in range(3)
+            if (x, y) != (1, 1)
+        ]
+        self.assertEqual(rectop.stats.partition_minimum(rects), 4)
+        # holes touching at corners, the four sides and four cells between
+        # the holes
+        rects = [
+            pygame.Rect(x, y, 1, 1)
+            for y in range(5) for x in range(5)
+            if not ((x + y) % 2 == 0 and 0 < x < 4 and 0 < y < 4)
+        ]
+        self.assertEqual(rectop.stats.partition_minimum(rects), 8)
+
+    def test_summary(self):
+        tiles = [pygame.Rect(x, 0, 10, 10) for x in range(0, 40, 10)]
+        tiles.append(pygame.Rect(0, 30, 10, 10))
+        summary = rectop.stats.summary(tiles)
+        self.assertEqual(summary['count'], 5)
+        self.assertEqual(summary['union_area'], 500)
+        self.assertEqual(summary['overlap_area'], 0)
+        self.assertEqual(summary['bounds_area'], 1600)
+        self.assertNotIn('partition_minimum', summary)
+        summary = rectop.stats.summary(tiles, exact=True)
+        self.assertEqual(summary['partition_minimum'], 2)
+        self.assertEqual(summary['fragmentation'], 2.5)
+
+    def test_summary_large(self):
+        # rects that do not line up, too many for the exact minimum
+        rects = random_rects(10_000, position=(0, 10_000), size=(1, 200))
+        start = time.perf_counter()
+        summary = rectop.stats.summary(rects)
+        self.assertLess(time.perf_counter() - start, 5)
+        self.assertEqual(summary['count'], 10_000)
+        self.assertLessEqual(summary['union_area'], summary['area'])
+
+
+if __name__ == '__main__':
+    unittest.main()
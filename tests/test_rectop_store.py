@@ -0,0 +1,131 @@
+import random
+import sys
+import tracemalloc
+import unittest
+
+import rectop
+
+from helpers import random_rects
+from lib.external import pygame
+
+class TestCase(unittest.TestCase):
+
+    def setUp(self):
+        rand = random.Random(0)
+        self.rects = random_rects(300, position=(-200, 600), size=(0, 150), rand=rand)
+        self.points = [(rand.randint(-250, 800), rand.randint(-250, 800)) for _ in range(200)]
+
+    def test_stable_ids(self):
+        store = rectop.store.RectStore(self.rects)
+        self.assertEqual(list(store), self.rects)
+        for rect_id in range(0, 300, 2):
+            store.delete(rect_id)
+        self.assertEqual(len(store), 150)
+        # remaining ids still get their rect
+        for rect_id in range(1, 300, 2):
+            self.assertEqual(store[rect_id], self.rects[rect_id])
+        with self.assertRaises(KeyError):
+            store[0]
+        # deleted ids are not reused
+        rect_id = store.add(pygame.Rect(1, 2, 3, 4))
+        self.assertEqual(rect_id, 300)
+        self.assertEqual(store[rect_id], pygame.Rect(1, 2, 3, 4))
+        self.assertEqual(len(store), 151)
+        with self.assertRaises(KeyError):
+            store.update(0, pygame.Rect(1, 2, 3, 4))
+
+    def test_compact(self):
+        store = rectop.store.RectStore(self.rects, cellsize=rectop.index.CELLSIZE)
+        for rect_id in range(0, 300, 3):
+            store.delete(rect_id)
+        self.assertEqual(store.dead, 100)
+        moved = store.compact()
+        self.assertEqual(store.dead, 0)
+        self.assertEqual(len(store.x), 200)
+        expect = [rect for i, rect in enumerate(self.rects) if i % 3]
+        self.assertEqual(list(store), expect)
+        self.assertEqual(len(moved), 200)
+        for old, new in moved.items():
+            self.assertEqual(store[new], self.rects[old])
+        self.assertNotIn(0, moved)
+        for pos in self.points:
+            self.assertEqual(store.collidepoint(pos), [rect for rect in expect if rect.collidepoint(pos)])
+        # nothing to move
+        self.assertEqual(store.compact(), {i: i for i in range(200)})
+
+    def test_copies(self):
+        store = rectop.store.RectStore(self.rects[:1])
+        rect = store[0]
+        rect.x += 10
+        self.assertEqual(store[0], self.rects[0])
+        store.update(0, rect)
+        self.assertEqual(store[0], rect)
+
+    def test_remove_by_value(self):
+        for cellsize in (None, rectop.index.CELLSIZE):
+            store = rectop.store.RectStore(self.rects, cellsize=cellsize)
+            store.append(self.rects[0])
+            for rect in self.rects[:100]:
+                store.remove(pygame.Rect(rect))
+            self.assertEqual(sorted(map(tuple, store)), sorted(map(tuple, self.rects[100:] + self.rects[:1])))
+            with self.assertRaises(ValueError):
+                store.remove(self.rects[1])
+
+    def test_find_many(self):
+        for cellsize in (None, rectop.index.CELLSIZE):
+            store = rectop.store.RectStore(self.rects, cellsize=cellsize)
+            store.append(self.rects[0])
+            with self.assertRaises(ValueError):
+                store.find_many(self.rects[:2] * 2)
+            self.assertEqual(sorted(store.find_many(self.rects[:100] + self.rects[:1])), list(range(100)) + [300])
+
+    def test_diff(self):
+        store = rectop.store.RectStore(self.rects)
+        diff = rectop.join.defrag(store)
+        rectop.diff.apply(diff, store)
+        expect = list(self.rects)
+        rectop.diff.apply(diff, expect)
+        self.assertEqual(sorted(map(tuple, store)), sorted(map(tuple, expect)))
+
+    def test_hit_tests(self):
+        indexed = rectop.store.RectStore(self.rects, cellsize=rectop.index.CELLSIZE)
+        scanned = rectop.store.RectStore(self.rects)
+        for rect_id in range(0, 300, 3):
+            indexed.delete(rect_id)
+            scanned.delete(rect_id)
+        expect = [rect for i, rect in enumerate(self.rects) if i % 3]
+        for pos in self.points:
+            rects = [rect for rect in expect if rect.collidepoint(pos)]
+            self.assertEqual(indexed.collidepoint(pos), rects)
+            self.assertEqual(scanned.collidepoint(pos), rects)
+        for query in self.rects[:50]:
+            rects = [rect for rect in expect if rect.colliderect(query)]
+            self.assertEqual(indexed.colliderect(query), rects)
+            self.assertEqual(scanned.colliderect(query), rects)
+
+    def test_cut(self):
+        store = rectop.store.RectStore(self.rects, cellsize=rectop.index.CELLSIZE)
+        rects = list(self.rects)
+        knife = pygame.Rect(100, 100, 200, 200)
+        self.assertEqual(rectop.cut.all(knife, store), rectop.cut.all(knife, rects))
+        self.assertEqual(sorted(map(tuple, store)), sorted(map(tuple, rects)))
+
+    def test_memory(self):
+        as_list = sys.getsizeof(self.rects) + sum(map(sys.getsizeof, self.rects))
+        store = rectop.store.RectStore(self.rects)
+        self.assertLess(store.nbytes * 2, as_list)
+        # with a grid, cells keep only ids
+        rand = random.Random(0)
+        rects = [pygame.Rect(rand.randrange(800), rand.randrange(600), 10, 10) for _ in range(5000)]
+        as_list = sys.getsizeof(rects) + sum(map(sys.getsizeof, rects))
+        tracemalloc.start()
+        try:
+            store = rectop.store.RectStore(rects, cellsize=rectop.index.CELLSIZE)
+            size, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertLess(size, as_list)
+
+
+if __name__ == '__main__':
+    unittest.main()
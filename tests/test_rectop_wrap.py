@@ -0,0 +1,57 @@
+import unittest
+
+import rectop
+
+from lib.external import pygame
+
+class TestCase(unittest.TestCase):
+
+    def test_outline_rect(self):
+        polygons = rectop.wrap.outline([pygame.Rect(0, 0, 10, 20)])
+        self.assertEqual(polygons, [([(0, 0), (10, 0), (10, 20), (0, 20)], [])])
+
+    def test_outline_l_shape(self):
+        rects = [pygame.Rect(0, 0, 10, 20), pygame.Rect(10, 10, 10, 10)]
+        polygons = rectop.wrap.outline(rects)
+        self.assertEqual(
+            polygons,
+            [([(0, 0), (10, 0), (10, 10), (20, 10), (20, 20), (0, 20)], [])],
+        )
+
+    def test_outline_overlapping(self):
+        rects = [pygame.Rect(0, 0, 20, 10), pygame.Rect(5, 0, 20, 10)]
+        polygons = rectop.wrap.outline(rects)
+        self.assertEqual(polygons, [([(0, 0), (25, 0), (25, 10), (0, 10)], [])])
+
+    def test_outline_hole(self):
+        # ring around (10, 10, 10, 10)
+        rects = [
+            pygame.Rect(0, 0, 30, 10),
+            pygame.Rect(0, 20, 30, 10),
+            pygame.Rect(0, 10, 10, 10),
+            pygame.Rect(20, 10, 10, 10),
+        ]
+        [(outer, holes)] = rectop.wrap.outline(rects)
+        self.assertEqual(outer, [(0, 0), (30, 0), (30, 30), (0, 30)])
+        self.assertEqual(holes, [[(10, 10), (10, 20), (20, 20), (20, 10)]])
+        self.assertEqual(rectop.wrap.area(outer), 900)
+        self.assertEqual(rectop.wrap.area(holes[0]), -100)
+
+    def test_outline_touching_corners(self):
+        rects = [pygame.Rect(0, 0, 10, 10), pygame.Rect(10, 10, 10, 10)]
+        polygons = rectop.wrap.outline(rects)
+        self.assertEqual(
+            sorted(polygons),
+            [
+                ([(0, 0), (10, 0), (10, 10), (0, 10)], []),
+                ([(10, 10), (20, 10), (20, 20), (10, 20)], []),
+            ],
+        )
+
+    def test_outline_empty(self):
+        self.assertEqual(rectop.wrap.outline([]), [])
+        self.assertEqual(rectop.wrap.outline([pygame.Rect(0, 0, 0, 10)]), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
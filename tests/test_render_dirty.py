@@ -0,0 +1,95 @@
+import unittest
+
+from unittest import mock
+
+from lib.external import pygame
+from render.dirty import MAXDIRTY
+from render.dirty import DirtyRenderer
+from render.dirty import Drawable
+
+WHITE = (255, 255, 255)
+RED = (255, 0, 0)
+
+def fill(surface, rect, color):
+    surface.fill(color, rect)
+
+class TestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.surface = pygame.Surface((100, 100))
+        self.renderer = DirtyRenderer(self.surface, (0, 0, 0))
+        self.rects = [(10, 10, 10, 10), (50, 50, 20, 20)]
+        # areas the scene was asked for
+        self.asked = []
+        patcher = mock.patch('pygame.display.update')
+        self.update = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def scene(self, area):
+        self.asked.append(area)
+        for rect in self.rects:
+            if area.colliderect(rect):
+                yield Drawable(fill, rect, (WHITE,))
+
+    def test_first_frame(self):
+        areas = self.renderer.render(self.scene)
+        self.assertEqual(areas, [self.surface.get_rect()])
+        self.assertEqual(self.asked, areas)
+        self.update.assert_called_once_with(areas)
+        self.assertEqual(self.surface.get_at((15, 15)), WHITE)
+        self.assertEqual(self.surface.get_at((60, 60)), WHITE)
+
+    def test_nothing_changed(self):
+        self.renderer.render(self.scene)
+        self.asked.clear()
+        self.assertEqual(self.renderer.render(self.scene), [])
+        self.assertEqual(self.asked, [])
+
+    def test_mark(self):
+        self.renderer.render(self.scene)
+        self.asked.clear()
+        self.rects[0] = (30, 10, 10, 10)
+        self.renderer.mark((10, 10, 10, 10), self.rects[0])
+        areas = self.renderer.render(self.scene)
+        self.assertEqual(areas, [(10, 10, 10, 10), (30, 10, 10, 10)])
+        self.assertEqual(self.asked, areas)
+        self.assertEqual(self.surface.get_at((15, 15)), (0, 0, 0))
+        self.assertEqual(self.surface.get_at((35, 15)), WHITE)
+        # marks are used once
+        self.assertEqual(self.renderer.render(self.scene), [])
+
+    def test_overlay(self):
+        overlay = [Drawable(fill, (0, 0, 5, 5), (RED,))]
+        self.assertEqual(len(self.renderer.render(self.scene, overlay)), 1)
+        self.assertEqual(self.surface.get_at((0, 0)), RED)
+        # unchanged overlay is not redrawn
+        self.assertEqual(self.renderer.render(self.scene, list(overlay)), [])
+        # drawn over the scene where a mark redraws it
+        overlay = [Drawable(fill, (12, 12, 4, 4), (RED,))]
+        areas = self.renderer.render(self.scene, overlay)
+        self.assertEqual(areas, [(12, 12, 4, 4), (0, 0, 5, 5)])
+        self.assertEqual(self.surface.get_at((0, 0)), (0, 0, 0))
+        self.assertEqual(self.surface.get_at((13, 13)), RED)
+        self.renderer.mark((10, 10, 10, 10))
+        self.renderer.render(self.scene, overlay)
+        self.assertEqual(self.surface.get_at((13, 13)), RED)
+        self.assertEqual(self.surface.get_at((11, 11)), WHITE)
+
+    def test_clipped(self):
+        self.renderer.render(self.scene)
+        self.renderer.mark((90, 90, 50, 50), (200, 200, 10, 10), (0, 0, 0, 10))
+        self.assertEqual(self.renderer.render(self.scene), [(90, 90, 10, 10)])
+
+    def test_collapse(self):
+        self.renderer.render(self.scene)
+        self.renderer.mark(*((i, i, 1, 1) for i in range(MAXDIRTY + 1)))
+        self.assertEqual(self.renderer.render(self.scene), [(0, 0, MAXDIRTY + 1, MAXDIRTY + 1)])
+
+    def test_invalidate(self):
+        self.renderer.render(self.scene)
+        self.renderer.invalidate()
+        self.assertEqual(self.renderer.render(self.scene), [self.surface.get_rect()])
+
+
+if __name__ == '__main__':
+    unittest.main()
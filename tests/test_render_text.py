@@ -0,0 +1,49 @@
+import unittest
+
+import render.text
+
+from lib.external import pygame
+
+LINES = ['one', 'two lines', '3']
+
+def tobytes(surf):
+    return pygame.image.tobytes(surf, 'RGB')
+
+class TestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        pygame.font.init()
+        cls.font = pygame.font.Font(None, 24)
+
+    def setUp(self):
+        render.text.text_cache.clear()
+        render.text.lines_cache.clear()
+
+    def test_render(self):
+        surf = render.text.render(self.font, 'text', True, (200, 200, 200))
+        self.assertIs(render.text.render(self.font, 'text', True, [200, 200, 200]), surf)
+        self.assertIsNot(render.text.render(self.font, 'text', True, (0, 0, 0)), surf)
+        self.assertEqual(tobytes(surf), tobytes(self.font.render('text', True, (200, 200, 200))))
+
+    def test_cached_lines(self):
+        surf = render.text.cached_lines(self.font, True, (200, 200, 200), LINES)
+        self.assertIs(render.text.cached_lines(self.font, True, (200, 200, 200), iter(LINES)), surf)
+        # line images are shared with `render`
+        self.assertEqual(len(render.text.text_cache), len(LINES))
+        expect = render.text.lines(self.font, True, (200, 200, 200), LINES)
+        self.assertEqual(surf.get_size(), expect.get_size())
+        self.assertEqual(tobytes(surf), tobytes(expect))
+        sizes = [self.font.size(line) for line in LINES]
+        self.assertEqual(
+            surf.get_size(),
+            (max(width for width, _ in sizes), sum(height for _, height in sizes)),
+        )
+
+    def test_render_lines(self):
+        # `cached_lines` shadows the name `lines` with its argument
+        self.assertIs(render.text.render_lines, render.text.lines)
+
+
+if __name__ == '__main__':
+    unittest.main()
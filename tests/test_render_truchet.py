@@ -0,0 +1,70 @@
+import unittest
+
+import render.truchet
+
+from lib.external import pygame
+
+def tobytes(surf):
+    return pygame.image.tobytes(surf, 'RGB')
+
+CONNECTIONS = [('midtop', 'midright'), ('midleft', 'midright'), (None, 'midbottom')]
+
+class TestCase(unittest.TestCase):
+
+    def setUp(self):
+        render.truchet.tile_cache.clear()
+
+    def test_cached_tile(self):
+        cache = render.truchet.tile_cache
+        surf = render.truchet.cached_tile(4, 8, CONNECTIONS)
+        # same tile in any connection order
+        self.assertIs(render.truchet.cached_tile(4, 8, CONNECTIONS[::-1]), surf)
+        self.assertIsNot(render.truchet.cached_tile(4, 8, CONNECTIONS[:1]), surf)
+        self.assertEqual(len(cache), 2)
+        # looks like the tile it stands in for
+        expect = render.truchet.tile(4, 8, sorted(CONNECTIONS, key=render.truchet.connection_order))
+        self.assertEqual(tobytes(surf), tobytes(expect))
+
+    def test_debug(self):
+        def colors(surf):
+            width, height = surf.get_size()
+            return {tuple(surf.get_at((x, y)))[:3] for x in range(width) for y in range(height)}
+        self.assertNotIn(render.truchet.DEBUGCOLOR, colors(render.truchet.cached_tile(4, 8, CONNECTIONS)))
+        debug = render.truchet.cached_tile(4, 8, CONNECTIONS, debug=True)
+        self.assertIn(render.truchet.DEBUGCOLOR, colors(debug))
+        self.assertIsNot(render.truchet.cached_tile(4, 8, CONNECTIONS), debug)
+
+    def test_pattern(self):
+        side = render.truchet.tile_side(4, 8)
+        grid = [[CONNECTIONS, None, CONNECTIONS[::-1]], [None]]
+        misses = render.truchet.tile_cache.misses
+        surf = render.truchet.pattern(grid, 4, 8)
+        self.assertEqual(surf.get_size(), (3 * side, 2 * side))
+        # each unique tile rendered once
+        self.assertEqual(render.truchet.tile_cache.misses - misses, 2)
+        tile = render.truchet.cached_tile(4, 8, CONNECTIONS)
+        area = pygame.Rect(8, 8, side, side)
+        for col in (0, 2):
+            self.assertEqual(
+                tobytes(surf.subsurface((col * side, 0, side, side))),
+                tobytes(tile.subsurface(area)),
+            )
+
+    def test_split(self):
+        side = render.truchet.tile_side(4, 8)
+        split = render.truchet.Split(CONNECTIONS, None, None, CONNECTIONS)
+        surf = render.truchet.pattern([[split]], 4, 8)
+        self.assertEqual(surf.get_size(), (side, side))
+        # half scale tiles in the corners
+        half = render.truchet.tile_side(2, 4)
+        tile = render.truchet.cached_tile(2, 4, CONNECTIONS)
+        area = pygame.Rect(4, 4, half, half)
+        for x, y in [(0, 0), (half, half)]:
+            self.assertEqual(
+                tobytes(surf.subsurface((x, y, half, half))),
+                tobytes(tile.subsurface(area)),
+            )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from unittest import mock
+
+import rectop
+
+from lib.external import pygame
+
+# it turns off pygame for the processes it starts
+with mock.patch.dict(os.environ):
+    import shrinkwrap
+
+class TestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.tempdir.name, 'a.layout')
+        self.rects = [pygame.Rect(x, y, 10, 10) for y in range(0, 30, 10) for x in range(0, 30, 10)]
+        rectop.layout.save(self.filename, self.rects)
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def test_defrag_in_place(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            shrinkwrap.cli(['defrag', self.filename])
+        self.assertEqual(rectop.layout.load(self.filename), [pygame.Rect(0, 0, 30, 30)])
+
+    def test_bad_files(self):
+        missing = os.path.join(self.tempdir.name, 'missing.layout')
+        corrupt = os.path.join(self.tempdir.name, 'corrupt.layout')
+        with open(corrupt, 'wb') as fp:
+            fp.write(b'junk')
+        stdout = io.StringIO()
+        stderr = io.StringIO()
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            with self.assertRaises(SystemExit) as raised:
+                shrinkwrap.cli(['defrag', missing, corrupt, self.filename])
+        self.assertEqual(raised.exception.code, 1)
+        # the good file is still done
+        self.assertEqual(stdout.getvalue(), f'{self.filename}: 1 rects\n')
+        self.assertIn('missing.layout: error', stderr.getvalue())
+        self.assertIn('corrupt.layout: error', stderr.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+"""
+Rect count reduction against time of the defrag strategies.
+
+    python timeit/defrag.py --size 64 --repeat 3
+"""
+import argparse
+import random
+import time
+
+import rectop
+
+from rectop.external import Rect
+
+def tile_map(size, fill, seed):
+    """
+    Random map of size x size one pixel tiles.
+    """
+    rng = random.Random(seed)
+    return [
+        Rect(x, y, 1, 1)
+        for y in range(size) for x in range(size)
+        if rng.random() < fill
+    ]
+
+def subdivided(size, depth, seed):
+    """
+    Square subdivided at random points, depth times.
+    """
+    rng = random.Random(seed)
+    rects = [Rect(0, 0, size, size)]
+    for _ in range(depth):
+        rects = [
+            sub
+            for rect in rects
+            for sub in rectop.cut.position(
+                (rng.randint(rect.left, rect.right), rng.randint(rect.top, rect.bottom)),
+                rect,
+            ) or [rect]
+        ]
+    return rects
+
+def best_time(func, rects, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(rects)
+        times.append(time.perf_counter() - start)
+    return (min(times), result)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size', type=int, default=48)
+    parser.add_argument('--fill', type=float, default=0.7)
+    parser.add_argument('--depth', type=int, default=5)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    layouts = {
+        'tiles': tile_map(args.size, args.fill, args.seed),
+        'subdivided': subdivided(args.size * 16, args.depth, args.seed),
+    }
+    print(f'{"layout":<12} {"strategy":<8} {"before":>7} {"after":>7} {"reduction":>9} {"seconds":>9}')
+    for name, rects in layouts.items():
+        for strategy, func in rectop.join.STRATEGIES.items():
+            seconds, result = best_time(func, rects, args.repeat)
+            after = list(rects)
+            rectop.join.apply(result, after)
+            reduction = 1 - len(after) / len(rects)
+            print(
+                f'{name:<12} {strategy:<8} {len(rects):>7} {len(after):>7}'
+                f' {reduction:>9.1%} {seconds:>9.4f}'
+            )
+
+if __name__ == '__main__':
+    main()
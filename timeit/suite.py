@@ -0,0 +1,312 @@
+"""
+Benchmarks of the rectop hot paths over input sizes and distributions of
+rects, written as JSON and compared against a baseline.
+
+    PYTHONPATH=. python timeit/suite.py --output baseline.json
+    PYTHONPATH=. python timeit/suite.py --baseline baseline.json
+
+Exits with status 1 when any benchmark is slower than the baseline by more
+than the tolerance. Baselines are only comparable on the same machine. Set
+RECTOP_NO_PYGAME to benchmark `rectop.rect.Rect` instead of `pygame.Rect`.
+"""
+import argparse
+import fnmatch
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+
+import rectop
+
+from rectop.external import Rect
+from rectop.external import pygame
+
+SIZES = (10, 1_000, 100_000, 1_000_000)
+
+# enough calls of small benchmarks to time
+MIN_CALLS_RECTS = 10_000
+
+def random_rects(size, seed):
+    """
+    Rects of random position and size, about as many overlaps at any size.
+    """
+    rng = random.Random(seed)
+    extent = int((size * 1000) ** 0.5)
+    return [
+        Rect(
+            rng.randrange(extent),
+            rng.randrange(extent),
+            rng.randint(1, 50),
+            rng.randint(1, 50),
+        )
+        for _ in range(size)
+    ]
+
+def grid_rects(size, seed):
+    """
+    Square-ish grid of touching 10x10 tiles.
+    """
+    columns = max(1, int(size ** 0.5))
+    return [
+        Rect((i % columns) * 10, (i // columns) * 10, 10, 10)
+        for i in range(size)
+    ]
+
+def nested_rects(size, seed):
+    """
+    Quadtree of rects, each inside its parent, subdivided at random points.
+    """
+    rng = random.Random(seed)
+    rects = [Rect(0, 0, 1 << 16, 1 << 16)]
+    level = rects
+    while len(rects) < size:
+        children = []
+        for rect in level:
+            point = (
+                rng.randint(rect.left + 1, max(rect.left + 1, rect.right - 1)),
+                rng.randint(rect.top + 1, max(rect.top + 1, rect.bottom - 1)),
+            )
+            # too small to subdivide
+            children.extend(rectop.cut.position(point, rect) or [])
+        if not children:
+            break
+        rects.extend(children)
+        level = children
+    return rects[:size]
+
+DISTRIBUTIONS = {
+    'random': random_rects,
+    'grid': grid_rects,
+    'nested': nested_rects,
+}
+
+def bounds_knife(rects):
+    """
+    Knife rect of the middle quarter of the area of rects.
+    """
+    bounds = rectop.get.wrap(rects)
+    return bounds.inflate(-bounds.width // 2, -bounds.height // 2)
+
+# benchmarks are called with rects, untimed, and return a callable to time
+
+def bench_defrag(rects, strategy='largest'):
+    return lambda: rectop.join.defrag(rects, strategy)
+
+def bench_defrag_greedy(rects):
+    return bench_defrag(rects, 'greedy')
+
+def bench_cut_all(rects):
+    knife = bounds_knife(rects)
+    rect_list = list(rects)
+    return lambda: rectop.cut.all(knife, rect_list)
+
+def bench_cut_with_knife(rects):
+    pairs = [(rect.inflate(-rect.width // 2, -rect.height // 2), rect) for rect in rects]
+
+    def run():
+        for knife, rect in pairs:
+            rectop.cut.with_knife(knife, rect)
+
+    return run
+
+def bench_intersection(rects):
+    pairs = list(zip(rects, rects[1:] + rects[:1]))
+
+    def run():
+        intersection = rectop.get.intersection
+        for r1, r2 in pairs:
+            intersection(r1, r2)
+
+    return run
+
+def bench_intersections(rects):
+    pairs = list(zip(rects, rects[1:] + rects[:1]))
+    return lambda: rectop.get.intersections(pairs)
+
+def bench_wrap(rects):
+    return lambda: rectop.get.wrap(rects)
+
+def bench_filter_rects(rects):
+    test = bounds_knife(rects)
+
+    def run():
+        for direction in ('left', 'right', 'top', 'bottom'):
+            for _ in rectop.query.filter_rects(rects, direction, test):
+                pass
+
+    return run
+
+def bench_update_handles(rects):
+    resizers = [rectop.handle.Resizer(rect.copy()) for rect in rects]
+
+    def run():
+        for resizer in resizers:
+            resizer.update_handles()
+
+    return run
+
+# name -> (benchmark, largest size it is run at)
+BENCHMARKS = {
+    'join.defrag': (bench_defrag, 100_000),
+    'join.defrag[greedy]': (bench_defrag_greedy, 1_000_000),
+    'cut.all': (bench_cut_all, 1_000_000),
+    'cut.with_knife': (bench_cut_with_knife, 1_000_000),
+    'get.intersection': (bench_intersection, 1_000_000),
+    'get.intersections': (bench_intersections, 1_000_000),
+    'get.wrap': (bench_wrap, 1_000_000),
+    'query.filter_rects': (bench_filter_rects, 1_000_000),
+    'handle.Resizer.update_handles': (bench_update_handles, 100_000),
+}
+
+if pygame is None:
+    # handles are positioned in-place, they need pygame
+    del BENCHMARKS['handle.Resizer.update_handles']
+
+def measure(benchmark, rects, repeat):
+    """
+    List of seconds per call of each repeat. Calls are prepared before
+    timing, so benchmarks that change their input get a fresh one.
+    """
+    ncalls = max(1, MIN_CALLS_RECTS // max(len(rects), 1))
+    times = []
+    for _ in range(repeat):
+        calls = [benchmark(rects) for _ in range(ncalls)]
+        start = time.perf_counter()
+        for call in calls:
+            call()
+        times.append((time.perf_counter() - start) / ncalls)
+    return times
+
+def run(names, distributions, sizes, repeat, seed):
+    """
+    Generate result dicts of benchmarks.
+    """
+    for distribution in distributions:
+        for size in sizes:
+            rects = None
+            for name in names:
+                benchmark, max_size = BENCHMARKS[name]
+                if size > max_size:
+                    continue
+                if rects is None:
+                    rects = DISTRIBUTIONS[distribution](size, seed)
+                times = measure(benchmark, rects, repeat)
+                yield {
+                    'benchmark': name,
+                    'distribution': distribution,
+                    'size': size,
+                    'best': min(times),
+                    'mean': statistics.mean(times),
+                    'times': times,
+                }
+
+def result_key(result):
+    return (result['benchmark'], result['distribution'], result['size'])
+
+def compare(results, baseline, tolerance):
+    """
+    Generate (result, baseline best, ratio, is_regression) of results that
+    are in the baseline.
+    """
+    baseline_best = {result_key(result): result['best'] for result in baseline['results']}
+    for result in results:
+        key = result_key(result)
+        if key not in baseline_best:
+            continue
+        ratio = result['best'] / baseline_best[key]
+        yield (result, baseline_best[key], ratio, ratio > tolerance)
+
+def int_list(string):
+    return [int(value.replace('_', '')) for value in string.split(',')]
+
+def main(argv=None):
+    """
+    Benchmark rectop and compare with a baseline.
+    """
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument(
+        '--sizes',
+        type = int_list,
+        default = list(SIZES),
+        help = 'Comma separated numbers of rects. Default: %(default)s',
+    )
+    parser.add_argument(
+        '--distribution',
+        dest = 'distributions',
+        choices = list(DISTRIBUTIONS),
+        action = 'append',
+        help = 'Distribution of rects. Repeat for many. Default: all.',
+    )
+    parser.add_argument(
+        '--bench',
+        default = '*',
+        help = 'Glob of benchmark names. Default: all.',
+    )
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument(
+        '--output',
+        help = 'Write JSON results to file instead of stdout.',
+    )
+    parser.add_argument(
+        '--baseline',
+        help = 'JSON results to compare with.',
+    )
+    parser.add_argument(
+        '--tolerance',
+        type = float,
+        default = 1.25,
+        help = 'Slowdown ratio over the baseline that is a regression.'
+               ' Default: %(default)s',
+    )
+    args = parser.parse_args(argv)
+
+    names = fnmatch.filter(BENCHMARKS, args.bench)
+    distributions = args.distributions or list(DISTRIBUTIONS)
+
+    results = []
+    for result in run(names, distributions, args.sizes, args.repeat, args.seed):
+        print(
+            f'{result["benchmark"]:<30} {result["distribution"]:<7}'
+            f' {result["size"]:>8} {result["best"]:>12.6f}s',
+            file = sys.stderr,
+        )
+        results.append(result)
+
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver if pygame else None,
+            'rect': f'{Rect.__module__}.{Rect.__qualname__}',
+            'platform': platform.platform(),
+            'repeat': args.repeat,
+            'seed': args.seed,
+        },
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(report, output_file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = 0
+        for result, best, ratio, is_regression in compare(results, baseline, args.tolerance):
+            regressions += is_regression
+            flag = 'REGRESSION' if is_regression else ''
+            print(
+                f'{result["benchmark"]:<30} {result["distribution"]:<7}'
+                f' {result["size"]:>8} {ratio:>6.2f}x {flag}',
+                file = sys.stderr,
+            )
+        if regressions:
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -6,6 +6,16 @@ import rectop
 
 from lib.external import pygame
 
+# with or without a worker, fastest and on tile maps the fewest rects too
+DEFRAG_STRATEGY = 'greedy'
+
+def snapshot(rects):
+    """
+    Copy of rects for operating on while they are being edited.
+    """
+    return [pygame.Rect(rect) for rect in rects]
+
+
 class Tool(ABC):
     """
     GUI Tool. This is the layer between the GUI and the actual rect operation.
@@ -97,9 +107,38 @@ class RectsGetterTool(RectTool):
     def __init__(
         self,
         rects_getter,
+        changed_callback = None,
+        worker_getter = None,
     ):
+        """
+        :param rects_getter: callable returning the `rectop.store.RectStore`
+                             of rects to change.
+        :param changed_callback: optional callable(op, diff) with name of
+                                 the operation and its `rectop.diff`, after
+                                 changing rects.
+        :param worker_getter: optional callable returning a `lib.worker.Worker`
+                              to run slow operations on a copy of the rects.
+                              Whoever handles its WORKDONE events applies the
+                              diff, and changed_callback is not called.
+        """
         super().__init__()
         self.rects_getter = rects_getter
+        self.changed_callback = changed_callback
+        self.worker_getter = worker_getter
+
+    def worker(self):
+        """
+        Worker for slow operations or None to run them here.
+        """
+        if self.worker_getter:
+            return self.worker_getter()
+
+    def changed(self, op, diff):
+        """
+        Notify that rects were changed by operation `op`.
+        """
+        if self.changed_callback and not rectop.diff.is_empty(diff):
+            self.changed_callback(op, diff)
 
 
 class CutRectTool(RectsGetterTool):
@@ -111,7 +150,13 @@ class CutRectTool(RectsGetterTool):
         """
         Cut colliding rects on drop.
         """
-        rectop.cut.all(self.selection, self.rects_getter())
+        rects = self.rects_getter()
+        worker = self.worker()
+        if worker:
+            worker.submit('cut', rectop.cut.all, self.selection.copy(), snapshot(rects))
+        else:
+            diff = rectop.cut.all(self.selection, rects)
+            self.changed('cut', diff)
         self.reset()
 
 
@@ -126,8 +171,13 @@ class DefragRectTool(RectsGetterTool):
 
     def _defrag(self):
         rects = self.rects_getter()
-        result = rectop.join.defrag(rects)
-        rectop.join.apply(result, rects)
+        worker = self.worker()
+        if worker:
+            worker.submit('defrag', rectop.join.defrag, snapshot(rects), DEFRAG_STRATEGY)
+        else:
+            diff = rectop.join.defrag(rects, DEFRAG_STRATEGY)
+            rectop.diff.apply(diff, rects)
+            self.changed('defrag', diff)
         self.reset()
 
     def on_mousebuttondown(self, event):
@@ -160,53 +210,53 @@ class SelectTool(RectsGetterTool):
         """
         """
         rects = self.rects_getter()
-        for rect in rects:
-            if rect.collidepoint(event.pos):
-                self.selected_callback(rect)
+        for rect_id in rects.query_point(event.pos):
+            self.selected_callback(rect_id)
 
     def on_dragdrop(self, event):
         """
         On (drag) drop, notify of selected and unselected.
         """
         rects = self.rects_getter()
-        for rect in rects:
+        for rect_id, rect in rects.items():
             if self.selection.contains(rect):
-                self.selected_callback(rect)
+                self.selected_callback(rect_id)
             else:
-                self.unselected_callback(rect)
+                self.unselected_callback(rect_id)
         self.reset()
 
 
 class DeleteTool(RectsGetterTool):
 
-    def __init__(self, rects_getter):
-        super().__init__(rects_getter)
+    def __init__(self, rects_getter, changed_callback=None):
+        super().__init__(rects_getter, changed_callback)
         self.hover = set()
         self.event_dispatch[pygame.MOUSEMOTION] = self.on_mousemotion
         self.event_dispatch[pygame.MOUSEBUTTONDOWN] = self.on_mousebuttondown
 
     def on_mousemotion(self, event):
         rects = self.rects_getter()
-        self.hover = set(id(rect) for rect in rects if rect.collidepoint(event.pos))
+        self.hover = set(rects.query_point(event.pos))
 
     def on_mousebuttondown(self, event):
         """
         """
         rects = self.rects_getter()
-        for rect in list(rects):
-            if rect.collidepoint(event.pos):
-                rects.remove(rect)
+        removed = [rects.pop(rect_id) for rect_id in rects.query_point(event.pos)]
+        self.changed('delete', rectop.diff.new(remove=removed))
         self.reset()
 
     def on_dragdrop(self, event):
         """
-        On (drag) drop, notify of selected and unselected.
+        On (drag) drop, delete the rects inside the selection.
         """
         if self.selection:
             rects = self.rects_getter()
-            for rect in list(rects):
-                if self.selection.contains(rect):
-                    rects.remove(rect)
+            removed = [
+                rects.pop(rect_id) for rect_id in rects.query_rect(self.selection)
+                if self.selection.contains(rects[rect_id])
+            ]
+            self.changed('delete', rectop.diff.new(remove=removed))
             self.reset()
 
 
@@ -215,37 +265,32 @@ class SubdivideTool(RectsGetterTool):
     Click point inside rect and split it into four rects.
     """
 
-    def __init__(self, rects_getter):
-        super().__init__(rects_getter)
+    def __init__(self, rects_getter, changed_callback=None):
+        super().__init__(rects_getter, changed_callback)
         self.hover = None
         self.event_dispatch[pygame.MOUSEMOTION] = self.on_mousemotion
         self.event_dispatch[pygame.MOUSEBUTTONDOWN] = self.on_mousebuttondown
 
     def on_mousemotion(self, event):
         rects = self.rects_getter()
-        for rect in rects:
-            if rect.collidepoint(event.pos):
-                self.hover = id(rect)
-                break
+        for rect_id in rects.query_point(event.pos):
+            self.hover = rect_id
+            break
         else:
             self.hover = None
 
     def do_subdivide(self, event):
         """
         """
-        if self.hover:
-            rects = self.rects_getter()
-            for rect in list(rects):
-                if id(rect) == self.hover:
-                    pos = event.pos
-                    pos = rect.center
-                    subdivided_rects = rectop.cut.position(pos, rect)
-                    rects.remove(rect)
-                    rects.extend(subdivided_rects)
-                    break
-            else:
-                # uh oh
-                pass
+        rects = self.rects_getter()
+        if self.hover is not None and rects.is_alive(self.hover):
+            rect = rects[self.hover]
+            subdivided_rects = rectop.cut.position(rect.center, rect)
+            # too small to subdivide
+            if subdivided_rects:
+                rects.delete(self.hover)
+                rects.extend(subdivided_rects)
+                self.changed('subdivide', rectop.diff.new(append=subdivided_rects, remove=[rect]))
         self.reset()
 
     def on_mousebuttondown(self, event):
@@ -268,8 +313,9 @@ class IntersetRectTool(RectsGetterTool):
         self,
         rects_getter,
         new_rect_callback,
+        changed_callback = None,
     ):
-        super().__init__(rects_getter)
+        super().__init__(rects_getter, changed_callback)
         self.new_rect_callback = new_rect_callback
 
     def on_dragdrop(self, event):
@@ -283,4 +329,5 @@ class IntersetRectTool(RectsGetterTool):
                 self.new_rect_callback(irect)
                 for rect in selected:
                     rects.remove(rect)
+                self.changed('intersect', rectop.diff.new(append=[irect], remove=selected))
         self.reset()
@@ -52,15 +52,16 @@ def loop():
         nonlocal truchet_rect
         nonlocal connections_image
         nonlocal connections_rect
-        truchet_image = render.truchet.tile(
+        truchet_image = render.truchet.cached_tile(
             midpoints_radius = min(frame.size) // (6*6),
             corners_radius = min(frame.size) // (6*1),
-            connections = connections
+            connections = connections,
+            debug = True,
         )
         truchet_rect = truchet_image.get_rect(center=frame.center)
         #
         connections_strings = [f'{left} -> {right}' for left, right in connections]
-        connections_image = render.text.lines(
+        connections_image = render.text.cached_lines(
             font,
             antialias = True,
             color = FGCOLOR,
@@ -99,7 +100,7 @@ def loop():
         window.blit(connections_image, connections_rect)
         # FPS
         avg_fps = sum(fps_list) / len(fps_list)
-        fps_image = font.render(f'{avg_fps:,.0f}', True, FGCOLOR)
+        fps_image = render.text.render(font, f'{avg_fps:,.0f}', True, FGCOLOR)
         window.blit(fps_image, fps_image.get_rect(bottomright=gui_frame.bottomright))
         # crosshairs at mouse
         if draw_crosshairs: